@@ -0,0 +1,121 @@
+"""A small benchmark harness, run it with `python -m benchmarks --help`.
+
+Benchmarks are registered with `@benchmark`, they get the `Context` with the data set
+for the current scale and return the callable to time. Anything that should not be
+timed goes in the `setup` callable, it runs before every repeat."""
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+import ftl.data
+
+
+@dataclass
+class Context:
+    scale: float
+    data_dir: Path
+
+
+@dataclass
+class Benchmark:
+    name: str
+    make: Callable[[Context], Callable[[], object]]
+    setup: Optional[Callable[[Context], object]] = None
+
+
+@dataclass
+class Result:
+    name: str
+    times: list[float] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "min": min(self.times),
+            "median": statistics.median(self.times),
+            "mean": statistics.fmean(self.times),
+            "repeat": len(self.times),
+        }
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, setup: Callable[[Context], object] = None):
+    def register(make: Callable[[Context], Callable[[], object]]):
+        BENCHMARKS[name] = Benchmark(name, make, setup)
+        return make
+
+    return register
+
+
+def use_data(ctx: Context, cache_dir: Path = None):
+    """Points `ftl.data` at the synthetic data with nothing loaded yet"""
+    ftl.data.use_data_dir(ctx.data_dir, cache_dir)
+
+
+def loaded(ctx: Context):
+    use_data(ctx)
+    return ftl.data.ensure_loaded()
+
+
+def run(ctx: Context, names: list[str] = None, repeat: int = 5) -> dict[str, Result]:
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if names and not any(n in name for n in names):
+            continue
+        result = results[name] = Result(name)
+        fn = None
+        for _ in range(repeat):
+            if bench.setup is not None or fn is None:
+                if bench.setup is not None:
+                    bench.setup(ctx)
+                fn = bench.make(ctx)
+            start = time.perf_counter()
+            fn()
+            result.times.append(time.perf_counter() - start)
+    return results
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def to_json(ctx: Context, results: dict[str, Result]) -> dict:
+    return {
+        "meta": {
+            "scale": ctx.scale,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "revision": _git_revision(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": {name: r.summary() for name, r in results.items()},
+    }
+
+
+def compare(old: dict, new: dict, threshold: float = 1.1) -> list[tuple[str, float]]:
+    """Every benchmark whose median got slower by more than `threshold` times"""
+    regressions = []
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["median"] / before["median"]
+        if ratio > threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def save(path: Path, data: dict):
+    path.write_text(json.dumps(data, indent=2))
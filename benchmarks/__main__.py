@@ -0,0 +1,73 @@
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from ftl.models.base import set_trusted
+from ftl.synthetic import generate, Sizes
+
+from . import (  # noqa: F401
+    bench_columns,
+    bench_data,
+    bench_graph,
+    bench_models,
+    bench_search,
+    bench_simulate,
+    bench_validate,
+)
+from . import BENCHMARKS, compare, Context, run, save, to_json
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Times loading and model building against synthetic FTL data",
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1, help="1 is roughly the vanilla game"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--depth", type=int, default=Sizes.depth, help="how deep choices nest"
+    )
+    parser.add_argument("--trusted", action="store_true", help="see `set_trusted`")
+    parser.add_argument("-k", dest="names", action="append", help="name filter")
+    parser.add_argument("-o", "--output", type=Path, help="write the results as JSON")
+    parser.add_argument(
+        "--compare", type=Path, help="results JSON to check for regressions against"
+    )
+    parser.add_argument("--threshold", type=float, default=1.1)
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+    set_trusted(args.trusted)
+    with tempfile.TemporaryDirectory() as tmp:
+        sizes = Sizes(depth=args.depth).scaled(args.scale)
+        ctx = Context(args.scale, generate(Path(tmp) / "data", sizes, args.seed))
+        results = to_json(ctx, run(ctx, args.names, args.repeat))
+    results["meta"]["trusted"] = args.trusted
+
+    width = max(map(len, results["results"]), default=0)
+    for name, r in results["results"].items():
+        print(
+            f"{name:<{width}}  median {r['median'] * 1000:10.2f}ms  min {r['min'] * 1000:10.2f}ms"
+        )
+    if args.output:
+        save(args.output, results)
+    if args.compare:
+        regressions = compare(
+            json.loads(args.compare.read_text()), results, args.threshold
+        )
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x slower", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
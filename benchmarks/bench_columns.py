@@ -0,0 +1,24 @@
+"""Building the columnar tables, and querying them mapped back in"""
+
+from ftl import columns
+
+from . import benchmark, Context, loaded
+
+
+@benchmark("columns.tables", setup=loaded)
+def tables(ctx: Context):
+    return columns.tables
+
+
+@benchmark("columns.query", setup=loaded)
+def query(ctx: Context):
+    out = ctx.data_dir.parent / "tables"
+    columns.export(out, parquet=False)
+
+    def run():
+        weapons = columns.load(out, "weapons")
+        events = columns.load(out, "events")
+        weapons["damage"][weapons["shots"] > 1].mean()
+        events["damage"][events["fight"]].sum()
+
+    return run
@@ -0,0 +1,79 @@
+"""Loading the XML files into `RAW_DATA` and the lookups built from it"""
+
+import ftl.data
+import ftl.snapshot
+from ftl.strings import StringTable
+
+from . import benchmark, Context, loaded, use_data
+
+
+@benchmark("data.load_data", setup=use_data)
+def load_data(ctx: Context):
+    return ftl.data._load_data
+
+
+@benchmark("data.load_data.cached")
+def load_data_cached(ctx: Context):
+    cache_dir = ctx.data_dir.parent / f"{ctx.data_dir.name}-cache"
+    # Warm the cache up first, the runs after this one are all hits
+    use_data(ctx, cache_dir)
+    ftl.data._load_data()
+
+    def run():
+        use_data(ctx, cache_dir)
+        ftl.data._load_data()
+
+    return run
+
+
+@benchmark("data.hack")
+def hack(ctx: Context):
+    multi_root = ctx.data_dir / "text_000.xml"
+    return lambda: ftl.data._hack(multi_root)
+
+
+@benchmark("data.string_data")
+def string_data(ctx: Context):
+    # Only building the table out of the parsed `<text>` elements is timed
+    strings = [
+        pair
+        for xmlfp in sorted(ctx.data_dir.glob("*.xml"))
+        for pair in ftl.data._split_strings(ftl.data._parse_xml(xmlfp) or [])[1]
+    ]
+    bodies = [body for _, body in strings]
+
+    def build():
+        table = StringTable()
+        for (name, _), i in zip(strings, table.fill(bodies)):
+            table.bind(name, i)
+
+    return build
+
+
+@benchmark("data.string_data.lookup", setup=loaded)
+def string_data_lookup(ctx: Context):
+    def lookup_all():
+        get = ftl.data.get_string
+        for name in ftl.data.STRING_DATA:
+            get(name)
+
+    return lookup_all
+
+
+@benchmark("data.snapshot.write", setup=loaded)
+def snapshot_write(ctx: Context):
+    path = ctx.data_dir.parent / "ftl.snapshot"
+    return lambda: ftl.snapshot.write(path)
+
+
+@benchmark("data.snapshot.open")
+def snapshot_open(ctx: Context):
+    path = ctx.data_dir.parent / "ftl.snapshot"
+    loaded(ctx)
+    ftl.snapshot.write(path)
+
+    def run():
+        ftl.data.use_snapshot(path)
+        ftl.data.ensure_loaded()
+
+    return run
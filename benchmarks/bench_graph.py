@@ -0,0 +1,24 @@
+"""Building the event graph and asking it questions"""
+
+from ftl import graph
+
+from . import benchmark, Context, loaded
+
+
+@benchmark("graph.build", setup=loaded)
+def build(ctx: Context):
+    return graph.build
+
+
+@benchmark("graph.can_reach", setup=loaded)
+def can_reach(ctx: Context):
+    g = graph.build()
+    sectors = [key for key in g.keys if key[0] == "sectorDescription"]
+    events = [key for key in g.keys if key[0] == "event"][:1000]
+
+    def query():
+        for sector in sectors:
+            for event in events:
+                g.can_reach(sector, event)
+
+    return query
@@ -0,0 +1,77 @@
+"""Building the pydantic models out of the loaded elements"""
+
+from ftl.models import _FTL
+from ftl.models.base import set_shared
+from ftl.models.event import Event
+from ftl.models.sector import SectorDescription
+from ftl.models.ship_blueprints import ShipBlueprint
+from ftl.models.weapon_blueprints import WeaponBlueprint
+
+from . import benchmark, Context, loaded
+
+
+@benchmark("models.ftl")
+def ftl_from_elem(ctx: Context):
+    root = loaded(ctx)
+    return lambda: _FTL.from_elem(root)
+
+
+@benchmark("models.ftl.shared")
+def ftl_shared(ctx: Context):
+    root = loaded(ctx)
+
+    def build():
+        previous = set_shared(True)
+        try:
+            _FTL.from_elem(root)
+        finally:
+            set_shared(previous)
+
+    return build
+
+
+def _from_elem_all(model, tag: str):
+    def make(ctx: Context):
+        elements = list(loaded(ctx).iterfind(tag))
+
+        def build():
+            for e in elements:
+                model.from_elem(e)
+
+        return build
+
+    return make
+
+
+for _model, _tag in (
+    (Event, "event[@name]"),
+    (ShipBlueprint, "shipBlueprint"),
+    (WeaponBlueprint, "weaponBlueprint"),
+    (SectorDescription, "sectorDescription"),
+):
+    benchmark(f"models.{_model.__name__}")(_from_elem_all(_model, _tag))
+
+
+@benchmark("models.text.render")
+def text_render(ctx: Context):
+    everything = _FTL.from_elem(loaded(ctx))
+    texts = [event.text for event in everything.events.values() if event.text]
+
+    def render():
+        for _ in range(10):
+            for text in texts:
+                text.render()
+
+    return render
+
+
+@benchmark("models.text_list.draw")
+def text_list_draw(ctx: Context):
+    lists = list(_FTL.from_elem(loaded(ctx)).text_lists.values())
+
+    def draw():
+        for _ in range(100):
+            for text_list in lists:
+                text_list.draw()
+
+    return draw
@@ -0,0 +1,24 @@
+"""Building the search index and type-ahead queries against it"""
+
+from ftl import search
+
+from . import benchmark, Context, loaded
+
+
+@benchmark("search.build", setup=loaded)
+def build(ctx: Context):
+    return search.build
+
+
+@benchmark("search.type_ahead", setup=loaded)
+def type_ahead(ctx: Context):
+    index = search.build()
+    index.tokens()
+    queries = ["s", "so", "som", "some", "somet", "someth", "somethi", "somethin"]
+
+    def query():
+        for q in queries:
+            index.search(q, limit=20)
+        index.search("", tag="weaponBlueprint", ion=(1, None))
+
+    return query
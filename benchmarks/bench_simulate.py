@@ -0,0 +1,24 @@
+"""Simulating events and generating sector maps"""
+
+from ftl import sector_map
+from ftl.data import named_elements
+from ftl.simulate import Simulator
+
+from . import benchmark, Context, loaded
+
+
+@benchmark("simulate.compile", setup=loaded)
+def compile_events(ctx: Context):
+    return Simulator
+
+
+@benchmark("simulate.events", setup=loaded)
+def sample_events(ctx: Context):
+    sim = Simulator(seed=0)
+    return lambda: sim.events(runs=100)
+
+
+@benchmark("simulate.sector_maps", setup=loaded)
+def sector_maps(ctx: Context):
+    sector = next(iter(named_elements("sectorDescription")))
+    return lambda: sector_map.simulate(sector, runs=200, workers=0)
@@ -0,0 +1,20 @@
+"""Checking every reference"""
+
+from ftl import validate
+
+from . import benchmark, Context, loaded
+
+
+@benchmark("validate.cold", setup=loaded)
+def cold(ctx: Context):
+    def run():
+        validate._FILE_REFERENCES.clear()
+        validate.validate()
+
+    return run
+
+
+@benchmark("validate.again", setup=loaded)
+def again(ctx: Context):
+    validate.validate()
+    return validate.validate
@@ -0,0 +1,86 @@
+"""How much memory the models take, as pydantic models and as `ftl.models.slim` copies.
+
+python -m benchmarks.memory --scale 10
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import ftl.data
+from ftl.models import FTL
+from ftl.models.base import set_trusted
+from ftl.models.slim import Slim
+from ftl.synthetic import generate, Sizes
+
+COLLECTIONS = ("events", "text_lists", "ship_blueprints", "sector_descriptions")
+
+
+def _count(v) -> int:
+    """How many models there are in the value, counting nested ones"""
+    if isinstance(v, Slim):
+        return 1 + sum(_count(getattr(v, f)) for f in v._fields)
+    if isinstance(v, (list, tuple)):
+        return sum(map(_count, v))
+    if isinstance(v, dict):
+        return sum(map(_count, v.values()))
+    return 0
+
+
+def _measure(collection: str, slim: bool) -> tuple[int, list]:
+    FTL.set_slim(slim)
+    models = getattr(FTL, collection)
+    names = list(models)
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    built = [models[name] for name in names]
+    return tracemalloc.get_traced_memory()[0] - before, built
+
+
+def report() -> list[tuple[str, int, int, int]]:
+    """(collection, models, bytes as pydantic models, bytes as slim ones)"""
+    ftl.data.ensure_loaded()
+    rows = []
+    tracemalloc.start()
+    try:
+        for collection in COLLECTIONS:
+            fat, built = _measure(collection, slim=False)
+            del built
+            thin, built = _measure(collection, slim=True)
+            rows.append((collection, sum(map(_count, built)), fat, thin))
+            del built
+    finally:
+        tracemalloc.stop()
+        FTL.set_slim(False)
+    return rows
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memory")
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trusted", action="store_true", help="see `set_trusted`")
+    args = parser.parse_args(argv)
+    set_trusted(args.trusted)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = generate(Path(tmp) / "data", Sizes().scaled(args.scale), args.seed)
+        ftl.data.use_data_dir(data_dir, None)
+        rows = report()
+    print(
+        f"{'collection':<20} {'models':>8} {'pydantic':>10} {'slim':>10} "
+        f"{'B/model':>15} {'ratio':>6}"
+    )
+    for collection, count, fat, thin in rows:
+        per = f"{fat // max(count, 1)} -> {thin // max(count, 1)}"
+        print(
+            f"{collection:<20} {count:>8} {fat / 1e6:>8.2f}MB {thin / 1e6:>8.2f}MB "
+            f"{per:>15} {fat / max(thin, 1):>5.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
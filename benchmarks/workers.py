@@ -0,0 +1,97 @@
+"""How much memory worker processes take together, each parsing the XML itself or
+all of them attached to one snapshot in shared memory. Linux only, it adds up the
+proportional set size of the workers, so a page they share counts once overall.
+
+python -m benchmarks.workers --scale 10 --workers 1 2 4 8
+"""
+
+import argparse
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+
+import ftl.data
+import ftl.snapshot
+from ftl.models import FTL
+from ftl.synthetic import generate, Sizes
+
+# "imports" loads nothing, what every worker costs anyway
+MODES = ("imports", "xml", "shared")
+
+
+def _pss() -> int:
+    """Bytes of memory this process is charged with, shared pages split between the
+    processes that share them"""
+    with open("/proc/self/smaps_rollup") as fp:
+        for line in fp:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("No Pss in /proc/self/smaps_rollup")
+
+
+def _worker(mode: str, source: str, every: int, barrier, results):
+    if mode == "xml":
+        ftl.data.use_data_dir(Path(source), None)
+    elif mode == "shared":
+        ftl.data.use_shared_memory(source)
+    if mode != "imports":
+        events = FTL.events
+        for name in list(events)[::every]:
+            events[name]
+    # Everyone has to be attached before the shared pages are split between them
+    barrier.wait()
+    results.put(_pss())
+    barrier.wait()
+
+
+def measure(mode: str, source: str, workers: int, every: int) -> int:
+    """Total bytes `workers` processes take after building every `every`th event"""
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(workers), ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker, args=(mode, source, every, barrier, results))
+        for _ in range(workers)
+    ]
+    for p in processes:
+        p.start()
+    total = sum(results.get() for _ in processes)
+    for p in processes:
+        p.join()
+    return total
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.workers")
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument(
+        "--every", type=int, default=10, help="each worker builds every nth event"
+    )
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = generate(Path(tmp) / "data", Sizes().scaled(args.scale), args.seed)
+        ftl.data.use_data_dir(data_dir, None)
+        ftl.data.ensure_loaded()
+        shm = ftl.snapshot.publish()
+        ftl.data._reset()
+        try:
+            print(f"{'workers':>7} " + " ".join(f"{mode:>10}" for mode in MODES))
+            for workers in args.workers:
+                sources = {"imports": "", "xml": str(data_dir), "shared": shm.name}
+                totals = [
+                    measure(mode, sources[mode], workers, args.every) for mode in MODES
+                ]
+                print(
+                    f"{workers:>7} "
+                    + " ".join(f"{total / 1e6:>8.1f}MB" for total in totals)
+                )
+        finally:
+            shm.close()
+            shm.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
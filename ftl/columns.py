@@ -0,0 +1,290 @@
+"""
+The blueprints, events and choices as columnar tables.
+
+Each table is a NumPy structured array with a row per weapon blueprint, ship
+blueprint, event or choice, built straight from the loaded elements without building
+any models. The weapon columns are every number and flag `WeaponBlueprint` has, read
+the way the model reads them. Events are flattened: every `<event>` inside a named
+event or event list gets a row that points at the row of the event it is in, and every
+choice gets a row in `choices` that points at the event it is in and the one it leads
+to. Ints that the data leaves out are -1, strings are empty.
+
+`export` writes each table as `.npy`, which `load` maps back in without reading it,
+and as Parquet too when pyarrow is installed.
+
+    export(Path("tables"))
+    weapons = load(Path("tables"), "weapons")
+    weapons["damage"][weapons["shots"] > 2].mean()
+
+Needs NumPy, Parquet needs pyarrow.
+"""
+
+from pathlib import Path
+from typing import Any, Callable
+from xml.etree.ElementTree import Element
+
+import numpy as np
+from pydantic.fields import SHAPE_SINGLETON
+
+from . import data
+from .models.weapon_blueprints import WeaponBlueprint
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+TABLES = ("weapons", "ships", "events", "choices")
+MISSING = -1
+
+
+def _weapon_columns() -> list[tuple[str, str, str]]:
+    """(column, tag, dtype) for the numbers and flags of `WeaponBlueprint`
+
+    The tag is the one the model reads the field from, its name or its alias,
+    whichever `_int_text_tags` has.
+    """
+    out = []
+    tags = WeaponBlueprint._int_text_tags
+    for name, field in WeaponBlueprint.__fields__.items():
+        if field.shape != SHAPE_SINGLETON:
+            continue
+        tag = name if name in tags else field.alias
+        if field.type_ is bool:
+            out.append((name, tag, "?"))
+        elif field.type_ is int:
+            out.append((name, tag, "i4"))
+    return out
+
+
+_WEAPON_COLUMNS = _weapon_columns()
+
+
+def _int(text: str | None, default: int = MISSING) -> int:
+    # The same test the models use for numbers in the text
+    return int(text) if text and text.isnumeric() else default
+
+
+def _text_ref(e: Element | None) -> str:
+    """The string or text list a `<text>`-like element uses, or its own text"""
+    if e is None:
+        return ""
+    return e.get("id") or e.get("load") or (e.text or "").strip()
+
+
+def _structured(columns: list[tuple[str, str]], rows: list[tuple]) -> np.ndarray:
+    """The rows as a structured array, string columns (`U`) as wide as they need to be"""
+    dtype = []
+    for i, (name, kind) in enumerate(columns):
+        if kind == "U":
+            width = max((len(row[i]) for row in rows), default=0)
+            kind = f"U{max(width, 1)}"
+        dtype.append((name, kind))
+    return np.array(rows, dtype=dtype)
+
+
+def weapons() -> np.ndarray:
+    columns = [("name", "U"), ("type", "U"), ("title", "U")] + [
+        (name, kind) for name, _, kind in _WEAPON_COLUMNS
+    ]
+    position = {tag: i for i, (_, tag, _) in enumerate(_WEAPON_COLUMNS, 3)}
+    defaults = [""] * 3 + [
+        WeaponBlueprint.__fields__[name].default for name, _, _ in _WEAPON_COLUMNS
+    ]
+    rows = []
+    for name, elements in data.named_elements("weaponBlueprint").items():
+        row = defaults.copy()
+        row[0] = name
+        for sub in elements[-1]:
+            i = position.get(sub.tag)
+            if i is not None:
+                row[i] = _int(sub.text, row[i])
+            elif sub.tag == "type":
+                row[1] = _text_ref(sub)
+            elif sub.tag == "title":
+                row[2] = _text_ref(sub)
+        rows.append(tuple(row))
+    return _structured(columns, rows)
+
+
+_SHIP_COLUMNS = [
+    ("name", "U"),
+    ("layout", "U"),
+    ("img", "U"),
+    ("class", "U"),
+    ("health", "i4"),
+    ("max_power", "i4"),
+    ("min_sector", "i4"),
+    ("max_sector", "i4"),
+    ("weapon_slots", "i4"),
+    ("drone_slots", "i4"),
+    ("systems", "i4"),
+    ("crew", "i4"),
+    ("weapons", "i4"),
+    ("missiles", "i4"),
+    ("augments", "i4"),
+]
+# tag -> (column, what to take from the element)
+_SHIP_TAGS: dict[str, tuple[int, Callable[[Element], Any]]] = {
+    "class": (3, _text_ref),
+    "health": (4, lambda e: _int(e.get("amount"))),
+    "maxPower": (5, lambda e: _int(e.get("amount"))),
+    "minSector": (6, lambda e: _int(e.text)),
+    "maxSector": (7, lambda e: _int(e.text)),
+    "weaponSlots": (8, lambda e: _int(e.text)),
+    "droneSlots": (9, lambda e: _int(e.text)),
+    "systemList": (10, len),
+    "crewCount": (11, lambda e: _int(e.get("amount"), 0)),
+}
+
+
+def ships() -> np.ndarray:
+    rows = []
+    for name, elements in data.named_elements("shipBlueprint").items():
+        e = elements[-1]
+        row = [name, e.get("layout", ""), e.get("img", ""), ""] + [MISSING] * 7
+        row[11:] = [0, 0, 0, 0]
+        for sub in e:
+            tag = sub.tag
+            found = _SHIP_TAGS.get(tag)
+            if found is not None:
+                i, value = found
+                # Crew can come in more than one race
+                row[i] = row[i] + value(sub) if tag == "crewCount" else value(sub)
+            elif tag == "weaponList":
+                row[12] = len(sub)
+                row[13] = _int(sub.get("missiles"), 0)
+            elif tag == "aug":
+                row[14] += 1
+        rows.append(tuple(row))
+    return _structured(_SHIP_COLUMNS, rows)
+
+
+_EVENT_COLUMNS = [
+    ("name", "U"),
+    # The named event or event list it is in
+    ("top", "U"),
+    ("parent", "i4"),
+    ("depth", "i2"),
+    ("load", "U"),
+    ("text", "U"),
+    ("choices", "i2"),
+    ("store", "?"),
+    ("distress", "?"),
+    ("fight", "?"),
+    ("boarders_min", "i2"),
+    ("boarders_max", "i2"),
+    ("damage", "i4"),
+    ("reward", "U"),
+    ("quest", "U"),
+]
+_CHOICE_COLUMNS = [
+    ("event", "i4"),
+    ("index", "i2"),
+    ("text", "U"),
+    ("req", "U"),
+    ("hidden", "?"),
+    ("target", "i4"),
+]
+
+
+def events_and_choices() -> tuple[np.ndarray, np.ndarray]:
+    event_rows: list[list] = []
+    choice_rows: list[tuple] = []
+
+    def add(e: Element, top: str, parent: int, depth: int) -> int:
+        row = len(event_rows)
+        out = [e.get("name", ""), top, parent, depth, e.get("load", ""), ""]
+        out += [0, False, False, False, MISSING, MISSING, 0, "", ""]
+        event_rows.append(out)
+        choices = 0
+        for sub in e:
+            tag = sub.tag
+            if tag == "choice":
+                nested = sub.find("event")
+                target = MISSING if nested is None else add(nested, top, row, depth + 1)
+                choice_rows.append(
+                    (
+                        row,
+                        choices,
+                        _text_ref(sub.find("text")),
+                        sub.get("req", ""),
+                        sub.get("hidden") == "true",
+                        target,
+                    )
+                )
+                choices += 1
+            elif tag == "text":
+                out[5] = _text_ref(sub)
+            elif tag == "store":
+                out[7] = True
+            elif tag == "distressBeacon":
+                out[8] = True
+            elif tag == "ship":
+                out[9] = out[9] or sub.get("hostile") == "true"
+            elif tag == "boarders":
+                out[10] = _int(sub.get("min"))
+                out[11] = _int(sub.get("max"))
+            elif tag == "damage":
+                out[12] += _int(sub.get("amount"), 0)
+            elif tag == "autoReward":
+                out[13] = sub.get("level", "")
+            elif tag == "quest":
+                out[14] = sub.get("event", "")
+        out[6] = choices
+        return row
+
+    for name, elements in data.named_elements("event").items():
+        add(elements[-1], name, MISSING, 0)
+    for name, elements in data.named_elements("eventList").items():
+        for sub in elements[-1]:
+            if sub.tag == "event":
+                add(sub, name, MISSING, 0)
+    events = _structured(_EVENT_COLUMNS, [tuple(row) for row in event_rows])
+    return events, _structured(_CHOICE_COLUMNS, choice_rows)
+
+
+def tables() -> dict[str, np.ndarray]:
+    """Every table, built from what is loaded"""
+    data.ensure_loaded()
+    events, choices = events_and_choices()
+    return {
+        "weapons": weapons(),
+        "ships": ships(),
+        "events": events,
+        "choices": choices,
+    }
+
+
+def to_arrow(table: np.ndarray) -> "pyarrow.Table":
+    if pyarrow is None:
+        raise ImportError("Arrow tables need pyarrow")
+    return pyarrow.table({name: table[name] for name in table.dtype.names})
+
+
+def export(directory: Path, parquet: bool = None) -> list[Path]:
+    """Writes every table to `directory` as `<table>.npy`, and as `<table>.parquet`
+    if `parquet` is on, which it is by default when pyarrow is installed. Returns the
+    files written."""
+    if parquet is None:
+        parquet = pyarrow is not None
+    elif parquet and pyarrow is None:
+        raise ImportError("Writing Parquet needs pyarrow")
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, table in tables().items():
+        path = directory / f"{name}.npy"
+        np.save(path, table, allow_pickle=False)
+        written.append(path)
+        if parquet:
+            path = directory / f"{name}.parquet"
+            pyarrow.parquet.write_table(to_arrow(table), path)
+            written.append(path)
+    return written
+
+
+def load(directory: Path, name: str) -> np.ndarray:
+    """A table `export` wrote, memory-mapped read-only, so only the columns and rows
+    that get used are read from disk"""
+    return np.load(directory / f"{name}.npy", mmap_mode="r", allow_pickle=False)
@@ -1,41 +1,721 @@
+import hashlib
+import json
 import logging
+import os
 import re
-from io import StringIO
+from concurrent.futures import ProcessPoolExecutor
+from inspect import ismethod
+from itertools import repeat
 from pathlib import Path
-from typing import Iterable
-from xml.etree.ElementTree import Element, ElementTree, parse, ParseError
+from threading import Event as ThreadEvent, RLock, Thread
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Mapping
+from weakref import ref, WeakMethod
+from xml.etree.ElementTree import (
+    Element,
+    ElementTree,
+    fromstring,
+    ParseError,
+    tostring,
+    TreeBuilder,
+    XMLParser,
+)
+
+from .strings import StringTable
 
 LOG = logging.getLogger()
 RESOURCES_DIR = Path(__file__).parent / "resources"
-DATA_DIR = RESOURCES_DIR / "data"
+# `FTL_DATA_DIR` points everything at another data set, like one from `ftl.synthetic`
+DATA_DIR = Path(os.environ.get("FTL_DATA_DIR", RESOURCES_DIR / "data"))
+# Set to `None` to turn the parse cache off
+CACHE_DIR: Path | None = (
+    None
+    if os.environ.get("FTL_NO_CACHE")
+    else Path(os.environ.get("FTL_CACHE_DIR", Path.home() / ".cache" / "ftl"))
+)
+# Bump this whenever what gets written to the cache changes
+CACHE_VERSION = 2
+# How many processes `_load_data` parses files with, 0 or 1 parses them in this one
+LOAD_WORKERS = int(os.environ.get("FTL_LOAD_WORKERS", 0))
+# A file `ftl.snapshot.write` made, to load everything from instead of `DATA_DIR`
+SNAPSHOT: Path | None = (
+    Path(os.environ["FTL_SNAPSHOT"]) if os.environ.get("FTL_SNAPSHOT") else None
+)
+# The name of a block of shared memory `ftl.snapshot.publish` put a snapshot in, to
+# load from instead of either
+SHARED_MEMORY: str | None = os.environ.get("FTL_SHARED_MEMORY") or None
+# Every top level element, except the named `<text>` ones, those are in `STRING_DATA`.
+# With a snapshot it stays empty until `all_elements`.
 RAW_DATA = Element("FTL")
+STRING_DATA = StringTable()
+# tag -> name -> every top level element in `RAW_DATA` with that tag and name, in load
+# order, so `NAME_INDEX[tag][name][-1]` is the one that wins. With a snapshot each tag
+# gets a `ftl.snapshot.Names`, which only makes the elements that are looked up.
+NAME_INDEX: dict[str, Mapping[str, list[Element]]] = {}
+_LOADED = False
+_SNAPSHOT = None
+# locale -> the named strings from the files in `DATA_DIR / locale`, each one is only
+# loaded the first time it is asked for and shares everything else with the default
+_LOCALES: dict[str, StringTable] = {}
+_LOCALE_STATS: dict[str, dict[Path, tuple[int, int]]] = {}
+_LOCALE_RE = re.compile(r"[A-Za-z0-9_-]+")
+# Goes up by one every time `reload` changes something or everything is forgotten, for
+# anything caching lookups
+GENERATION = 0
+_LOCK = RLock()
+# Callbacks, or weak references to them
+_RELOAD_CALLBACKS: list[Callable[[set[tuple[str, str]]], Any] | ref] = []
+# What every data file contributed the last time it was parsed, in `RAW_DATA` the
+# elements of each file sit together, in sorted file name order
+_FILE_STATS: dict[Path, tuple[int, int]] = {}
+# The sha256 of the content each file was parsed from, so a file that was only touched
+# isn't parsed again
+_FILE_DIGESTS: dict[Path, str] = {}
+_FILE_ELEMENTS: dict[Path, list[Element]] = {}
+_FILE_INDEX: dict[Path, dict[tuple[str, str], list[Element]]] = {}
+# name -> `STRING_DATA` id of the body, for the named strings in every file
+_FILE_STRINGS: dict[Path, dict[str, int]] = {}
+# Optional byte order mark, then the `<?xml ... ?>` declaration
+_DECLARATION_RE = re.compile(rb"(\xef\xbb\xbf)?\s*<\?xml[^>]*\?>")
+
+
+def _iter_elements(xmlfp: Path, chunk_size: int = 1 << 16) -> Iterator[Element]:
+    """Yields the top level elements of the file one at a time as they are parsed.
+
+    The file is fed to the parser in chunks with a synthetic `<FTL>` root put in after
+    the encoding declaration, so files with multiple root elements work without reading
+    the whole thing into memory first. `<FTL>` elements directly under the root are
+    see-through, their children are what gets yielded. Elements are dropped from the
+    tree once they have been yielded, so only the one being built is held on to here.
+    """
+    builder = TreeBuilder()
+    # Holding the outermost element ourselves means the synthetic root can be looked
+    # at while it is still being built, without asking the parser for events
+    outer = builder.start("FTL", {})
+    parser = XMLParser(target=builder)
+    with xmlfp.open("rb") as fp:
+        # Big enough for the whole declaration, however small the chunks are
+        chunk = fp.read(max(chunk_size, 1 << 10))
+        declaration = _DECLARATION_RE.match(chunk)
+        if declaration:
+            parser.feed(chunk[: declaration.end()])
+            chunk = chunk[declaration.end() :]
+        parser.feed(b"<FTL>")
+        while chunk:
+            parser.feed(chunk)
+            yield from _finished_elements(outer[0], done=False)
+            chunk = fp.read(chunk_size)
+    parser.feed(b"</FTL>")
+    builder.end("FTL")
+    parser.close()
+    yield from _finished_elements(outer[0], done=True)
+
+
+def _finished_elements(container: Element, done: bool) -> Iterator[Element]:
+    """Yields and removes the children of the container the parser is finished with.
+    Unless the whole file is `done`, the last child may still be open."""
+    for _ in range(len(container) if done else len(container) - 1):
+        sub = container[0]
+        if sub.tag == "FTL":
+            yield from _finished_elements(sub, done=True)
+        else:
+            _compact(sub)
+            yield sub
+        del container[0]
+    if not done and len(container) and container[-1].tag == "FTL":
+        yield from _finished_elements(container[-1], done=False)
 
 
 def _hack(xmlfp: Path) -> ElementTree:
-    """To deal with xml files that have multiple root elements, wraps it (after the
-    encoding declaration) in an `<FTL>` tag"""
-    fake_fp = StringIO(
-        re.sub(r"(<\?xml[^>]+\?>)", r"\1<FTL>", xmlfp.read_text()) + "</FTL>"
-    )
-    return parse(fake_fp)
+    """To deal with xml files that have multiple root elements, collects everything
+    from `_iter_elements` into a single `<FTL>` tag"""
+    root = Element("FTL")
+    root.extend(_iter_elements(xmlfp))
+    return ElementTree(root)
+
+
+def _compact(e: Element):
+    """Drops the whitespace that is only there for indentation, nothing reads it and it
+    is a good chunk of every file. Text that isn't just whitespace is kept, wherever it
+    is."""
+    for sub in e.iter():
+        if sub.text is not None and not sub.text.strip():
+            sub.text = None
+        if sub.tail is not None and not sub.tail.strip():
+            sub.tail = None
+    # Whatever comes after a top level element isn't part of it
+    e.tail = None
+
+
+def _parse_xml(xmlfp: Path, sink: BinaryIO = None) -> list[Element] | None:
+    """Parses the file and returns its top level elements, or `None` if it is not
+    valid XML. Each element is written to `sink` too as soon as it is parsed, so a
+    document for the parse cache never has to be held in memory in one piece."""
+    try:
+        if sink is None:
+            return list(_iter_elements(xmlfp))
+        elements = []
+        for e in _iter_elements(xmlfp):
+            sink.write(tostring(e, "unicode").encode())
+            elements.append(e)
+        return elements
+    except ParseError as err:
+        LOG.warning(
+            f"File `{str(xmlfp.absolute())}` is not valid XML.\n"
+            f"Original error: `{err.msg}`"
+        )
+        return None
+
+
+def _cache_path(xmlfp: Path, cache_dir: Path) -> Path:
+    key = hashlib.sha1(str(xmlfp.absolute()).encode()).hexdigest()
+    return cache_dir / f"{key}.xml"
+
+
+def _digest(xmlfp: Path) -> str:
+    with xmlfp.open("rb") as fp:
+        return hashlib.file_digest(fp, "sha256").hexdigest()
+
+
+def _source(xmlfp: Path) -> dict[str, Any]:
+    """What a cache entry for the file is checked against. Taken before the file is
+    parsed, so an edit made halfway through doesn't match it the next time."""
+    size, mtime_ns = _stat(xmlfp)
+    return {"size": size, "mtime_ns": mtime_ns, "sha256": _digest(xmlfp)}
+
+
+def _read_cache(xmlfp: Path, cache_dir: Path) -> tuple[bytes, str] | None:
+    """Hands back the cached document for the file, and the sha256 of the file, if it
+    hasn't changed since it was written. The size and mtime are checked first, the content hash only if they
+    differ, so touching a file doesn't throw its entry away, it gets the new size and
+    mtime instead so the file isn't hashed again every time."""
+    try:
+        with _cache_path(xmlfp, cache_dir).open("rb") as fp:
+            header = json.loads(fp.readline())
+            if header["version"] != CACHE_VERSION:
+                return None
+            size, mtime_ns = _stat(xmlfp)
+            if (size, mtime_ns) == (header["size"], header["mtime_ns"]):
+                return fp.read(), header["sha256"]
+            digest = _digest(xmlfp)
+            if digest != header["sha256"]:
+                return None
+            payload = fp.read()
+    except (OSError, ValueError, KeyError):
+        return None
+    source = {"size": size, "mtime_ns": mtime_ns, "sha256": digest}
+    _write_cache(xmlfp, cache_dir, payload, source)
+    return payload, digest
+
+
+def _cache_header(xmlfp: Path, source: dict[str, Any]) -> bytes:
+    header = {"version": CACHE_VERSION, "path": str(xmlfp.absolute()), **source}
+    return json.dumps(header).encode() + b"\n"
+
+
+def _write_cache(xmlfp: Path, cache_dir: Path, payload: bytes, source: dict[str, Any]):
+    """`source` is what `_source` said before the file was parsed"""
+    header = _cache_header(xmlfp, source)
+    cache_fp = _cache_path(xmlfp, cache_dir)
+    tmp_fp = cache_fp.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_fp.write_bytes(header + payload)
+        tmp_fp.replace(cache_fp)
+    except OSError as err:
+        LOG.debug(f"Could not write the parse cache for `{xmlfp}`: {err}")
+
+
+def _serialize(elements: list[Element]) -> bytes:
+    root = Element("FTL")
+    root.extend(elements)
+    return tostring(root, "utf-8")
 
 
-def _load_data():
-    global RAW_DATA
-    for xmlfp in DATA_DIR.glob("*.xml"):
+def _parse_file(xmlfp: Path, cache_dir: Path | None) -> list[Element] | None:
+    """The top level elements of a data file, from the parse cache when it is fresh.
+    Keeps the sha256 of what they were parsed from in `_FILE_DIGESTS`."""
+    if cache_dir is None:
+        _FILE_DIGESTS[xmlfp] = _digest(xmlfp)
+        return _parse_xml(xmlfp)
+    cached = _read_cache(xmlfp, cache_dir)
+    if cached is not None:
         try:
-            tree = parse(xmlfp)
-        except ParseError as err:
-            try:
-                tree = _hack(xmlfp)
-            except ParseError:
-                LOG.warning(
-                    f"File `{str(xmlfp.absolute())}` is not valid XML.\n"
-                    f"Original error: `{err.msg}`"
-                )
+            elements = list(fromstring(cached[0]))
+            _FILE_DIGESTS[xmlfp] = cached[1]
+            return elements
+        except ParseError:
+            pass
+    # The document goes straight into the new entry while the file is parsed
+    cache_fp = _cache_path(xmlfp, cache_dir)
+    tmp_fp = cache_fp.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        source = _source(xmlfp)
+        _FILE_DIGESTS[xmlfp] = source["sha256"]
+        header = _cache_header(xmlfp, source)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with tmp_fp.open("wb") as sink:
+            sink.write(header + b"<FTL>")
+            elements = _parse_xml(xmlfp, sink)
+            sink.write(b"</FTL>")
+        if elements is None:
+            tmp_fp.unlink()
+        else:
+            tmp_fp.replace(cache_fp)
+        return elements
+    except OSError as err:
+        LOG.debug(f"Could not write the parse cache for `{xmlfp}`: {err}")
+        tmp_fp.unlink(missing_ok=True)
+    return _parse_xml(xmlfp)
+
+
+def _file_payload(xmlfp: Path, cache_dir: Path | None) -> tuple[bytes, str] | None:
+    """Runs in a worker process, does all the slow parts of `_parse_file` but hands
+    back a compact document instead of elements, those are much cheaper to parse again
+    than they are to pickle. The sha256 of the file comes with it."""
+    cached = None if cache_dir is None else _read_cache(xmlfp, cache_dir)
+    if cached is not None:
+        return cached
+    source = _source(xmlfp)
+    elements = _parse_xml(xmlfp)
+    if elements is None:
+        return None
+    payload = _serialize(elements)
+    if cache_dir is not None:
+        _write_cache(xmlfp, cache_dir, payload, source)
+    return payload, source["sha256"]
+
+
+def _stat(xmlfp: Path) -> tuple[int, int]:
+    st = xmlfp.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def _split_strings(
+    elements: list[Element],
+) -> tuple[list[Element], list[tuple[str, str | None]]]:
+    """Separates the named `<text>` elements from the rest, returns the rest and the
+    (name, body) pairs"""
+    rest, strings = [], []
+    for e in elements:
+        name = e.get("name")
+        if e.tag == "text" and name is not None:
+            strings.append((name, e.text))
+        else:
+            rest.append(e)
+    return rest, strings
+
+
+def _files_signature(files: list[Path], stats: list[tuple[int, int]]) -> str:
+    files = [(xmlfp.name, *stat) for xmlfp, stat in zip(files, stats)]
+    return hashlib.sha1(json.dumps([CACHE_VERSION, files]).encode()).hexdigest()
+
+
+def _load_strings(
+    table: StringTable, directory: Path, signature: str, bodies: list[str | None]
+) -> range:
+    """Puts the bodies from the files in `directory` in the table, mapped in from the
+    cache when it was saved for exactly these files. Returns their ids."""
+    if CACHE_DIR is None:
+        return table.fill(bodies)
+    strings_fp = _cache_path(directory, CACHE_DIR).with_suffix(".strings")
+    if table.open(strings_fp, signature, len(bodies)):
+        return range(len(bodies))
+    ids = table.fill(bodies)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        table.save(strings_fp, signature)
+    except OSError as err:
+        LOG.debug(f"Could not write the string cache for `{directory}`: {err}")
+    return ids
+
+
+def _index_file(elements: Iterable[Element]) -> dict[tuple[str, str], list[Element]]:
+    index = {}
+    for e in elements:
+        name = e.get("name")
+        if name is not None:
+            index.setdefault((e.tag, name), []).append(e)
+    return index
+
+
+def _load_data(workers: int = None):
+    """Parses every file in `DATA_DIR` into `RAW_DATA`, in sorted file name order.
+    With more than one worker the files are handled in a process pool, the result is
+    the same as the serial one."""
+    workers = LOAD_WORKERS if workers is None else workers
+    files = sorted(DATA_DIR.glob("*.xml"))
+    # Taken before parsing, so a file that changes halfway through gets picked up by
+    # the next `reload`
+    stats = [_stat(xmlfp) for xmlfp in files]
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(min(workers, len(files))) as pool:
+            parsed = []
+            for xmlfp, p in zip(
+                files, pool.map(_file_payload, files, repeat(CACHE_DIR))
+            ):
+                if p is not None:
+                    _FILE_DIGESTS[xmlfp] = p[1]
+                parsed.append(None if p is None else list(fromstring(p[0])))
+    else:
+        parsed = [_parse_file(xmlfp, CACHE_DIR) for xmlfp in files]
+    file_strings = []
+    for xmlfp, stat, elements in zip(files, stats, parsed):
+        elements, strings = _split_strings(elements or [])
+        file_strings.append(strings)
+        _FILE_STATS[xmlfp] = stat
+        _FILE_ELEMENTS[xmlfp] = elements
+        _FILE_INDEX[xmlfp] = _index_file(elements)
+        RAW_DATA.extend(elements)
+    bodies = [body for strings in file_strings for _, body in strings]
+    signature = _files_signature(files, stats)
+    ids = iter(_load_strings(STRING_DATA, DATA_DIR, signature, bodies))
+    for xmlfp, strings in zip(files, file_strings):
+        _FILE_STRINGS[xmlfp] = {name: next(ids) for name, _ in strings}
+    _build_index()
+
+
+def _load_snapshot():
+    """Maps in `SHARED_MEMORY` or `SNAPSHOT`, nothing is parsed or made until it is
+    looked up"""
+    global _SNAPSHOT
+    from .snapshot import Snapshot
+
+    if SHARED_MEMORY is not None:
+        _SNAPSHOT = Snapshot.attach(SHARED_MEMORY)
+    else:
+        _SNAPSHOT = Snapshot.open(SNAPSHOT)
+    _SNAPSHOT.fill_strings(STRING_DATA)
+    for tag in _SNAPSHOT.tags:
+        NAME_INDEX[tag] = _SNAPSHOT.by_name(tag)
+    # What it was made from, for `ftl.locations` to check the files against
+    _FILE_STATS.update(_SNAPSHOT.files)
+    try:
+        stale = _SNAPSHOT.stale()
+    except OSError:
+        stale = True
+    if stale:
+        LOG.warning("The data files changed since the snapshot was made")
+
+
+def _load_locale(locale: str) -> StringTable:
+    """Just the named strings from the files in `DATA_DIR / locale`, in sorted file
+    name order like everything else"""
+    files = sorted((DATA_DIR / locale).glob("*.xml"))
+    if not files:
+        LOG.warning(f"There are no strings for locale `{locale}` in `{DATA_DIR}`")
+    stats = [_stat(xmlfp) for xmlfp in files]
+    file_strings = [_split_strings(_parse_file(fp, CACHE_DIR) or [])[1] for fp in files]
+    bodies = [body for strings in file_strings for _, body in strings]
+    table = StringTable()
+    signature = _files_signature(files, stats)
+    ids = iter(_load_strings(table, DATA_DIR / locale, signature, bodies))
+    for strings in file_strings:
+        for name, _ in strings:
+            table.bind(name, next(ids))
+    _LOCALE_STATS[locale] = dict(zip(files, stats))
+    return table
+
+
+def _reload_locales() -> set[tuple[str, str]]:
+    """Loads every locale that was used again if any of its files changed"""
+    keys = set()
+    for locale, stats in list(_LOCALE_STATS.items()):
+        files = sorted((DATA_DIR / locale).glob("*.xml"))
+        if {xmlfp: _stat(xmlfp) for xmlfp in files} == stats:
+            continue
+        old = _LOCALES.pop(locale)
+        _LOCALES[locale] = new = _load_locale(locale)
+        keys |= {("text", name) for name in (*old, *new)}
+    return keys
+
+
+def _build_index():
+    NAME_INDEX.clear()
+    for xmlfp in sorted(_FILE_INDEX):
+        for (tag, name), elements in _FILE_INDEX[xmlfp].items():
+            NAME_INDEX.setdefault(tag, {}).setdefault(name, []).extend(elements)
+    for xmlfp in sorted(_FILE_STRINGS):
+        for name, i in _FILE_STRINGS[xmlfp].items():
+            STRING_DATA.bind(name, i)
+
+
+def _reindex(keys: Iterable[tuple[str, str]]):
+    """Rebuilds the `NAME_INDEX` and `STRING_DATA` entries for just these keys"""
+    files = sorted(_FILE_INDEX)
+    for tag, name in keys:
+        if tag == "text":
+            ids = [_FILE_STRINGS[fp][name] for fp in files if name in _FILE_STRINGS[fp]]
+            if ids:
+                STRING_DATA.bind(name, ids[-1])
+            else:
+                STRING_DATA.unbind(name)
+        elements = [e for fp in files for e in _FILE_INDEX[fp].get((tag, name), ())]
+        by_name = NAME_INDEX.setdefault(tag, {})
+        if elements:
+            by_name[name] = elements
+        else:
+            by_name.pop(name, None)
+
+
+def _replace_file(xmlfp: Path, elements: list[Element] | None) -> set[tuple[str, str]]:
+    """Swaps the elements from one file in `RAW_DATA` in place, `None` means the file
+    is gone. Returns the (tag, name) keys that were touched."""
+    old = _FILE_ELEMENTS.pop(xmlfp, [])
+    _FILE_INDEX.pop(xmlfp, None)
+    keys = {("text", name) for name in _FILE_STRINGS.pop(xmlfp, ())}
+    gone = elements is None
+    elements, strings = _split_strings(elements or [])
+    start = sum(len(v) for fp, v in _FILE_ELEMENTS.items() if fp < xmlfp)
+    RAW_DATA[start : start + len(old)] = elements
+    new_index = {}
+    if not gone:
+        _FILE_ELEMENTS[xmlfp] = elements
+        _FILE_INDEX[xmlfp] = new_index = _index_file(elements)
+        _FILE_STRINGS[xmlfp] = {name: STRING_DATA.add(body) for name, body in strings}
+        keys |= {("text", name) for name in _FILE_STRINGS[xmlfp]}
+    return keys | {*_index_file(old), *new_index}
+
+
+def _compact_strings():
+    """Drops the bodies of the strings that were replaced by a `reload`, once there
+    are as many of them as there are of the rest"""
+    live = [i for ids in _FILE_STRINGS.values() for i in ids.values()]
+    if STRING_DATA.count < 2 * max(len(live), 1):
+        return
+    moved = STRING_DATA.compact(live)
+    for ids in _FILE_STRINGS.values():
+        for name, i in ids.items():
+            ids[name] = moved[i]
+
+
+def reload(paths: Iterable[Path] = None) -> set[tuple[str, str]]:
+    """Re-parses the data files that were added, changed or removed since they were
+    loaded, or just `paths` if given, and any locale that was used whose files
+    changed. Everything from untouched files is left as is. Returns the (tag, name)
+    keys of every top level element that was replaced, and hands them to the
+    `on_reload` callbacks."""
+    global GENERATION
+    with _LOCK:
+        if not _LOADED or _SNAPSHOT is not None:
+            # A snapshot never changes
+            ensure_loaded()
+            return set()
+        present = set(DATA_DIR.glob("*.xml"))
+        if paths is None:
+            candidates = present | _FILE_ELEMENTS.keys()
+        else:
+            candidates = {DATA_DIR / Path(p).name for p in paths}
+        keys = set()
+        for xmlfp in sorted(candidates):
+            if xmlfp not in present:
+                _FILE_STATS.pop(xmlfp, None)
+                _FILE_DIGESTS.pop(xmlfp, None)
+                keys |= _replace_file(xmlfp, None)
+                continue
+            stat = _stat(xmlfp)
+            if stat == _FILE_STATS.get(xmlfp):
                 continue
-        for e in tree.iter("FTL"):
-            RAW_DATA.extend(e)
+            _FILE_STATS[xmlfp] = stat
+            if _FILE_DIGESTS.get(xmlfp) == _digest(xmlfp):
+                # Only touched
+                continue
+            elements = _parse_file(xmlfp, CACHE_DIR)
+            if elements is None:
+                # Probably saved halfway through an edit, keep what we had
+                continue
+            keys |= _replace_file(xmlfp, elements)
+        if keys:
+            _reindex(keys)
+            _compact_strings()
+        keys |= _reload_locales()
+        if keys:
+            GENERATION += 1
+            for callback in _reload_callbacks():
+                callback(keys)
+        return keys
+
+
+def _reload_callbacks() -> list[Callable[[set[tuple[str, str]]], Any]]:
+    """The callbacks that are still around, forgetting the weak ones that are gone"""
+    out, alive = [], []
+    for entry in _RELOAD_CALLBACKS:
+        callback = entry() if isinstance(entry, ref) else entry
+        if callback is not None:
+            out.append(callback)
+            alive.append(entry)
+    _RELOAD_CALLBACKS[:] = alive
+    return out
+
+
+def on_reload(callback: Callable[[set[tuple[str, str]]], Any], weak: bool = False):
+    """Registers a callback that gets the changed (tag, name) keys after every
+    `reload` that changed something. With `weak` only a weak reference to it is
+    kept, a method stops being called once its object is gone."""
+    if weak:
+        _RELOAD_CALLBACKS.append(
+            WeakMethod(callback) if ismethod(callback) else ref(callback)
+        )
+    else:
+        _RELOAD_CALLBACKS.append(callback)
+    return callback
+
+
+def off_reload(callback: Callable[[set[tuple[str, str]]], Any]):
+    """Unregisters a callback `on_reload` registered"""
+    with _LOCK:
+        _RELOAD_CALLBACKS[:] = [
+            entry
+            for entry in _RELOAD_CALLBACKS
+            if (entry() if isinstance(entry, ref) else entry) != callback
+        ]
+
+
+class Watcher(Thread):
+    """Polls `DATA_DIR` every `interval` seconds and reloads whatever changed"""
+
+    def __init__(self, interval: float = 1.0):
+        super().__init__(name="ftl-data-watcher", daemon=True)
+        self.interval = interval
+        self._stopped = ThreadEvent()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                reload()
+            except Exception:  # noqa
+                LOG.exception("Reloading the FTL data failed")
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def watch(interval: float = 1.0) -> Watcher:
+    watcher = Watcher(interval)
+    watcher.start()
+    return watcher
+
+
+def _reset():
+    """Forgets everything that was loaded, the next access parses `DATA_DIR` again"""
+    global _LOADED, GENERATION, _SNAPSHOT
+    with _LOCK:
+        _LOADED = False
+        _SNAPSHOT = None
+        GENERATION += 1
+        RAW_DATA.clear()
+        STRING_DATA.clear()
+        NAME_INDEX.clear()
+        _FILE_STATS.clear()
+        _FILE_DIGESTS.clear()
+        _FILE_ELEMENTS.clear()
+        _FILE_INDEX.clear()
+        _FILE_STRINGS.clear()
+        for table in _LOCALES.values():
+            table.clear()
+        _LOCALES.clear()
+        _LOCALE_STATS.clear()
+
+
+def use_data_dir(data_dir: Path, cache_dir: Path | None = ...):
+    """Points everything at the data files in `data_dir` instead, whatever was loaded
+    from the old one is forgotten. `cache_dir` replaces `CACHE_DIR` when it is given."""
+    global DATA_DIR, CACHE_DIR, SNAPSHOT, SHARED_MEMORY
+    with _LOCK:
+        _reset()
+        DATA_DIR = Path(data_dir)
+        SNAPSHOT = SHARED_MEMORY = None
+        if cache_dir is not ...:
+            CACHE_DIR = cache_dir
+
+
+def use_snapshot(path: Path):
+    """Loads everything from a file `ftl.snapshot.write` made instead of the data
+    files, whatever was loaded before is forgotten"""
+    global SNAPSHOT, SHARED_MEMORY
+    with _LOCK:
+        _reset()
+        SNAPSHOT, SHARED_MEMORY = Path(path), None
+
+
+def use_shared_memory(name: str):
+    """Loads everything from the snapshot `ftl.snapshot.publish` put in the shared
+    memory called `name`, whatever was loaded before is forgotten. Every process that
+    does shares the one copy, each only makes the elements it looks up."""
+    global SNAPSHOT, SHARED_MEMORY
+    with _LOCK:
+        _reset()
+        SNAPSHOT, SHARED_MEMORY = None, name
+
+
+def ensure_loaded() -> Element:
+    """Parses everything in `DATA_DIR`, or maps in the snapshot, the first time it is
+    called, every call after that just hands back `RAW_DATA`"""
+    global _LOADED
+    if not _LOADED:
+        with _LOCK:
+            if not _LOADED:
+                if SNAPSHOT is None and SHARED_MEMORY is None:
+                    _load_data()
+                else:
+                    _load_snapshot()
+                _LOADED = True
+    return RAW_DATA
+
+
+def all_elements() -> Element:
+    """`RAW_DATA` with every top level element in it, which it only has with a
+    snapshot once this has been called"""
+    ensure_loaded()
+    with _LOCK:
+        if _SNAPSHOT is not None and not len(RAW_DATA):
+            RAW_DATA.extend(_SNAPSHOT.roots())
+    return RAW_DATA
+
+
+def file_elements() -> dict[Path, list[Element]]:
+    """file -> its top level elements, except the named strings, in load order. With a
+    snapshot they are only all made once this has been called."""
+    all_elements()
+    with _LOCK:
+        if _SNAPSHOT is not None and not _FILE_ELEMENTS:
+            _FILE_ELEMENTS.update(_SNAPSHOT.by_file())
+    return _FILE_ELEMENTS
+
+
+def strings(locale: str = None) -> Mapping[str, str | None]:
+    """The named strings for the locale, from the files in `DATA_DIR / locale`. `None`
+    is the default ones, from `DATA_DIR` itself."""
+    if locale is None:
+        ensure_loaded()
+        return STRING_DATA
+    try:
+        return _LOCALES[locale]
+    except KeyError:
+        pass
+    if not _LOCALE_RE.fullmatch(locale):
+        raise ValueError(f"`{locale}` is not a locale")
+    with _LOCK:
+        if locale not in _LOCALES:
+            _LOCALES[locale] = _load_locale(locale)
+        return _LOCALES[locale]
+
+
+def get_string(name: str, default: str = None, locale: str = None) -> str | None:
+    """The named string in the locale, or the default locale's one when the locale
+    doesn't have it"""
+    if locale is not None:
+        translated = strings(locale)
+        if name in translated:
+            return translated[name]
+    ensure_loaded()
+    return STRING_DATA.get(name, default)
+
+
+def named_elements(tag: str) -> dict[str, list[Element]]:
+    """Every top level element with the tag, grouped by their `name` attribute"""
+    ensure_loaded()
+    return NAME_INDEX.get(tag, {})
 
 
 def load_one_thing(tag: str, name: str) -> Element:
@@ -45,9 +725,16 @@ def load_one_thing(tag: str, name: str) -> Element:
 
 
 def load_all_things(tag: str, names: Iterable[str] = ()) -> Iterable[Element]:
+    if tag == "text":
+        # The named strings aren't elements anymore, each is made up again from its
+        # body in `STRING_DATA`
+        ensure_loaded()
+        for name in names:
+            if name in STRING_DATA:
+                e = Element("text", name=name)
+                e.text = STRING_DATA[name]
+                yield e
+        return
+    by_name = named_elements(tag)
     for name in names:
-        yield from RAW_DATA.findall(f".{tag}[@name='{name}']")
-
-
-_load_data()
-STRING_DATA = {sub.get("name"): sub.text for sub in RAW_DATA.findall("text[@name]")}
+        yield from by_name.get(name, ())
@@ -1,15 +1,59 @@
 from xml.etree.ElementTree import Element
 
-from ftl.utils import get_xml
+from .locations import locate, Location
+
+# How much of an element goes in an error message
+SNIPPET_LENGTH = 120
+
+
+def snippet(e: Element, limit: int = SNIPPET_LENGTH) -> str:
+    """The start of the element as XML, cut short at `limit` characters. Only the
+    start tag and the text are looked at, not the whole element."""
+    attrs = "".join(f' {k}="{v}"' for k, v in e.items())
+    if len(e) == 0 and not e.text:
+        out = f"<{e.tag}{attrs}/>"
+    else:
+        inner = (e.text or "").strip()
+        if len(e):
+            inner += f"...{len(e)} children..."
+        out = f"<{e.tag}{attrs}>{inner}</{e.tag}>"
+    return out if len(out) <= limit else out[: limit - 3] + "..."
 
 
 class Sad(BaseException):
+    """Something in the data that isn't handled. The message, with where the element
+    is in the data files, is only worked out when it is asked for."""
+
+    def __init__(
+        self, message: str = "", element: Element = None, parent: Element = None
+    ):
+        super().__init__(message)
+        self.element = element
+        self.parent = parent
+
     @classmethod
     def from_elem(cls, e: Element):
-        return Sad(f"Unhandled element: `{get_xml(e)}`")
+        return cls(element=e)
 
     @classmethod
     def from_sub_elem(cls, e: Element, s: Element):
-        return Sad(
-            f"Unhandled element: `{get_xml(s)}` inside of parent element:\n{get_xml(e)}"
-        )
+        return cls(element=s, parent=e)
+
+    @property
+    def location(self) -> Location | None:
+        """Where the element, or its parent, is in the data files"""
+        for e in (self.element, self.parent):
+            if e is not None:
+                location = locate(e)
+                if location is not None:
+                    return location
+        return None
+
+    def __str__(self) -> str:
+        if self.element is None:
+            return super().__str__()
+        message = f"Unhandled element: `{snippet(self.element)}`"
+        if self.parent is not None:
+            message += f" inside of parent element: `{snippet(self.parent)}`"
+        location = self.location
+        return message if location is None else f"{location}: {message}"
@@ -0,0 +1,268 @@
+"""
+Which events lead where.
+
+Every named `event`, `eventList`, `ship` and `sectorDescription` is a node. An edge goes
+from a node to everything it can hand control to: `load=` on any event inside it,
+`<quest event=...>`, `<ship load=...>`, and for sectors the start event and the lists
+it draws beacons from. Anonymous nested events are part of the named one they are in.
+
+The edges are kept as CSR arrays of node numbers both ways round, the strongly
+connected components are worked out once, and reachability is answered from bitsets
+over the components that get built the first time they are needed.
+"""
+
+from array import array
+from typing import Iterable, Iterator
+from xml.etree.ElementTree import Element
+
+from . import data
+
+Key = tuple[str, str]
+# Tags that are nodes, `load=` resolves to the first of these that has the name
+NODE_TAGS = ("event", "eventList", "ship", "sectorDescription")
+LOADABLE_TAGS = ("event", "eventList")
+
+
+def _references(e: Element) -> Iterator[tuple[str, str]]:
+    """(namespace, name) of everything the element refers to, the namespace is
+    `load` for events and event lists and `ship` for ships"""
+    if e.tag == "sectorDescription":
+        for sub in e:
+            if sub.tag == "event" and sub.get("name"):
+                yield "load", sub.get("name")
+            elif sub.tag == "startEvent" and sub.text:
+                yield "load", sub.text.strip()
+        return
+    for sub in e.iter():
+        tag = sub.tag
+        if tag == "event":
+            load = sub.get("load")
+            if load:
+                yield "load", load
+        elif tag == "quest":
+            if sub.get("event"):
+                yield "load", sub.get("event")
+        elif tag == "ship":
+            load = sub.get("load")
+            if load:
+                yield "ship", load
+
+
+def _csr(adjacency: list[Iterable[int]]) -> tuple[array, array]:
+    offsets, targets = array("l", [0]), array("l")
+    for successors in adjacency:
+        targets.extend(sorted(successors))
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+class EventGraph:
+    def __init__(self, elements: dict[Key, Element]):
+        self.keys: list[Key] = list(elements)
+        self.index: dict[Key, int] = {key: i for i, key in enumerate(self.keys)}
+        # (from, (namespace, name)) for every reference to something that isn't there
+        self.missing: set[tuple[Key, tuple[str, str]]] = set()
+        forward: list[set[int]] = [set() for _ in self.keys]
+        backward: list[set[int]] = [set() for _ in self.keys]
+        for i, (key, e) in enumerate(elements.items()):
+            for ref in _references(e):
+                j = self._resolve(ref)
+                if j is None:
+                    self.missing.add((key, ref))
+                else:
+                    forward[i].add(j)
+                    backward[j].add(i)
+        self._offsets, self._targets = _csr(forward)
+        self._r_offsets, self._r_targets = _csr(backward)
+        self.component, self.components = self._tarjan()
+        dag = [set() for _ in self.components]
+        r_dag = [set() for _ in self.components]
+        for i in range(len(self.keys)):
+            c = self.component[i]
+            for j in self._successors(i):
+                d = self.component[j]
+                if c != d:
+                    dag[c].add(d)
+                    r_dag[d].add(c)
+        self._dag = _csr(dag)
+        self._r_dag = _csr(r_dag)
+        # component -> bitset of the components it reaches, or is reached from
+        self._reach: dict[int, int] = {}
+        self._reached_from: dict[int, int] = {}
+        # (forwards?, node) -> what `descendants` or `ancestors` came up with
+        self._expanded: dict[tuple[bool, int], frozenset[Key]] = {}
+
+    def _resolve(self, ref: tuple[str, str]) -> int | None:
+        namespace, name = ref
+        tags = LOADABLE_TAGS if namespace == "load" else (namespace,)
+        for tag in tags:
+            i = self.index.get((tag, name))
+            if i is not None:
+                return i
+        return None
+
+    def node(self, key: Key | str) -> int:
+        """The node number for a (tag, name) key, or a name resolved like `load=`"""
+        if isinstance(key, str):
+            i = self._resolve(("load", key))
+            if i is None:
+                raise KeyError(key)
+            return i
+        return self.index[key]
+
+    def _successors(self, i: int) -> array:
+        return self._targets[self._offsets[i] : self._offsets[i + 1]]
+
+    def successors(self, key: Key | str) -> list[Key]:
+        return [self.keys[j] for j in self._successors(self.node(key))]
+
+    def predecessors(self, key: Key | str) -> list[Key]:
+        i = self.node(key)
+        return [
+            self.keys[j]
+            for j in self._r_targets[self._r_offsets[i] : self._r_offsets[i + 1]]
+        ]
+
+    def _tarjan(self) -> tuple[array, list[list[int]]]:
+        """Iterative Tarjan, components come out in reverse topological order so
+        everything a component leads to has a lower number than it"""
+        n = len(self.keys)
+        offsets, targets = self._offsets, self._targets
+        index = array("l", [-1]) * n
+        low = array("l", [0]) * n
+        component = array("l", [-1]) * n
+        on_stack = bytearray(n)
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            # (node, position in its successors)
+            work = [(root, offsets[root])]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            while work:
+                v, pos = work[-1]
+                if pos < offsets[v + 1]:
+                    work[-1] = (v, pos + 1)
+                    w = targets[pos]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        work.append((w, offsets[w]))
+                    elif on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                    continue
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+                if low[v] == index[v]:
+                    members = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component[w] = len(components)
+                        members.append(w)
+                        if w == v:
+                            break
+                    components.append(members)
+        return component, components
+
+    def cycles(self) -> list[list[Key]]:
+        """Every group of nodes that can lead back to each other"""
+        return [
+            [self.keys[j] for j in members]
+            for members in self.components
+            if self._loops(members[0])
+        ]
+
+    @staticmethod
+    def _closure(c: int, dag: tuple[array, array], memo: dict[int, int]) -> int:
+        offsets, targets = dag
+        stack = [c]
+        while stack:
+            top = stack[-1]
+            if top in memo:
+                stack.pop()
+                continue
+            nexts = targets[offsets[top] : offsets[top + 1]]
+            pending = [d for d in nexts if d not in memo]
+            if pending:
+                stack.extend(pending)
+                continue
+            bits = 1 << top
+            for d in nexts:
+                bits |= memo[d]
+            memo[top] = bits
+            stack.pop()
+        return memo[c]
+
+    def _expand(self, bits: int) -> list[Key]:
+        out = []
+        while bits:
+            low = bits & -bits
+            out.extend(self.keys[i] for i in self.components[low.bit_length() - 1])
+            bits ^= low
+        return out
+
+    def can_reach(self, source: Key | str, target: Key | str) -> bool:
+        """If there is any path from `source` to `target`"""
+        c = self.component[self.node(source)]
+        d = self.component[self.node(target)]
+        return bool(self._closure(c, self._dag, self._reach) >> d & 1)
+
+    def _loops(self, i: int) -> bool:
+        return len(self.components[self.component[i]]) > 1 or i in self._successors(i)
+
+    def _related(self, i: int, forward: bool) -> frozenset[Key]:
+        try:
+            return self._expanded[forward, i]
+        except KeyError:
+            pass
+        if forward:
+            bits = self._closure(self.component[i], self._dag, self._reach)
+        else:
+            bits = self._closure(self.component[i], self._r_dag, self._reached_from)
+        out = set(self._expand(bits))
+        if not self._loops(i):
+            out.discard(self.keys[i])
+        related = self._expanded[forward, i] = frozenset(out)
+        return related
+
+    def descendants(self, key: Key | str) -> frozenset[Key]:
+        """Everything that can follow `key`, not counting itself unless it loops"""
+        return self._related(self.node(key), True)
+
+    def ancestors(self, key: Key | str) -> frozenset[Key]:
+        """Everything that can lead to `key`, not counting itself unless it loops"""
+        return self._related(self.node(key), False)
+
+
+_GRAPH: tuple[int, EventGraph] | None = None
+
+
+def build() -> EventGraph:
+    """A fresh graph of everything that is loaded"""
+    data.ensure_loaded()
+    return EventGraph(
+        {
+            (tag, name): subs[-1]
+            for tag in NODE_TAGS
+            for name, subs in data.named_elements(tag).items()
+        }
+    )
+
+
+def graph() -> EventGraph:
+    """The graph of everything that is loaded, built again after a reload"""
+    global _GRAPH
+    data.ensure_loaded()
+    generation = data.GENERATION
+    if _GRAPH is None or _GRAPH[0] != generation:
+        _GRAPH = generation, build()
+    return _GRAPH[1]
@@ -0,0 +1,168 @@
+"""
+Where in the data files an element came from.
+
+Nothing is recorded while loading, the parser that builds the elements doesn't say
+where they were. The first time an element from a file is looked up the file is run
+through expat again, which only notes where each element starts, and those positions
+are matched up with the loaded elements in document order. They are kept in two
+arrays per file, with a table from element `id` to position, until the file is
+reloaded.
+"""
+
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+from weakref import WeakKeyDictionary
+from xml.etree.ElementTree import Element
+from xml.parsers import expat
+
+from . import data
+
+
+class Location(NamedTuple):
+    file: Path
+    line: int
+    # Counting from 1, like the line
+    column: int
+
+    def __str__(self) -> str:
+        return f"{self.file.name}:{self.line}:{self.column}"
+
+
+def _positions(xmlfp: Path) -> tuple[array, array] | None:
+    """(line, column) of every element `data` keeps from the file, in document order,
+    or `None` if it can't be parsed. The `<FTL>` wrappers and the named strings are
+    left out like the loader leaves them out."""
+    lines, columns = array("l"), array("l")
+    parser = expat.ParserCreate()
+    # How deep the current element is, counting the synthetic root, how deep the
+    # see-through `<FTL>` wrappers go, and how deep the named string being skipped is
+    depth = wrappers = skipping = 0
+
+    def start(tag: str, attrs: dict):
+        nonlocal depth, wrappers, skipping
+        depth += 1
+        if skipping:
+            return
+        if depth == wrappers + 1:
+            if tag == "FTL":
+                wrappers = depth
+                return
+            if tag == "text" and "name" in attrs:
+                skipping = depth
+                return
+        lines.append(parser.CurrentLineNumber)
+        columns.append(parser.CurrentColumnNumber + 1)
+
+    def end(tag: str):
+        nonlocal depth, wrappers, skipping
+        if skipping == depth:
+            skipping = 0
+        elif wrappers == depth:
+            wrappers -= 1
+        depth -= 1
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    content = xmlfp.read_bytes()
+    declaration = data._DECLARATION_RE.match(content)
+    head = declaration.end() if declaration else 0
+    try:
+        # The same synthetic root the loader puts in, for files with more than one
+        # root element
+        parser.Parse(content[:head] + b"<FTL>", False)
+        root_line, root_end = parser.CurrentLineNumber, parser.CurrentColumnNumber
+        parser.Parse(content[head:], False)
+        parser.Parse(b"</FTL>", True)
+    except expat.ExpatError:
+        return None
+    # Anything on the same line as the synthetic root got pushed along by it
+    for i, line in enumerate(lines):
+        if line != root_line:
+            break
+        if columns[i] > root_end:
+            columns[i] -= len(b"<FTL>")
+    return lines, columns
+
+
+def _unchanged_positions(xmlfp: Path, count: int) -> tuple[array, array] | None:
+    """`_positions` of a file that has the `count` elements it had when it was loaded,
+    `None` if it was changed since, those can't be matched up"""
+    try:
+        if data._stat(xmlfp) != data._FILE_STATS.get(xmlfp):
+            return None
+    except OSError:
+        return None
+    positions = _positions(xmlfp)
+    if positions is None or len(positions[0]) != count:
+        return None
+    return positions
+
+
+class _FilePositions:
+    def __init__(self, xmlfp: Path, elements: list[Element]):
+        # Kept to tell when the file has been reloaded, and so the ids stay unique
+        self.elements = elements
+        self.ids = {
+            id(sub): i
+            for i, sub in enumerate(sub for top in elements for sub in top.iter())
+        }
+        self.xmlfp = xmlfp
+        self._positions: tuple[array, array] | None = None
+        self._parsed = False
+
+    def locate(self, e: Element) -> Location | None:
+        i = self.ids.get(id(e))
+        if i is None:
+            return None
+        if not self._parsed:
+            self._parsed = True
+            self._positions = _unchanged_positions(self.xmlfp, len(self.ids))
+        if self._positions is None:
+            return None
+        lines, columns = self._positions
+        return Location(self.xmlfp, lines[i], columns[i])
+
+
+_FILES: dict[Path, _FilePositions] = {}
+# The positions in the files each snapshot was made from, for as long as it is around
+_SNAPSHOT_FILES: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _locate_in_snapshot(snapshot, e: Element) -> Location | None:
+    """Where an element of a snapshot is, from where it is in the snapshot, so none of
+    the other elements have to be made"""
+    found = snapshot.where(e)
+    if found is None:
+        return None
+    xmlfp, i, count = found
+    files = _SNAPSHOT_FILES.setdefault(snapshot, {})
+    if xmlfp not in files:
+        files[xmlfp] = _unchanged_positions(xmlfp, count)
+    if files[xmlfp] is None:
+        return None
+    lines, columns = files[xmlfp]
+    return Location(xmlfp, lines[i], columns[i])
+
+
+def locate(e: Element) -> Location | None:
+    """Where the loaded element is in the data files, `None` if nothing is loaded, it
+    didn't come from one or its file changed since it was loaded. Nothing gets loaded
+    or made to find out."""
+    if not data._LOADED:
+        return None
+    with data._LOCK:
+        if data._SNAPSHOT is not None:
+            return _locate_in_snapshot(data._SNAPSHOT, e)
+        files = data._FILE_ELEMENTS
+        for xmlfp in list(_FILES):
+            if _FILES[xmlfp].elements is not files.get(xmlfp):
+                del _FILES[xmlfp]
+        for xmlfp, elements in files.items():
+            positions = _FILES.get(xmlfp)
+            if positions is None:
+                positions = _FILES[xmlfp] = _FilePositions(xmlfp, elements)
+            location = positions.locate(e)
+            if location is not None:
+                return location
+    return None
@@ -1,16 +1,22 @@
-from typing import Type
+import os
+from typing import Generic, Iterator, Mapping, Type
 from xml.etree.ElementTree import Element
 
-from .base import ElementModel, M
+from .base import ElementModel, M, Parent
 from .event import Event
 from .sector import SectorDescription, SectorType
 from .ship_blueprints import ShipBlueprint
+from .slim import slim
 from .text import TextList
 from .weapon_blueprints import WeaponBlueprint
-from ..data import RAW_DATA, STRING_DATA
+from .. import data
+from ..data import all_elements, named_elements, on_reload, STRING_DATA
 
 __all__ = "FTL"
 
+# Everything has been attached by now
+Parent.freeze()
+
 
 def _make_element_dict(return_class: Type[M], *elements: Element) -> dict[str, M]:
     out = {}
@@ -50,7 +56,117 @@ class _FTL(ElementModel):
             #     WeaponBlueprint, *e.iter("weaponBlueprint")
             # ),
         }
-        return cls(**kwargs)
+        return cls.build(**kwargs)
+
+
+class LazyElementDict(Mapping[str, M], Generic[M]):
+    """Read only stand-in for the dicts on `_FTL`. The data files aren't touched until
+    the first access, and each model is only built the first time its name is looked
+    up."""
+
+    def __init__(self, return_class: Type[M], tag: str, slim: bool = False):
+        self._return_class = return_class
+        self._tag = tag
+        # Hand out read-only `slim` copies instead of the models themselves
+        self.slim = slim
+        self._models: dict[str, M] = {}
+        # `data.GENERATION` the models are up to date with
+        self._generation = data.GENERATION
+
+    @property
+    def elements(self) -> Mapping[str, list[Element]]:
+        """name -> every element with our tag and that name, the last one wins. It is
+        looked up every time, `reload` changes it in place."""
+        return named_elements(self._tag)
+
+    def _current(self) -> dict[str, M]:
+        """`_models`, emptied first if everything was forgotten since they were built,
+        like when the data is pointed somewhere else"""
+        if self._generation != data.GENERATION:
+            with data._LOCK:
+                if self._generation != data.GENERATION:
+                    self._models.clear()
+                    self._generation = data.GENERATION
+        return self._models
+
+    def __getitem__(self, name: str) -> M:
+        models = self._current()
+        try:
+            return models[name]
+        except KeyError:
+            pass
+        generation = self._generation
+        model = self._return_class.from_elem(self.elements[name][-1])
+        if self.slim:
+            model = slim(model)
+        # `reload` bumps the generation and invalidates under the lock, a model built
+        # from an element it has replaced since is handed out but not kept
+        with data._LOCK:
+            if data.GENERATION == generation:
+                models[name] = model
+        return model
+
+    def __contains__(self, name) -> bool:
+        return name in self.elements
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.elements)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def invalidate(self, keys: set[tuple[str, str]]):
+        """Forgets the models for any of the reloaded (tag, name) keys that are ours,
+        every other model stays as it is"""
+        for tag, name in keys:
+            if tag == self._tag:
+                self._models.pop(name, None)
+        # Only models that were current before this reload still are
+        if self._generation == data.GENERATION - 1:
+            self._generation = data.GENERATION
+
+
+class _LazyFTL:
+    """Has the same attributes as `_FTL`, but parses nothing until one is used. Use
+    `materialize` to build everything up front."""
+
+    def __init__(self, slim: bool = False):
+        self.sector_descriptions = LazyElementDict(
+            SectorDescription, SectorDescription.tag_name
+        )
+        self.sector_types = LazyElementDict(SectorType, SectorType.tag_name)
+        self.events = LazyElementDict(Event, Event.tag_name)
+        self.ship_blueprints = LazyElementDict(ShipBlueprint, ShipBlueprint.tag_name)
+        self.text_lists = LazyElementDict(TextList, TextList.tag_name)
+        self.set_slim(slim)
+        # Weakly, so an instance that is dropped takes its models with it
+        on_reload(self._invalidate, weak=True)
+
+    def _dicts(self) -> tuple[LazyElementDict, ...]:
+        return (
+            self.sector_descriptions,
+            self.sector_types,
+            self.events,
+            self.ship_blueprints,
+            self.text_lists,
+        )
+
+    def _invalidate(self, keys: set[tuple[str, str]]):
+        for d in self._dicts():
+            d.invalidate(keys)
+
+    def set_slim(self, slim: bool = True) -> bool:
+        """Turns handing out read-only `ftl.models.slim` copies instead of pydantic
+        models on or off, returns what it was before. Models that were already built
+        are forgotten."""
+        previous = self.events.slim
+        for d in self._dicts():
+            d.slim = slim
+            d._models.clear()
+        return previous
+
+    def materialize(self) -> _FTL:
+        return _FTL.from_elem(all_elements())
 
 
-FTL = _FTL.from_elem(RAW_DATA)
+FTL = _LazyFTL(slim=bool(os.environ.get("FTL_SLIM")))
@@ -1,18 +1,31 @@
+import os
 import re
 from abc import ABC, abstractmethod
-from typing import Any, ClassVar, Iterator, Type, TypeVar, Set
+from typing import AbstractSet, Any, Callable, ClassVar, Iterator, Type, TypeVar, Set
 from xml.etree.ElementTree import Element
 
 import inflection
 from inflection import underscore
-from pydantic import BaseModel as BaseM
+from pydantic import BaseModel as BaseM, ConstrainedInt
+from pydantic.fields import SHAPE_DICT, SHAPE_LIST, SHAPE_SINGLETON
 
 # noinspection PyProtectedMember
 from pydantic.main import ModelMetaclass
 
+from .. import data
 from ..exceptions import Sad
 
 RESERVED = {"id_": "id", "type_": "type", "class_": "class"}
+# When this is on, `BaseModel.build` skips pydantic validation, only use it for data
+# that has made it through a validated load before
+TRUSTED = bool(os.environ.get("FTL_TRUSTED"))
+_TRUE = {"true", "1", "yes", "on", "t", "y"}
+_FALSE = {"false", "0", "no", "off", "f", "n"}
+_MISSING = object()
+# (class, canonical keywords) -> the model `build` made for them, while sharing is on
+_SHARED: dict[tuple, Any] | None = {} if os.environ.get("FTL_SHARED") else None
+# `data.GENERATION` when `_SHARED` was last emptied
+_SHARED_GENERATION = data.GENERATION
 
 
 def special_camel(s: str):
@@ -23,29 +36,324 @@ class TrackDependentsMeta(ModelMetaclass):
     # noinspection PyTypeHints
     def __new__(mcs, name, bases, namespace, **kwargs):
         cls = super().__new__(mcs, name, bases, namespace, **kwargs)
-        cls._dependents: ClassVar[set[str]] = set()
+        # Every class gets registries of its own, starting from what its bases had
+        # attached when it was created, so attaching to one never leaks into another
+        child_tags = {}
+        for base in reversed(cls.__mro__[1:]):
+            child_tags.update(base.__dict__.get("_child_tags", {}))
+        cls._child_tags: ClassVar[dict[str, tuple[type, str]]] = child_tags
+        cls._dependents: ClassVar[set[str]] = set(child_tags)
         cls._tag_set: ClassVar[set[str]] = set()
         return cls
 
 
+def set_trusted(trusted: bool = True) -> bool:
+    """Turns the unvalidated fast path of `BaseModel.build` on or off, returns what it
+    was before"""
+    global TRUSTED
+    previous, TRUSTED = TRUSTED, trusted
+    return previous
+
+
+def set_shared(shared: bool = True) -> bool:
+    """Turns hash-consing in `BaseModel.build` on or off, returns what it was before.
+    While it is on, building a model out of the same values as one that was built
+    before hands back that one, so every copy of a repeated subtree is the same
+    object, and can't be changed. Turning it off forgets every model that was kept, so
+    does reloading the data."""
+    global _SHARED
+    previous = _SHARED is not None
+    _SHARED = {} if shared else None
+    # Validation would hand parents copies of the models that are shared otherwise
+    BaseModel.__config__.copy_on_model_validation = "none" if shared else "shallow"
+    return previous
+
+
+def _shared() -> dict[tuple, Any] | None:
+    """`_SHARED`, emptied first when the data was reloaded since it was filled"""
+    global _SHARED_GENERATION
+    if _SHARED is not None and _SHARED_GENERATION != data.GENERATION:
+        _SHARED.clear()
+        _SHARED_GENERATION = data.GENERATION
+    return _SHARED
+
+
+_PLAIN = {str, int, bool, float}
+
+
+class _Same:
+    """Compares and hashes by identity, and keeps what it wraps alive so its `id`
+    can't be reused"""
+
+    __slots__ = ("v",)
+
+    def __init__(self, v):
+        self.v = v
+
+    def __hash__(self) -> int:
+        return id(self.v)
+
+    def __eq__(self, other) -> bool:
+        return self.v is other.v
+
+
+def _canonical(v):
+    """A hashable stand-in for a keyword value, models are already shared so they are
+    compared by identity. Raises `TypeError` for anything else."""
+    if type(v) in _PLAIN:
+        # `1`, `True` and `1.0` are equal, but don't build the same model
+        return type(v), v
+    if v is None:
+        return v
+    if isinstance(v, BaseM):
+        return _Same(v)
+    if isinstance(v, list):
+        return tuple(map(_canonical, v))
+    if isinstance(v, dict):
+        return "dict", tuple((k, _canonical(i)) for k, i in v.items())
+    raise TypeError(v)
+
+
+def _to_bool(v):
+    if isinstance(v, bool):
+        return v
+    if not isinstance(v, str):
+        raise TypeError(v)
+    v = v.lower()
+    if v in _TRUE:
+        return True
+    if v in _FALSE:
+        return False
+    raise ValueError(v)
+
+
+def _to_int(v):
+    if isinstance(v, bool):
+        raise TypeError(v)
+    return v if isinstance(v, int) else int(v)
+
+
+def _to_str(v):
+    if isinstance(v, str):
+        return v
+    raise TypeError(v)
+
+
+def _unsupported(v):
+    raise TypeError(v)
+
+
+def _constrained_int(t: Type[ConstrainedInt]) -> Callable:
+    def coerce(v):
+        v = _to_int(v)
+        if (
+            t.gt is not None
+            and v <= t.gt
+            or t.ge is not None
+            and v < t.ge
+            or t.lt is not None
+            and v >= t.lt
+            or t.le is not None
+            and v > t.le
+            or t.multiple_of is not None
+            and v % t.multiple_of
+        ):
+            raise ValueError(v)
+        return v
+
+    return coerce
+
+
+def _coercer(t) -> Callable:
+    """What it takes to coerce a value to the type, for the types the XML hands us,
+    anything else raises so it goes through validation"""
+    if isinstance(t, type):
+        if issubclass(t, bool):
+            return _to_bool
+        if issubclass(t, ConstrainedInt):
+            return _constrained_int(t)
+        if issubclass(t, int):
+            return _to_int
+        if issubclass(t, str):
+            return _to_str
+        if issubclass(t, BaseM):
+            return _checked_instance(t)
+    return _unsupported
+
+
+def _checked_list(t) -> Callable:
+    if isinstance(t, type) and issubclass(t, BaseM):
+        # Models are only checked, the list can be kept as it is
+        def check(v):
+            if not isinstance(v, list):
+                raise TypeError(v)
+            for i in v:
+                if not isinstance(i, t):
+                    raise TypeError(i)
+            return v
+
+        return check
+    coerce = _coercer(t)
+
+    def check(v):
+        if not isinstance(v, list):
+            raise TypeError(v)
+        return [coerce(i) for i in v]
+
+    return check
+
+
+def _checked_dict(coerce: Callable) -> Callable:
+    def check(v):
+        if not isinstance(v, dict):
+            raise TypeError(v)
+        return {_to_str(k): coerce(i) for k, i in v.items()}
+
+    return check
+
+
+def _compile_builder(cls: Type["BaseModel"]) -> Callable[[dict], Any]:
+    """Works out once per class how each keyword maps to a field and what it takes to
+    coerce it, the same way pydantic would for the simple types the XML hands us. The
+    returned builder raises if anything isn't covered, so the caller can fall back to
+    real validation for a proper error. Lists and dicts get each of their items
+    checked the same way."""
+    lookup: dict[str, tuple[str, Callable]] = {}
+    # Every field in order with its default, so a copy of this is most of the work
+    template: dict[str, Any] = {}
+    required, factories = [], []
+    for name, field in cls.__fields__.items():
+        if field.shape == SHAPE_SINGLETON:
+            coerce = _coercer(field.type_)
+        elif field.shape == SHAPE_LIST:
+            coerce = _checked_list(field.type_)
+        elif field.shape == SHAPE_DICT:
+            coerce = _checked_dict(_coercer(field.type_))
+        else:
+            coerce = _unsupported
+        lookup[name] = lookup[field.alias] = (name, coerce)
+        if field.required:
+            template[name] = _MISSING
+            required.append(name)
+        elif field.default_factory is not None or not isinstance(
+            field.default, (type(None), bool, int, str)
+        ):
+            template[name] = _MISSING
+            factories.append((name, field))
+        else:
+            template[name] = field.default
+    not_none = {name for name, field in cls.__fields__.items() if not field.allow_none}
+    private = bool(cls.__private_attributes__)
+    new, setattr_ = object.__new__, object.__setattr__
+
+    def build(kw: dict):
+        values = template.copy()
+        fields_set = set()
+        for key, v in kw.items():
+            try:
+                name, coerce = lookup[key]
+            except KeyError:
+                # extra keywords are ignored, same as validation does
+                continue
+            if v is None:
+                if name in not_none:
+                    raise TypeError(name)
+            else:
+                v = coerce(v)
+            values[name] = v
+            fields_set.add(name)
+        for name in required:
+            if values[name] is _MISSING:
+                raise KeyError(name)
+        for name, field in factories:
+            if values[name] is _MISSING:
+                values[name] = field.get_default()
+        m = new(cls)
+        setattr_(m, "__dict__", values)
+        setattr_(m, "__fields_set__", fields_set)
+        if private:
+            m._init_private_attributes()
+        return m
+
+    return build
+
+
+def _checked_instance(t: type):
+    def check(v):
+        if isinstance(v, t):
+            return v
+        raise TypeError(v)
+
+    return check
+
+
 class JustAttribs:
     @classmethod
     def from_elem(cls, e: Element):
-        # noinspection PyArgumentList
-        return cls(**e.attrib)
+        # noinspection PyUnresolvedReferences
+        return cls.build(**e.attrib)
 
 
 class BaseModel(BaseM):
+    # Set on the models `build` shares
+    __slots__ = ("_shared",)
+
     class Config:
         allow_population_by_field_name = True
         alias_generator = special_camel
+        # `set_shared` turns copying off while it is on
+        copy_on_model_validation = "none" if _SHARED is not None else "shallow"
         # extra = Extra.forbid
 
+    def __setattr__(self, name: str, value: Any):
+        # The private attributes are caches, those can still be filled in
+        if getattr(self, "_shared", False) and name not in self.__private_attributes__:
+            raise TypeError(f"{type(self).__name__} is shared, it can't be changed")
+        super().__setattr__(name, value)
+
+    @classmethod
+    def build(cls, **kw):
+        """What every `from_elem` should construct with instead of `cls(**kw)`. Runs
+        the full pydantic validation unless `TRUSTED` is on, then it coerces the
+        simple fields itself and skips validation. See `set_shared` for handing back
+        models that were built before."""
+        shared = _shared()
+        # Anything with a name is one of a kind, it would only fill the table up
+        if shared is not None and "name" not in kw:
+            try:
+                # Keywords come out in the order the XML has them, so the same XML
+                # gives the same key
+                key = cls, tuple([(k, _canonical(v)) for k, v in kw.items()])
+                return shared[key]
+            except KeyError:
+                shared[key] = model = cls._build(kw)
+                object.__setattr__(model, "_shared", True)
+                return model
+            except TypeError:
+                pass
+        return cls._build(kw)
+
+    @classmethod
+    def _build(cls, kw: dict):
+        if not TRUSTED:
+            return cls(**kw)
+        try:
+            builder = _BUILDERS[cls]
+        except KeyError:
+            builder = _BUILDERS[cls] = _compile_builder(cls)
+        try:
+            return builder(kw)
+        except (KeyError, TypeError, ValueError):
+            return cls(**kw)
+
     def __repr_args__(self) -> "ReprArgs":
-        attrs = ((s, getattr(self, s)) for s in self.__slots__)
+        attrs = ((s, getattr(self, s)) for s in self.__slots__ if s[0] != "_")
         return [(a, v) for a, v in attrs if v is not None]
 
 
+_BUILDERS: dict[type, Callable[[dict], BaseModel]] = {}
+
+
 class Tagged(BaseModel):
     @property
     @classmethod
@@ -79,6 +387,15 @@ M = TypeVar("M", bound=ElementModel)
 class Parent(Tagged, ABC, metaclass=TrackDependentsMeta):
     _dependents: ClassVar[set] = set()
     _child_tags: ClassVar[dict] = {}
+    # Besides attached Children, these are compiled into the dispatch table too:
+    # tags whose presence alone sets the field of the same name to True
+    _flag_tags: ClassVar[AbstractSet[str]] = frozenset()
+    # tag -> (attribute, destination) for tags that only carry one int attribute
+    _int_attrib_tags: ClassVar[dict[str, tuple[str, str]]] = {}
+    # tags whose text is a number that goes in the field of the same name
+    _int_text_tags: ClassVar[AbstractSet[str]] = frozenset()
+    # tag -> (model, destination) for tags that are a plain list of `model`
+    _list_tags: ClassVar[dict[str, tuple[Type["Tagged"], str]]] = {}
 
     @classmethod
     def adopt(cls, kls, tag_name: str, destination: str):
@@ -86,11 +403,26 @@ class Parent(Tagged, ABC, metaclass=TrackDependentsMeta):
             raise ValueError(
                 f"{cls.__name__}.{destination} does not exist, please define this field"
             )
+        cls._add_child(kls, tag_name, destination)
+
+    @classmethod
+    def _add_child(cls, kls, tag_name: str, destination: str):
+        if isinstance(cls._dependents, frozenset):
+            raise RuntimeError(
+                f"{cls.__name__} is frozen, attach {kls.__name__} before the models "
+                f"are done importing"
+            )
         cls._dependents.add(tag_name)
-        # TODO: Maybe do a little determination here using cls.__fields__ now to see
-        #  if the destination is a container (list) or an attribute, make destination
-        #  here a callable instead and pass in the class? or is that dumb?
         cls._child_tags[tag_name] = (kls, destination)
+        _DISPATCH.pop(cls, None)
+
+    @classmethod
+    def freeze(cls):
+        """Compiles the dispatch table for this class and every subclass, after which
+        nothing else can be attached to them"""
+        for kls in (cls, *_subclasses(cls)):
+            kls._dependents = frozenset(kls._dependents)
+            _DISPATCH[kls] = kls._compile_dispatch()
 
     @classmethod
     def _from_elem(cls, e: Element, kw: dict = None):
@@ -102,23 +434,51 @@ class Parent(Tagged, ABC, metaclass=TrackDependentsMeta):
             match sub:
                 case _:
                     raise Sad.from_sub_elem(e, sub)
-        # noinspection PyArgumentList
-        return cls(**kw)
+        return cls.build(**kw)
 
     @classmethod
     def _xml_to_model(cls, e: Element, kw: dict[str, Any]) -> Iterator[Element]:
         """This iterates over the sub elements and yields the ones it doesn't handle"""
+        try:
+            table = _DISPATCH[cls]
+        except KeyError:
+            table = _DISPATCH[cls] = cls._compile_dispatch()
         for sub in e:
-            match sub:
-                case Element(tag=tag) if tag in cls._dependents:
-                    (kls, destination) = cls._child_tags[tag]
-                    d = kw.get(destination, False)
-                    if isinstance(d, list):
-                        d.append(kls.from_elem(sub))
-                    else:
-                        kw[destination] = kls.from_elem(sub)
-                case _:
-                    yield sub
+            handler = table.get(sub.tag)
+            if handler is None or handler(kw, sub) is _UNHANDLED:
+                yield sub
+
+    @classmethod
+    def _compile_dispatch(cls) -> dict[str, "Handler"]:
+        """Turns everything this class knows how to handle into tag -> handler, each
+        handler already knowing where its result goes"""
+        table: dict[str, Handler] = {}
+        for tag in cls._flag_tags:
+            table[tag] = _set_flag
+        for tag, (attrib, destination) in cls._int_attrib_tags.items():
+            table[tag] = _int_attrib_handler(attrib, destination)
+        for tag in cls._int_text_tags:
+            table[tag] = _int_text
+        for tag, (kls, destination) in cls._list_tags.items():
+            table[tag] = _list_handler(kls.from_elem, destination)
+        # Attached children win over everything else
+        for tag in cls._dependents:
+            kls, destination = cls._child_tags[tag]
+            field = cls._field_for(destination)
+            if field is not None and field.shape == SHAPE_LIST:
+                table[tag] = _append_handler(kls.from_elem, destination)
+            elif field is not None and field.shape == SHAPE_DICT:
+                table[tag] = _dict_handler(kls.from_elem, destination)
+            else:
+                table[tag] = _assign_handler(kls.from_elem, destination)
+        return table
+
+    @classmethod
+    def _field_for(cls, destination: str):
+        for f in cls.__fields__.values():
+            if destination in (f.name, f.alias):
+                return f
+        return None
 
     @classmethod
     @property
@@ -129,6 +489,77 @@ class Parent(Tagged, ABC, metaclass=TrackDependentsMeta):
         return s
 
 
+# Handlers get the keywords being built and the sub element, returning `_UNHANDLED`
+# hands the element back to the `from_elem` that is iterating
+Handler = Callable[[dict[str, Any], Element], Any]
+_UNHANDLED = object()
+_DISPATCH: dict[type, dict[str, Handler]] = {}
+
+
+def _set_flag(kw: dict[str, Any], sub: Element):
+    kw[sub.tag] = True
+
+
+def _int_text(kw: dict[str, Any], sub: Element):
+    text = sub.text
+    if text and text.isnumeric():
+        kw[sub.tag] = int(text)
+    else:
+        return _UNHANDLED
+
+
+def _int_attrib_handler(attrib: str, destination: str) -> Handler:
+    def handler(kw: dict[str, Any], sub: Element):
+        v = sub.get(attrib)
+        if v is None:
+            return _UNHANDLED
+        kw[destination] = int(v)
+
+    return handler
+
+
+def _list_handler(from_elem: Callable, destination: str) -> Handler:
+    def handler(kw: dict[str, Any], sub: Element):
+        kw[destination] = [from_elem(i) for i in sub]
+
+    return handler
+
+
+def _append_handler(from_elem: Callable, destination: str) -> Handler:
+    def handler(kw: dict[str, Any], sub: Element):
+        d = kw.get(destination)
+        if d is None:
+            kw[destination] = d = []
+        d.append(from_elem(sub))
+
+    return handler
+
+
+def _dict_handler(from_elem: Callable, destination: str) -> Handler:
+    """Keyed by the `name` of the element, or by position for the nameless ones"""
+
+    def handler(kw: dict[str, Any], sub: Element):
+        d = kw.get(destination)
+        if d is None:
+            kw[destination] = d = {}
+        d[sub.get("name") or str(len(d))] = from_elem(sub)
+
+    return handler
+
+
+def _assign_handler(from_elem: Callable, destination: str) -> Handler:
+    def handler(kw: dict[str, Any], sub: Element):
+        kw[destination] = from_elem(sub)
+
+    return handler
+
+
+def _subclasses(cls: type) -> Iterator[type]:
+    for sub in cls.__subclasses__():
+        yield sub
+        yield from _subclasses(sub)
+
+
 class Child(Tagged, ABC):
     @classmethod
     def attach(
@@ -41,10 +41,10 @@ class Choice(Child):
                     kw["choice"] = cls.from_elem(sub)
                 case _:
                     raise Sad.from_elem(sub)
-        return cls(**kw)
+        return cls.build(**kw)
 
-    def render(self):
-        r = self.text.render()
+    def render(self, locale: str = None):
+        r = self.text.render(locale)
         if not isinstance(r, str):
             # This is not just a string, return it as is
             return r
@@ -91,7 +91,7 @@ class AutoReward(Child):
         assert cls.tag_name == e.tag
         kw: dict[str, Any] = e.attrib.copy()
         kw["text"] = e.text
-        return cls(**kw)
+        return cls.build(**kw)
 
 
 class Boarders(JustAttribs, Child):
@@ -108,7 +108,7 @@ class Quest(Child):
 
     @classmethod
     def from_elem(cls, e: Element):
-        return cls(event=e.attrib["event"])
+        return cls.build(event=e.attrib["event"])
 
 
 class Image(JustAttribs, Child):
@@ -176,6 +176,14 @@ class Event(Parent):
     min: int = None
     max: int = None
 
+    _flag_tags = {"distressBeacon", "store", "secretSector", "reveal_map", "repair"}
+    _int_attrib_tags = {
+        "modifyPursuit": ("amount", "modify_pursuit"),
+        "unlockShip": ("id", "unlockShip"),
+    }
+    # item_modify seems to be a dumb list, so just using a dumb list
+    _list_tags = {"item_modify": (EventModifyItem, "item_modify")}
+
     @classmethod
     def from_elem(cls, e: Element):
         kw: dict[str, Any] = e.attrib.copy()
@@ -184,27 +192,10 @@ class Event(Parent):
         kw["statuses"] = []
         for sub in cls._xml_to_model(e, kw):
             match sub:
-                case Element(tag="item_modify"):
-                    # item_modify seems to be a dumb list, so just using a dumb list
-                    kw["item_modify"] = [EventModifyItem.from_elem(i) for i in sub]
-
-                # booleans
-                case Element(tag=t) if t in {
-                    "distressBeacon",
-                    "store",
-                    "secretSector",
-                    "reveal_map",
-                    "repair",
-                }:
-                    kw[t] = True
-                case Element(tag="modifyPursuit", attrib={"amount": a}):
-                    kw["modify_pursuit"] = int(a)
-                case Element(tag="unlockShip", attrib={"id": num}):
-                    kw["unlockShip"] = int(num)
                 case _:
                     raise Sad.from_sub_elem(e, sub)
 
-        return cls(**kw)
+        return cls.build(**kw)
 
     def __rich__(self):
         event_table = Table(self.name, expand=False, min_width=80)
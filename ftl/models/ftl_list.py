@@ -1,18 +1,24 @@
 # Named it goofy so that I don't clobber list on accident
 from abc import ABC
-from random import choice
+from bisect import bisect
+from itertools import accumulate
+from random import choice, random
 from typing import Any, TypeVar
 from xml.etree.ElementTree import Element
 
+from pydantic import PrivateAttr
 from rich.columns import Columns
 
-from .base import ElementModel, Parent
+from .base import Parent, Tagged
 
 M = TypeVar("M")
 
 
 class BaseList(Parent, ABC):
-    contents: dict[str, ElementModel]
+    contents: dict[str, Tagged]
+    # Built on the first `draw`, the cumulative weights only if anything has a weight
+    _sequence: tuple[Tagged, ...] = PrivateAttr(None)
+    _cum_weights: list[float] = PrivateAttr(None)
 
     @classmethod
     def from_elem(cls, e: Element):
@@ -20,9 +26,21 @@ class BaseList(Parent, ABC):
         kw["contents"] = dict()
         return cls._from_elem(e, kw)
 
-    def draw(self) -> ElementModel:
+    def draw(self) -> Tagged:
         """draws a string from its list, returns the fetched instance"""
-        return choice(list(self.contents.values()))
+        sequence = self._sequence
+        if sequence is None:
+            sequence = self._prepare_draws()
+        if self._cum_weights is None:
+            return choice(sequence)
+        return sequence[bisect(self._cum_weights, random() * self._cum_weights[-1])]
+
+    def _prepare_draws(self) -> tuple[Tagged, ...]:
+        self._sequence = sequence = tuple(self.contents.values())
+        weights = [getattr(item, "weight", None) for item in sequence]
+        if any(w is not None for w in weights):
+            self._cum_weights = list(accumulate(1 if w is None else w for w in weights))
+        return sequence
 
     def get(self, key: str, default=None):
         return self.contents.get(key, default)
@@ -30,9 +48,8 @@ class BaseList(Parent, ABC):
     @classmethod
     def adopt(cls, kls, tag_name: str, destination: str):
         """This override is because we don't care where something thinks it is going,
-        it is going to content"""
-        cls._dependents.add(tag_name)
-        cls._child_tags[tag_name] = (kls, "content")
+        it is going to contents"""
+        cls._add_child(kls, tag_name, "contents")
 
     def __rich__(self) -> Columns:
-        return Columns(self.contents)
+        return Columns(self.contents.values())
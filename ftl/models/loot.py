@@ -68,4 +68,4 @@ class RemoveCrew(Remove, Parent):
                     kw[t] = bool(sub.text.strip())
                 case _:
                     raise Sad.from_sub_elem(e, sub)
-        return cls(**kw)
+        return cls.build(**kw)
@@ -18,7 +18,7 @@ class Track(ElementModel):
 
     @classmethod
     def from_elem(cls, e: Element) -> "Track":
-        return cls(__root__=e.text)
+        return cls.build(__root__=e.text)
 
     def get_file(self) -> Path:
         # TODO
@@ -44,7 +44,7 @@ class StartEvent(ElementModel):
     @classmethod
     def from_elem(cls, e: Element):
         assert e.tag == cls.tag_name
-        return cls(name=e.text)
+        return cls.build(name=e.text)
 
 
 class Rarity(JustAttribs, ElementModel):
@@ -87,7 +87,7 @@ class SectorDescription(ElementModel):
                     kw["start_event"] = StartEvent.from_elem(sub)
                 case _:
                     raise Sad.from_elem(sub)
-        return cls(**kw)
+        return cls.build(**kw)
 
 
 class Sector(StringLookup, ElementModel):
@@ -96,7 +96,7 @@ class Sector(StringLookup, ElementModel):
     @classmethod
     def from_elem(cls, e: Element):
         assert e.tag == cls.tag_name
-        return cls(id_=e.text)
+        return cls.build(id_=e.text)
 
     def __str__(self):
         print("#TODO: Need to get the SectorDescription")
@@ -110,7 +110,7 @@ class SectorType(ElementModel):
     @classmethod
     def from_elem(cls, e: Element):
         assert e.tag == cls.tag_name
-        return cls(
+        return cls.build(
             name=e.attrib.get("name"),
             sectors=[Sector.from_elem(sub) for sub in e],
         )
@@ -19,4 +19,4 @@ class Fleet(Child):
 
     @classmethod
     def from_elem(cls, e: Element):
-        return cls(text=e.text)
+        return cls.build(text=e.text)
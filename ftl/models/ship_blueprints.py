@@ -23,7 +23,7 @@ class DroneList(ElementModel):
     def from_elem(cls, e: Element) -> "DroneList":
         kw: dict[str, Any] = e.attrib.copy()
         kw["drones"] = [Drone.from_elem(sub) for sub in e]
-        return cls(**kw)
+        return cls.build(**kw)
 
     def resolve(self):
         """
@@ -48,7 +48,7 @@ class WeaponList(ElementModel):
     def from_elem(cls, e: Element) -> "WeaponList":
         kw: dict[str, Any] = e.attrib.copy()
         kw["weapons"] = [Weapon.from_elem(sub) for sub in e]
-        return cls(**kw)
+        return cls.build(**kw)
 
     def resolve(self):
         """loads any lazy references if they exist"""
@@ -81,7 +81,7 @@ class SystemList(ElementModel):
 
     @classmethod
     def from_elem(cls, e: Element):
-        return cls(systems={s.tag: System.from_elem(s) for s in e})
+        return cls.build(systems={s.tag: System.from_elem(s) for s in e})
 
 
 class CrewCount(JustAttribs, ElementModel):
@@ -102,7 +102,7 @@ class CloakImage(ElementModel):
 
     @classmethod
     def from_elem(cls, e: Element):
-        return cls(text=e.text)
+        return cls.build(text=e.text)
 
 
 class Description(StringLookup, JustAttribs, ElementModel):
@@ -123,7 +123,7 @@ class FloorImage(ElementModel):
 
     @classmethod
     def from_elem(cls, e: Element):
-        return cls(**{"id": e.text})
+        return cls.build(**{"id": e.text})
 
 
 class ShipBlueprint(ElementModel):
@@ -197,4 +197,4 @@ class ShipBlueprint(ElementModel):
                     kw[tag] = t
                 case _:
                     raise Sad.from_sub_elem(e, sub)
-        return cls(**kw)
+        return cls.build(**kw)
@@ -0,0 +1,156 @@
+"""
+Read-only stand-ins for the models that take a fraction of the memory.
+
+A pydantic model keeps its values in an instance `__dict__` and remembers which
+fields were set. `slim` copies a built model into an instance of a class generated
+from the model's fields that has `__slots__` instead, so each one is an object header
+and a pointer per field. The generated class gets the model's own methods, class
+methods, still bound to the model, and class attributes, and is registered as a
+virtual subclass of the model, so `render`, `draw`, `py_tag_name`, `isinstance` and
+the rest work the same. Lists become tuples. Private attributes, the caches, can
+still be set, nothing else can. While `base.set_shared` is on, each shared model gets
+one shared copy.
+"""
+
+from typing import Any, Type
+
+from pydantic import BaseModel as BaseM
+
+from . import base
+from .base import BaseModel
+
+_SLIM_CLASSES: dict[type, type] = {}
+
+
+class Slim:
+    __slots__ = ()
+    # What the class was generated from
+    _model: type = None
+    _fields: tuple[str, ...] = ()
+    _private: tuple[str, ...] = ()
+
+    def __setattr__(self, name: str, value: Any):
+        if name not in self._private:
+            raise AttributeError(f"{type(self).__name__} is read-only")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self._fields)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        args = ", ".join(
+            f"{f}={v!r}" for f in self._fields if (v := getattr(self, f)) is not None
+        )
+        return f"{type(self).__name__}({args})"
+
+    def dict(self) -> dict[str, Any]:
+        """The fields, with everything inside turned into dicts too like pydantic's
+        `dict`"""
+        return {f: _to_dict(getattr(self, f)) for f in self._fields}
+
+
+def _to_dict(v):
+    if isinstance(v, Slim):
+        return v.dict()
+    if isinstance(v, tuple):
+        return [_to_dict(i) for i in v]
+    if isinstance(v, dict):
+        return {k: _to_dict(i) for k, i in v.items()}
+    return v
+
+
+def _copied_attributes(model: Type[BaseModel]) -> dict[str, Any]:
+    """Methods and class attributes of our own that the model has, the most derived
+    winning, leaving out pydantic's machinery. Class methods, and the class
+    properties like `tag_name`, are the model's, bound to it."""
+    skip = set(model.__fields__) | set(model.__private_attributes__)
+    out = {}
+    for klass in reversed(model.__mro__):
+        if not klass.__module__.startswith("ftl.models") or klass is BaseModel:
+            continue
+        for name, value in vars(klass).items():
+            if (
+                name in skip
+                or (name.startswith("__") and name not in ("__rich__", "__str__"))
+                or isinstance(value, type)
+            ):
+                continue
+            if isinstance(value, classmethod) or (
+                isinstance(value, property) and isinstance(value.fget, classmethod)
+            ):
+                try:
+                    value = getattr(model, name)
+                except NotImplementedError:
+                    # Abstract, the model doesn't have one
+                    continue
+            out[name] = value
+    return out
+
+
+def slim_class(model: Type[BaseModel]) -> type:
+    """The slotted class for the model, generated the first time it is asked for"""
+    try:
+        return _SLIM_CLASSES[model]
+    except KeyError:
+        pass
+    fields = tuple(model.__fields__)
+    private = tuple(model.__private_attributes__)
+    namespace = _copied_attributes(model)
+    namespace.update(
+        __slots__=fields + private,
+        __module__=__name__,
+        __qualname__=f"Slim{model.__name__}",
+        _model=model,
+        # pydantic's `isinstance` only asks the ABC registry when this is there
+        __post_root_validators__=model.__post_root_validators__,
+        _fields=fields,
+        _private=private,
+    )
+    cls = _SLIM_CLASSES[model] = type(f"Slim{model.__name__}", (Slim,), namespace)
+    # pydantic models are ABCs underneath
+    model.register(cls)
+    return cls
+
+
+def _slim_value(v):
+    if isinstance(v, BaseM):
+        return slim(v)
+    if isinstance(v, (list, tuple)):
+        return tuple(_slim_value(i) for i in v)
+    if isinstance(v, dict):
+        return {k: _slim_value(i) for k, i in v.items()}
+    return v
+
+
+def slim(model: BaseModel) -> Slim:
+    """A read-only slotted copy of the model and everything in it"""
+    if isinstance(model, Slim):
+        return model
+    shared = base._shared()
+    if shared is None:
+        return _slim(model)
+    # A model that is shared gets one copy that is shared just the same
+    key = "slim", base._Same(model)
+    try:
+        return shared[key]
+    except KeyError:
+        out = shared[key] = _slim(model)
+        return out
+
+
+def _slim(model: BaseModel) -> Slim:
+    cls = slim_class(type(model))
+    out = object.__new__(cls)
+    values = model.__dict__
+    for name in cls._fields:
+        object.__setattr__(out, name, _slim_value(values[name]))
+    for name, attr in model.__private_attributes__.items():
+        object.__setattr__(out, name, attr.get_default())
+    return out
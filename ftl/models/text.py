@@ -1,12 +1,14 @@
 from abc import ABC
+from sys import intern
 from typing import ClassVar
 from xml.etree.ElementTree import Element
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 from rich.console import RenderableType
 
 from .ftl_list import BaseList
-from ..data import STRING_DATA
+from .. import data
+from ..data import get_string
 from .base import Child, Tagged
 
 
@@ -17,8 +19,18 @@ class StringLookup(Tagged, ABC):
         None, description="This indicates a text list to load a text from"
     )
 
-    def _lookup(self) -> str:
-        return STRING_DATA.get(self.id_, None)
+    @classmethod
+    def build(cls, **kw):
+        # The same few names are pointed at over and over, interned they are stored once
+        # and compare by identity
+        for key in ("id", "id_", "name", "load"):
+            v = kw.get(key)
+            if type(v) is str:
+                kw[key] = intern(v)
+        return super().build(**kw)
+
+    def _lookup(self, locale: str = None) -> str:
+        return get_string(self.id_, locale=locale)
 
 
 class Text(Child, StringLookup):
@@ -32,15 +44,39 @@ class Text(Child, StringLookup):
         kw = e.attrib.copy()
         if e.text and e.text.strip():
             kw["text"] = e.text.strip()
-        return cls(**kw)
+        return cls.build(**kw)
+
+    # What `get_ref` and `render` came up with, until the data is reloaded
+    _resolved: dict = PrivateAttr(default_factory=dict)
+    _generation: int = PrivateAttr(-1)
+
+    def _cache(self) -> dict:
+        if self._generation != data.GENERATION:
+            self._generation = data.GENERATION
+            self._resolved = {}
+        return self._resolved
 
     def get_ref(self) -> "TextList":
+        cache = self._cache()
+        try:
+            return cache["ref"]
+        except KeyError:
+            pass
         from ftl import FTL
 
-        return FTL.text_lists.get(self.load)
+        ref = cache["ref"] = FTL.text_lists.get(self.load)
+        return ref
 
-    def render(self) -> RenderableType:
-        return self.text or self._lookup() or self.get_ref()
+    def render(self, locale: str = None) -> RenderableType:
+        if self.text:
+            return self.text
+        cache = self._cache()
+        try:
+            return cache["render", locale]
+        except KeyError:
+            pass
+        rendered = cache["render", locale] = self._lookup(locale) or self.get_ref()
+        return rendered
 
     def __rich__(self) -> RenderableType:
         return self.render()
@@ -50,7 +50,7 @@ class SoundList(BaseList, Child):
 @SoundList.attach(tag_name="hitShieldSounds", destination="hitShieldSounds")
 @SoundList.attach(tag_name="missSounds", destination="missSounds")
 class WeaponBlueprint(Parent):
-    _number_text_fields = {
+    _int_text_tags = {
         "bp",
         "breachChance",
         "chargeLevels",
@@ -143,11 +143,7 @@ class WeaponBlueprint(Parent):
 
         for sub in cls._xml_to_model(e, kw):
             match sub:
-                case Element(
-                    tag=tag
-                ) if tag in cls._number_text_fields and sub.text and sub.text.isnumeric():
-                    kw[tag] = int(sub.text)
                 case _:
                     pass
                     # raise Sad.from_sub_elem(e, sub)
-        return cls(**kw)
+        return cls.build(**kw)
@@ -0,0 +1,341 @@
+"""
+Search over everything that is loaded.
+
+Every named top level element and every named string is a document, keyed by
+(tag, name) like the reload keys. A document's tokens are the words of its name, its
+text, the strings its `<text id=...>` refer to, its attribute values and the tags
+inside it. Whole numbers found in it are kept per field, `ion` for `<ion>1</ion>` and
+`damage.amount` for `<damage amount="3"/>`, sorted for range filters.
+
+    search("slug")                        # every document with a word starting with slug
+    search("pirate fi", tag="event")      # type-ahead, the last word is a prefix
+    search("", tag="weaponBlueprint", ion=(1, None))
+"""
+
+import gc
+import marshal
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Iterable, Iterator
+from xml.etree.ElementTree import Element
+
+from . import data
+
+Key = tuple[str, str]
+INDEX_VERSION = 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_INT_RE = re.compile(r"-?\d+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+class SearchIndex:
+    def __init__(self):
+        # Document ids are positions in `_docs`, removed ones are `None`
+        self._docs: list[Key | None] = []
+        self._ids: dict[Key, int] = {}
+        self._postings: dict[str, set[int]] = {}
+        # field -> (value, document id), sorted unless the field is in `_unsorted`
+        self._numbers: dict[str, list[tuple[int, int]]] = {}
+        self._unsorted: set[str] = set()
+        # What each document put in, so it can be taken out again: its tokens, its
+        # numbers and the strings it used. `None` after a `load` until it is needed.
+        self._doc_terms: dict[int, tuple[list, list, list]] | None = {}
+        # string name -> documents that have that string's words
+        self._string_refs: dict[str, set[int]] = {}
+        # Every token, sorted, for prefix lookups. `None` until it is needed again.
+        self._sorted: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, key: Key, e: Element = None, text: str = None):
+        """Indexes an element or a string's text under the key, replacing whatever
+        was there for it before"""
+        self.remove(key)
+        tokens = {*tokenize(key[1]), key[1].lower(), key[0].lower()}
+        numbers, strings = set(), set()
+        if text is not None:
+            tokens.update(tokenize(text))
+        if e is not None:
+            numbers.update(_numbers(e))
+            for sub in e.iter():
+                tokens.add(sub.tag.lower())
+                if sub.text:
+                    tokens.update(tokenize(sub.text))
+                for attr, value in sub.items():
+                    tokens.update(tokenize(value))
+                    if sub.tag == "text" and attr == "id":
+                        strings.add(value)
+                        tokens.update(tokenize(data.get_string(value) or ""))
+        self._insert(key, list(tokens), list(numbers), list(strings))
+
+    def _insert(self, key, tokens, numbers, strings):
+        i = self._ids[key] = len(self._docs)
+        self._docs.append(key)
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(i)
+        for field, value in numbers:
+            self._numbers.setdefault(field, []).append((value, i))
+            self._unsorted.add(field)
+        for name in strings:
+            self._string_refs.setdefault(name, set()).add(i)
+        if self._doc_terms is not None:
+            self._doc_terms[i] = tokens, numbers, strings
+        self._sorted = None
+
+    def remove(self, key: Key):
+        if key not in self._ids:
+            return
+        if self._doc_terms is None:
+            self._doc_terms = self._invert()
+        i = self._ids.pop(key)
+        self._docs[i] = None
+        tokens, numbers, strings = self._doc_terms.pop(i)
+        for token in tokens:
+            docs = self._postings[token]
+            docs.discard(i)
+            if not docs:
+                del self._postings[token]
+                self._sorted = None
+        for field, value in numbers:
+            values = self._sorted_numbers(field)
+            del values[bisect_left(values, (value, i))]
+        for name in strings:
+            self._string_refs[name].discard(i)
+
+    def _invert(self) -> dict[int, tuple[list, list, list]]:
+        """Works out what every document put in from the postings"""
+        terms = {i: ([], [], []) for i in self._ids.values()}
+        for token, docs in self._postings.items():
+            for i in docs:
+                terms[i][0].append(token)
+        for field, values in self._numbers.items():
+            for value, i in values:
+                terms[i][1].append((field, value))
+        for name, docs in self._string_refs.items():
+            for i in docs:
+                terms[i][2].append(name)
+        return terms
+
+    def tokens(self) -> list[str]:
+        """Every token, sorted"""
+        if self._sorted is None:
+            self._sorted = sorted(self._postings)
+        return self._sorted
+
+    def _matching(self, word: str, prefix: bool) -> set[int]:
+        if not prefix:
+            return self._postings.get(word, set())
+        tokens = self.tokens()
+        out = set()
+        for pos in range(bisect_left(tokens, word), len(tokens)):
+            if not tokens[pos].startswith(word):
+                break
+            out |= self._postings[tokens[pos]]
+        return out
+
+    def _sorted_numbers(self, field: str) -> list[tuple[int, int]]:
+        values = self._numbers.get(field, [])
+        if field in self._unsorted:
+            values.sort()
+            self._unsorted.discard(field)
+        return values
+
+    def _sorted_numbers_all(self):
+        for field in list(self._unsorted):
+            self._sorted_numbers(field)
+
+    def _in_range(self, field: str, low: int | None, high: int | None) -> set[int]:
+        values = self._sorted_numbers(field)
+        start = 0 if low is None else bisect_left(values, (low, -1))
+        end = (
+            len(values)
+            if high is None
+            else bisect_right(values, (high, len(self._docs)))
+        )
+        return {i for _, i in values[start:end]}
+
+    def search(
+        self,
+        query: str = "",
+        tag: str = None,
+        limit: int = None,
+        **ranges: tuple[int | None, int | None],
+    ) -> list[Key]:
+        """Documents with every word of the query, the last one only has to be the
+        start of a word, that fall in every (low, high) range given by field. Ones
+        whose name starts with the first word come first."""
+        words = tokenize(query)
+        found: set[int] | None = None
+        for n, word in enumerate(words):
+            matches = self._matching(word, prefix=n == len(words) - 1)
+            found = matches if found is None else found & matches
+        for field, (low, high) in ranges.items():
+            matches = self._in_range(field.replace("__", "."), low, high)
+            found = matches if found is None else found & matches
+        if found is None:
+            found = set(self._ids.values())
+        keys = [self._docs[i] for i in found]
+        if tag is not None:
+            keys = [key for key in keys if key[0] == tag]
+        first = words[0] if words else ""
+        keys.sort(key=lambda k: (not k[1].lower().startswith(first), k))
+        return keys[:limit]
+
+    def fields(self) -> list[str]:
+        """Every numeric field that can be filtered on"""
+        return sorted(self._numbers)
+
+    def update(self, keys: Iterable[Key]):
+        """Indexes the reloaded keys again, and everything that uses a reloaded string"""
+        keys = set(keys)
+        for tag, name in list(keys):
+            if tag == "text":
+                keys |= {self._docs[i] for i in self._string_refs.get(name, ())}
+        for key in sorted(keys):
+            _index_key(self, key)
+
+    def save(self, path: Path, signature: str):
+        """Writes the index out for `load`. It is stored as it is in memory, so loading
+        doesn't index anything again. `marshal` because it does sets and dicts at C
+        speed, and can't run code when it's read like pickle can."""
+        self._sorted_numbers_all()
+        state = (
+            INDEX_VERSION,
+            sys.version_info[:2],
+            signature,
+            self._docs,
+            self._postings,
+            self._numbers,
+            self._string_refs,
+        )
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(marshal.dumps(state))
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, signature: str) -> "SearchIndex | None":
+        """The index `save`d to the path, if it was saved for the same data"""
+        collecting = gc.isenabled()
+        # Nothing in there can be garbage, and the collector would keep walking it
+        gc.disable()
+        try:
+            version, python, saved_for, *tables = marshal.loads(path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        finally:
+            if collecting:
+                gc.enable()
+        if (version, python, saved_for) != (
+            INDEX_VERSION,
+            sys.version_info[:2],
+            signature,
+        ):
+            return None
+        index = cls()
+        index._docs, index._postings, index._numbers, index._string_refs = tables
+        index._ids = {key: i for i, key in enumerate(index._docs) if key is not None}
+        index._doc_terms = None
+        return index
+
+
+def _numbers(e: Element) -> Iterator[tuple[str, int]]:
+    for sub in e.iter():
+        if sub is not e and len(sub) == 0 and sub.text and _INT_RE.fullmatch(sub.text):
+            yield sub.tag, int(sub.text)
+        for attr, value in sub.items():
+            if _INT_RE.fullmatch(value):
+                yield f"{sub.tag}.{attr}", int(value)
+
+
+def _index_key(index: SearchIndex, key: Key):
+    tag, name = key
+    if tag == "text":
+        if name in data.STRING_DATA:
+            index.add(key, text=data.STRING_DATA[name])
+        else:
+            index.remove(key)
+        return
+    elements = data.named_elements(tag).get(name)
+    if elements:
+        index.add(key, elements[-1])
+    else:
+        index.remove(key)
+
+
+def build() -> SearchIndex:
+    """A fresh index of everything that is loaded"""
+    data.ensure_loaded()
+    index = SearchIndex()
+    for tag in sorted(data.NAME_INDEX):
+        for name, elements in data.NAME_INDEX[tag].items():
+            index.add((tag, name), elements[-1])
+    for name in data.STRING_DATA:
+        index.add(("text", name), text=data.STRING_DATA[name])
+    return index
+
+
+_INDEX: SearchIndex | None = None
+# `data.GENERATION` the index is up to date with
+_GENERATION = -1
+
+
+def _cache_file() -> tuple[Path, str] | None:
+    if data.CACHE_DIR is None:
+        return None
+    snapshot = data._SNAPSHOT
+    if snapshot is not None and snapshot.files:
+        # Keyed on the data files it was made from, the same as when those are loaded
+        source = next(iter(snapshot.files)).parent
+        signature = snapshot.signature
+    else:
+        source = data.DATA_DIR
+        files = sorted(data._FILE_STATS)
+        signature = data._files_signature(files, [data._FILE_STATS[f] for f in files])
+    cache_fp = data._cache_path(source, data.CACHE_DIR).with_suffix(".search")
+    return cache_fp, signature
+
+
+def index() -> SearchIndex:
+    """The index of everything that is loaded, read from the cache if it was saved for
+    the same files. Every `reload` updates it in place, it's only built again when
+    everything has been forgotten."""
+    global _INDEX, _GENERATION
+    data.ensure_loaded()
+    if _GENERATION != data.GENERATION:
+        with data._LOCK:
+            if _GENERATION != data.GENERATION:
+                cached = _cache_file()
+                new = cached and SearchIndex.load(*cached)
+                if not new:
+                    new = build()
+                    if cached:
+                        try:
+                            cached[0].parent.mkdir(parents=True, exist_ok=True)
+                            new.save(*cached)
+                        except OSError as err:
+                            data.LOG.debug(f"Could not write the search index: {err}")
+                # Sorted now, rather than on the first prefix search
+                new.tokens()
+                _INDEX, _GENERATION = new, data.GENERATION
+    return _INDEX
+
+
+@data.on_reload
+def _update(keys: set[Key]):
+    global _GENERATION
+    # Only an index that was current before this reload can be patched up
+    if _INDEX is not None and _GENERATION == data.GENERATION - 1:
+        _INDEX.update(keys)
+        _GENERATION = data.GENERATION
+
+
+def search(query: str = "", tag: str = None, limit: int = None, **ranges):
+    """`SearchIndex.search` on the index of everything that is loaded"""
+    return index().search(query, tag, limit, **ranges)
@@ -0,0 +1,264 @@
+"""
+Sector maps built the way a sector's rules say, and statistics over many of them.
+
+A map is a grid of cells, `COLUMNS` by `ROWS`, most of which get a beacon somewhere
+inside them. Beacons in neighbouring cells are linked. The player starts at a beacon in
+the first column and leaves from the one furthest right that can be reached. The start
+beacon gets the sector's `startEvent`. Each `<event name=... min=... max=...>` gets
+between min and max of the other beacons, in the order they are listed, and whatever
+is left gets `filler`. Event lists are drawn from until they come to a named event or
+an anonymous one. The `rarityList` is about which blueprints drop, not beacons, so it
+plays no part here.
+
+Everything comes from one `random.Random` seeded with an int, so a seed gives the same
+map on every machine and every Python that has the same data.
+"""
+
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from xml.etree.ElementTree import Element
+
+from . import data
+from .models import FTL
+from .models.sector import SectorDescription
+
+COLUMNS = 6
+ROWS = 4
+# Chance that a cell has no beacon
+EMPTY_CELL = 0.15
+# How deep event lists that load other lists are followed
+MAX_DEPTH = 16
+LOADABLE_TAGS = ("event", "eventList")
+
+
+@dataclass(frozen=True)
+class Beacon:
+    x: float
+    y: float
+    # What the sector put here, an event or event list name
+    placed: str | None
+    # The named event that turned out to be, the list's name for an anonymous one
+    event: str | None
+    store: bool = False
+    distress: bool = False
+    fight: bool = False
+
+
+@dataclass(frozen=True)
+class SectorMap:
+    sector: str
+    seed: int
+    beacons: tuple[Beacon, ...]
+    # Pairs of beacon numbers, the lower first
+    links: tuple[tuple[int, int], ...]
+    start: int
+    exit: int
+
+    def neighbours(self, i: int) -> list[int]:
+        return [b if a == i else a for a, b in self.links if i in (a, b)]
+
+
+def _loadable(name: str) -> Element | None:
+    for tag in LOADABLE_TAGS:
+        elements = data.named_elements(tag).get(name)
+        if elements:
+            return elements[-1]
+    return None
+
+
+def _draw(rng: random.Random, name: str) -> tuple[str, Element | None]:
+    """The event a name ends up as, and its element"""
+    e = _loadable(name)
+    for _ in range(MAX_DEPTH):
+        if e is None or e.tag == "event":
+            break
+        entries = e.findall("event")
+        if not entries:
+            break
+        entry = rng.choice(entries)
+        load = entry.get("load")
+        if not load:
+            return name, entry
+        name, e = load, _loadable(load)
+    return name, e
+
+
+def _beacon(rng: random.Random, x: float, y: float, placed: str | None) -> Beacon:
+    if placed is None:
+        return Beacon(x, y, None, None)
+    event, e = _draw(rng, placed)
+    if e is None:
+        return Beacon(x, y, placed, event)
+    return Beacon(
+        x,
+        y,
+        placed,
+        event,
+        store=e.find("store") is not None,
+        distress=e.find("distressBeacon") is not None,
+        fight=any(s.get("hostile") == "true" for s in e.iterfind("ship")),
+    )
+
+
+def generate(
+    sector: str | SectorDescription, seed: int = 0, filler: str | None = "NEUTRAL"
+) -> SectorMap:
+    """A map for the sector description, the same one every time for the seed"""
+    if isinstance(sector, str):
+        sector = FTL.sector_descriptions[sector]
+    rng = random.Random(seed)
+    cells = [
+        (column, row)
+        for column in range(COLUMNS)
+        for row in range(ROWS)
+        if column == 0 or rng.random() >= EMPTY_CELL
+    ]
+    positions = [
+        (c + rng.uniform(0.15, 0.85), r + rng.uniform(0.15, 0.85)) for c, r in cells
+    ]
+    number = {cell: i for i, cell in enumerate(cells)}
+    links = []
+    for i, (column, row) in enumerate(cells):
+        for dc, dr in ((1, 0), (0, 1), (1, 1), (1, -1)):
+            j = number.get((column + dc, row + dr))
+            # Diagonals only some of the time, so not every map is a lattice
+            if j is not None and (dc == 0 or dr == 0 or rng.random() < 0.4):
+                links.append((i, j))
+    start = rng.choice([i for i, (column, _) in enumerate(cells) if column == 0])
+    neighbours = [[] for _ in cells]
+    for i, j in links:
+        neighbours[i].append(j)
+        neighbours[j].append(i)
+    reachable = {start}
+    frontier = [start]
+    while frontier:
+        for j in neighbours[frontier.pop()]:
+            if j not in reachable:
+                reachable.add(j)
+                frontier.append(j)
+    exit_ = max(sorted(reachable), key=lambda i: positions[i][0])
+    placed: list[str | None] = [filler] * len(cells)
+    if sector.start_event is not None:
+        placed[start] = sector.start_event.name
+    free = [i for i in range(len(cells)) if i not in (start, exit_)]
+    rng.shuffle(free)
+    for sector_event in sector.event_list:
+        for _ in range(
+            rng.randint(sector_event.min, max(sector_event.min, sector_event.max))
+        ):
+            if not free:
+                break
+            placed[free.pop()] = sector_event.name
+    beacons = tuple(_beacon(rng, x, y, name) for (x, y), name in zip(positions, placed))
+    return SectorMap(sector.name, seed, beacons, tuple(links), start, exit_)
+
+
+def pick_sector(sector_type: str, number: int, rng: random.Random) -> str:
+    """One of the type's sector descriptions that can turn up as sector `number`,
+    counting from 0"""
+    names = [
+        s.id_
+        for s in FTL.sector_types[sector_type].sectors
+        if s.id_ in FTL.sector_descriptions
+        and FTL.sector_descriptions[s.id_].min_sector <= number
+    ]
+    if not names:
+        raise KeyError(f"No {sector_type} sector can be sector {number}")
+    return rng.choice(names)
+
+
+@dataclass
+class SectorStats:
+    sectors: int = 0
+    beacons: int = 0
+    # Named event -> how many beacons it was on
+    events: Counter = field(default_factory=Counter)
+    # Per sector count -> how many sectors had that many
+    stores: Counter = field(default_factory=Counter)
+    distress: Counter = field(default_factory=Counter)
+    fights: Counter = field(default_factory=Counter)
+
+    def add(self, sector_map: SectorMap):
+        beacons = sector_map.beacons
+        self.sectors += 1
+        self.beacons += len(beacons)
+        self.events.update(b.event for b in beacons if b.event is not None)
+        self.stores[sum(b.store for b in beacons)] += 1
+        self.distress[sum(b.distress for b in beacons)] += 1
+        self.fights[sum(b.fight for b in beacons)] += 1
+
+    def merge(self, other: "SectorStats"):
+        self.sectors += other.sectors
+        self.beacons += other.beacons
+        self.events.update(other.events)
+        self.stores.update(other.stores)
+        self.distress.update(other.distress)
+        self.fights.update(other.fights)
+
+    def frequency(self) -> dict[str, float]:
+        """How many beacons each event is on in an average sector"""
+        return {name: n / self.sectors for name, n in self.events.most_common()}
+
+    @staticmethod
+    def _mean(counts: Counter) -> float:
+        total = sum(counts.values())
+        return sum(k * n for k, n in counts.items()) / total if total else 0.0
+
+    def mean_stores(self) -> float:
+        return self._mean(self.stores)
+
+    def mean_distress(self) -> float:
+        return self._mean(self.distress)
+
+    def mean_fights(self) -> float:
+        return self._mean(self.fights)
+
+
+def _generate_chunk(
+    sector: str, seeds: range, filler: str | None, data_dir, cache_dir
+) -> SectorStats:
+    # A forked worker already has everything loaded, a spawned one starts from nothing
+    if data.DATA_DIR != data_dir:
+        data.use_data_dir(data_dir, cache_dir)
+    stats = SectorStats()
+    description = FTL.sector_descriptions[sector]
+    for seed in seeds:
+        stats.add(generate(description, seed, filler))
+    return stats
+
+
+def simulate(
+    sector: str,
+    runs: int = 1_000,
+    seed: int = 0,
+    filler: str | None = "NEUTRAL",
+    workers: int = None,
+) -> SectorStats:
+    """Statistics over `runs` maps of the sector. Map `i` gets seed `seed + i`, so any
+    of them can be generated again on its own, and the result is the same however
+    many worker processes share the work."""
+    data.ensure_loaded()
+    workers = data.LOAD_WORKERS if workers is None else workers
+    if workers > 1 and runs > 1:
+        stats = SectorStats()
+        step = -(-runs // (workers * 4))
+        chunks = [
+            range(s, min(s + step, seed + runs)) for s in range(seed, seed + runs, step)
+        ]
+        with ProcessPoolExecutor(min(workers, len(chunks))) as pool:
+            for chunk_stats in pool.map(
+                _generate_chunk,
+                repeat(sector),
+                chunks,
+                repeat(filler),
+                repeat(data.DATA_DIR),
+                repeat(data.CACHE_DIR),
+            ):
+                stats.merge(chunk_stats)
+        return stats
+    return _generate_chunk(
+        sector, range(seed, seed + runs), filler, data.DATA_DIR, data.CACHE_DIR
+    )
@@ -0,0 +1,282 @@
+"""
+Monte Carlo over events: what tends to happen when you jump to a beacon.
+
+The named events and event lists are compiled once into flat NumPy arrays. Every node
+has a low and high value for each outcome in `FIELDS`, drawn uniformly between the two,
+and a list of next nodes of which one is picked uniformly: the choices of an event,
+the entries of an event list, or the target of a `load=`. Sampling then walks every run
+at once, one step of the tree per iteration, so a million runs cost about as much
+Python as one.
+
+The player picks uniformly among the choices they can take, choices with a `req`
+are only taken when `include_requirements` is on.
+
+Needs NumPy.
+"""
+
+from typing import Iterable
+from xml.etree.ElementTree import Element
+
+import numpy as np
+
+from . import data
+
+FIELDS = (
+    "fight",
+    "hull_damage",
+    "crew_gained",
+    "crew_lost",
+    "boarders",
+    "reward",
+    "weapon",
+    "augment",
+    "drone",
+    "fuel",
+    "missiles",
+    "drone_parts",
+    "scrap",
+    "store",
+)
+_FIELD = {field: i for i, field in enumerate(FIELDS)}
+# `<item_modify><item type=...>` -> field
+_ITEM_FIELDS = {
+    "fuel": "fuel",
+    "missiles": "missiles",
+    "drones": "drone_parts",
+    "scrap": "scrap",
+}
+_LOADABLE_TAGS = ("event", "eventList")
+
+
+def _number(value: str | None, default: int) -> int | None:
+    """The attribute as an int, `default` if it is missing, `None` if it isn't a
+    number"""
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _range(e: Element) -> tuple[int, int] | None:
+    """The `min` and `max` of an element, lowest first. A missing `min` is 0 and a
+    missing `max` is the `min`, `None` if either isn't a number."""
+    low = _number(e.get("min"), 0)
+    high = None if low is None else _number(e.get("max"), low)
+    if high is None:
+        return None
+    return min(low, high), max(low, high)
+
+
+class Outcomes:
+    """The outcomes of a batch of runs, one row per run and one column per field"""
+
+    def __init__(self, samples: np.ndarray):
+        self.samples = samples
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def mean(self) -> dict[str, float]:
+        return dict(zip(FIELDS, self.samples.mean(axis=0).tolist()))
+
+    def probability(self, field: str, at_least: int = 1) -> float:
+        """How many runs ended up with at least that much of the field"""
+        return float(np.mean(self.samples[:, _FIELD[field]] >= at_least))
+
+    def histogram(self, field: str) -> np.ndarray:
+        """How many runs ended up with each value of the field, starting from the
+        lowest one seen"""
+        column = self.samples[:, _FIELD[field]]
+        return np.bincount(column - column.min())
+
+
+class _Compiler:
+    def __init__(self, include_requirements: bool):
+        self.include_requirements = include_requirements
+        self.low: list[list[int]] = []
+        self.high: list[list[int]] = []
+        self.children: list[list[int | str]] = []
+
+    def node(self) -> int:
+        self.low.append([0] * len(FIELDS))
+        self.high.append([0] * len(FIELDS))
+        self.children.append([])
+        return len(self.low) - 1
+
+    def add(self, i: int, field: str, low: int, high: int = None):
+        self.low[i][_FIELD[field]] += low
+        self.high[i][_FIELD[field]] += low if high is None else high
+
+    def event(self, e: Element, i: int = None) -> int:
+        i = self.node() if i is None else i
+        load = e.get("load")
+        if load:
+            # Names are swapped for node numbers once everything has one
+            self.children[i].append(load)
+            return i
+        for sub in e:
+            tag = sub.tag
+            if tag == "ship" and sub.get("hostile") == "true":
+                self.add(i, "fight", 1)
+            elif tag == "damage":
+                amount = _number(sub.get("amount"), 0)
+                if amount is not None:
+                    self.add(i, "hull_damage", amount)
+            elif tag == "crewMember":
+                amount = _number(sub.get("amount"), 1)
+                if amount is not None:
+                    self.add(i, "crew_gained", amount)
+            elif tag == "removeCrew":
+                self.add(i, "crew_lost", 1)
+            elif tag == "boarders":
+                found = _range(sub)
+                if found:
+                    self.add(i, "boarders", *found)
+            elif tag == "autoReward":
+                self.add(i, "reward", 1)
+            elif tag in ("weapon", "augment", "drone"):
+                self.add(i, tag, 1)
+            elif tag == "store":
+                self.add(i, "store", 1)
+            elif tag == "item_modify":
+                for item in sub:
+                    field = _ITEM_FIELDS.get(item.get("type"))
+                    found = _range(item)
+                    if field and found:
+                        self.add(i, field, *found)
+            elif tag == "choice":
+                if sub.get("req") and not self.include_requirements:
+                    continue
+                nested = sub.find("event")
+                if nested is not None:
+                    self.children[i].append(self.event(nested))
+        return i
+
+    def event_list(self, e: Element, i: int) -> int:
+        for sub in e:
+            if sub.tag == "event":
+                self.children[i].append(self.event(sub))
+        return i
+
+
+class Simulator:
+    def __init__(self, include_requirements: bool = False, seed: int = None):
+        self.rng = np.random.default_rng(seed)
+        data.ensure_loaded()
+        compiler = _Compiler(include_requirements)
+        # Every named thing gets its node number first, so loads can point at them
+        self.roots: dict[tuple[str, str], int] = {}
+        for tag in _LOADABLE_TAGS:
+            for name in data.named_elements(tag):
+                self.roots[tag, name] = compiler.node()
+        for (tag, name), i in self.roots.items():
+            e = data.named_elements(tag)[name][-1]
+            if tag == "event":
+                compiler.event(e, i)
+            else:
+                compiler.event_list(e, i)
+        offsets, targets = [0], []
+        for children in compiler.children:
+            for child in children:
+                if isinstance(child, str):
+                    child = self._resolve(child)
+                    if child is None:
+                        continue
+                targets.append(child)
+            offsets.append(len(targets))
+        self.low = np.array(compiler.low, dtype=np.int32).reshape(-1, len(FIELDS))
+        self.high = np.array(compiler.high, dtype=np.int32).reshape(-1, len(FIELDS))
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.targets = np.array(targets or [0], dtype=np.int64)
+        # Most nodes are lists and loads that change nothing, and only a few fields
+        # ever have a range to draw from
+        self._has_effect = (self.low != 0).any(axis=1) | (self.high != 0).any(axis=1)
+        self._ranged = np.flatnonzero((self.high != self.low).any(axis=0))
+
+    def _resolve(self, name: str) -> int | None:
+        for tag in _LOADABLE_TAGS:
+            i = self.roots.get((tag, name))
+            if i is not None:
+                return i
+        return None
+
+    def node(self, name: str) -> int:
+        i = self._resolve(name)
+        if i is None:
+            raise KeyError(name)
+        return i
+
+    def sample(self, starts: np.ndarray, max_steps: int = 64) -> np.ndarray:
+        """Runs one walk from each of the start nodes, returns their totals. Walks
+        that loop are cut off after `max_steps`."""
+        current = np.asarray(starts, dtype=np.int64).copy()
+        totals = np.zeros((len(current), len(FIELDS)), dtype=np.int32)
+        rows = np.arange(len(current))
+        ranged = self._ranged
+        for _ in range(max_steps):
+            if not len(rows):
+                break
+            nodes = current[rows]
+            effect = self._has_effect[nodes]
+            if effect.any():
+                changed, changed_nodes = rows[effect], nodes[effect]
+                gained = self.low[changed_nodes]
+                span = self.high[changed_nodes][:, ranged] - gained[:, ranged] + 1
+                draws = self.rng.random(span.shape) * span
+                gained[:, ranged] += draws.astype(np.int32)
+                totals[changed] += gained
+            start = self.offsets[nodes]
+            degree = self.offsets[nodes + 1] - start
+            pick = start + (self.rng.random(len(rows)) * degree).astype(np.int64)
+            has_next = degree > 0
+            current[rows] = np.where(
+                has_next, self.targets[np.where(has_next, pick, 0)], -1
+            )
+            rows = rows[has_next]
+        return totals
+
+    def event(self, name: str, runs: int = 10_000) -> Outcomes:
+        """Outcomes of jumping to the event or event list"""
+        return Outcomes(self.sample(np.full(runs, self.node(name))))
+
+    def events(
+        self, names: Iterable[str] = None, runs: int = 1_000
+    ) -> dict[str, Outcomes]:
+        """Outcomes of every named event, or just these, all sampled in one go"""
+        if names is None:
+            names = [name for tag, name in self.roots if tag == "event"]
+        names = list(names)
+        nodes = np.array([self.node(name) for name in names], dtype=np.int64)
+        samples = self.sample(np.repeat(nodes, runs)).reshape(len(names), runs, -1)
+        return {name: Outcomes(s) for name, s in zip(names, samples)}
+
+    def sector(self, name: str, runs: int = 1_000) -> Outcomes:
+        """Outcomes of every beacon of a sector together: the start event, and for
+        each of its `<event name=... min=... max=...>` that many draws from it"""
+        sector = data.named_elements("sectorDescription")[name][-1]
+        run_of, starts = [], []
+        for sub in sector:
+            if sub.tag == "startEvent" and sub.text:
+                i = self._resolve(sub.text.strip())
+                if i is not None:
+                    run_of.append(np.arange(runs))
+                    starts.append(np.full(runs, i))
+            elif sub.tag == "event" and sub.get("name"):
+                i = self._resolve(sub.get("name"))
+                found = _range(sub)
+                if i is None or found is None:
+                    continue
+                # It can't come up fewer than no times
+                low, high = (max(n, 0) for n in found)
+                counts = self.rng.integers(low, high + 1, size=runs)
+                run_of.append(np.repeat(np.arange(runs), counts))
+                starts.append(np.full(counts.sum(), i))
+        totals = np.zeros((runs, len(FIELDS)), dtype=np.int64)
+        if starts:
+            samples = self.sample(np.concatenate(starts))
+            run_of = np.concatenate(run_of)
+            for f in range(len(FIELDS)):
+                totals[:, f] = np.bincount(run_of, samples[:, f], minlength=runs)
+        return Outcomes(totals)
@@ -0,0 +1,421 @@
+"""
+Everything that is loaded, in one binary file that opens without parsing anything.
+
+The file is a header, then flat arrays that are used where they are, memory-mapped:
+
+- the elements, five ints each in document order: tag, text, first attribute, number
+  of attributes and the index just past its last descendant, so the children of an
+  element are found by hopping from one to the next
+- the attributes, a key and a value each
+- the name index, in the order of `data.NAME_INDEX`: every name's elements one after
+  the other, and where each name's start
+- the names, of the name index and then of the named strings, and the order each
+  tag's, and the named strings', sort in, to look them up without a dict
+- the bodies of the named strings
+- a string table, every tag, attribute, text, name and body stored once, laid out the
+  way `StringTable` saves its bodies, id 0 is `None`
+
+Opening one maps it and reads the header, `Element`s are only made for the top level
+elements that get looked up and names are looked up in place, so a process only pays
+for what it uses and every process that opens the same file shares its pages. The
+ints are in the byte order of the machine that wrote it.
+
+The header also lists the data files it was made from, so `Snapshot.stale` can tell
+when they changed since.
+
+    write(Path("ftl.snapshot"))
+    ftl.data.use_snapshot(Path("ftl.snapshot"))  # or FTL_SNAPSHOT=ftl.snapshot
+
+Or without a file, one process can `publish` it in shared memory for the others:
+
+    shm = publish()
+    pool = ProcessPoolExecutor(
+        initializer=ftl.data.use_shared_memory, initargs=(shm.name,)
+    )
+"""
+
+import io
+import json
+import mmap
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import BinaryIO, Iterator, Mapping
+from xml.etree.ElementTree import Element
+
+from .strings import StringTable
+
+MAGIC = b"FTLSNAP1"
+# Bump this whenever the layout changes
+VERSION = 3
+_NODE = 5
+_TAG, _TEXT, _ATTRS, _N_ATTRS, _END = range(_NODE)
+
+
+def _aligned(offset: int) -> int:
+    return offset + -offset % 8
+
+
+def write(path: Path) -> Path:
+    """Writes everything `ftl.data` has loaded to `path`"""
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with tmp.open("wb") as fp:
+        _dump(fp)
+    tmp.replace(path)
+    return path
+
+
+def publish(name: str = None) -> SharedMemory:
+    """Puts a snapshot of everything `ftl.data` has loaded in a new block of shared
+    memory, for other processes to `Snapshot.attach` to by its `name`. The block is
+    the caller's, it has to `close` and `unlink` it once they are done."""
+    fp = io.BytesIO()
+    _dump(fp)
+    with fp.getbuffer() as dumped:
+        shm = SharedMemory(name, create=True, size=len(dumped))
+        shm.buf[: len(dumped)] = dumped
+    return shm
+
+
+def _dump(fp: BinaryIO):
+    from . import data
+
+    files = data.file_elements()
+    ids: dict[str, int] = {}
+    pool: list[bytes] = [b""]
+
+    def string(s: str | None) -> int:
+        if s is None:
+            return 0
+        i = ids.get(s)
+        if i is None:
+            i = ids[s] = len(pool)
+            pool.append(s.encode())
+        return i
+
+    nodes, attrs = array("i"), array("i")
+    where: dict[int, int] = {}
+
+    def add(e: Element):
+        i = len(nodes) // _NODE
+        nodes.extend((string(e.tag), string(e.text), len(attrs) // 2, len(e.attrib), 0))
+        for k, v in e.items():
+            attrs.extend((string(k), string(v)))
+        for sub in e:
+            add(sub)
+        nodes[i * _NODE + _END] = len(nodes) // _NODE
+
+    sources = []
+    for xmlfp in sorted(files):
+        for e in files[xmlfp]:
+            where[id(e)] = len(nodes) // _NODE
+            add(e)
+        stat = data._FILE_STATS[xmlfp]
+        sources.append([str(xmlfp.absolute()), *stat, len(files[xmlfp])])
+    names, entries, starts, tags = array("i"), array("i"), array("i", [0]), {}
+    for tag, by_name in data.NAME_INDEX.items():
+        if not by_name:
+            continue
+        first = len(names)
+        for name, elements in by_name.items():
+            names.append(string(name))
+            entries.extend(where[id(e)] for e in elements)
+            starts.append(len(entries))
+        tags[tag] = [first, len(names)]
+    texts = array("i")
+    for name in data.STRING_DATA:
+        names.append(string(name))
+        texts.append(string(data.STRING_DATA[name]))
+    # Each tag's names, and those of the named strings, sorted for `NameTable`
+    order = array("i")
+    for start, end in (*tags.values(), (len(names) - len(texts), len(names))):
+        order.extend(sorted(range(start, end), key=lambda k: pool[names[k]]))
+
+    offsets = array("q", [0])
+    for body in pool:
+        offsets.append(offsets[-1] + len(body))
+    header = json.dumps(
+        {
+            "version": VERSION,
+            "strings": len(pool),
+            "nodes": len(nodes) // _NODE,
+            "attrs": len(attrs) // 2,
+            "entries": len(entries),
+            "starts": len(starts),
+            "names": len(names),
+            "order": len(order),
+            "texts": len(texts),
+            "tags": tags,
+            # Each data file it was made from, its size and mtime and how many top
+            # level elements it has
+            "files": sources,
+            "signature": data._files_signature(
+                [Path(f[0]) for f in sources], [f[1:3] for f in sources]
+            ),
+        }
+    ).encode()
+    # Pad so the ints start 8 byte aligned
+    header += b" " * (-(len(MAGIC) + len(header) + 1) % 8) + b"\n"
+    fp.write(MAGIC)
+    fp.write(header)
+    for part in (nodes, attrs, entries, starts, names, order, texts):
+        fp.write(memoryview(part).cast("B"))
+    # and the string offsets too
+    fp.write(b"\0" * (-fp.tell() % 8))
+    fp.write(memoryview(offsets).cast("B"))
+    fp.write(b"".join(pool))
+
+
+class Snapshot:
+    """A snapshot `write` made, over any buffer holding one, a map of the file or
+    shared memory"""
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        end = bytes(view[: 1 << 16]).find(b"\n")
+        if view[: len(MAGIC)] != MAGIC or end < 0:
+            raise ValueError("Not an FTL snapshot")
+        header = json.loads(bytes(view[len(MAGIC) : end]))
+        if header["version"] != VERSION:
+            raise ValueError(f"Snapshot version {header['version']} isn't {VERSION}")
+        self._buffer = buffer
+        self._tags: dict[str, list[int]] = header["tags"]
+        # The data files it was made from, in load order, and their size and mtime
+        self.files: dict[Path, tuple[int, int]] = {
+            Path(path): (size, mtime) for path, size, mtime, _ in header["files"]
+        }
+        self._counts = [count for *_, count in header["files"]]
+        # Tells the data it was made from apart from other data
+        self.signature: str = header["signature"]
+        start = end + 1
+        sections = []
+        for key, width in (
+            ("nodes", _NODE),
+            ("attrs", 2),
+            ("entries", 1),
+            ("starts", 1),
+            ("names", 1),
+            ("order", 1),
+            ("texts", 1),
+        ):
+            size = header[key] * width * 4
+            sections.append(view[start : start + size].cast("i"))
+            start += size
+        self._nodes, self._attrs, self._entries, self._starts = sections[:4]
+        self._names, self._order, self._texts = sections[4:]
+        start = _aligned(start)
+        self.strings = StringTable()
+        self.strings.attach(buffer, start, header["strings"], [0])
+        self._strings_start = start
+        self._decoded: dict[int, str] = {}
+        # Every element made so far, by index, so each is only made once
+        self._elements: dict[int, Element] = {}
+        # `id` of every element made so far, the top level ones and everything in
+        # them -> its index
+        self._made: dict[int, int] = {}
+        # The index each file's elements start at, worked out when first needed
+        self._file_starts: list[int] | None = None
+        view.release()
+
+    @classmethod
+    def open(cls, path: Path) -> "Snapshot":
+        with path.open("rb") as fp:
+            return cls(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def attach(cls, name: str) -> "Snapshot":
+        """The snapshot `publish` put in the shared memory called `name`, read-only"""
+        try:
+            shm = SharedMemory(name, track=False)
+        except TypeError:
+            # Before 3.13 every process that attaches registers the block with its
+            # resource tracker, which unlinks it once the processes that share the
+            # tracker are gone. Processes started by the publisher share its one, and
+            # its registration, any other process starts a tracker of its own that
+            # would unlink the block as soon as that process exits. Where the
+            # tracker's internals aren't the ones looked at here, the block is taken
+            # to be someone else's and is always unregistered.
+            tracker = getattr(resource_tracker, "_resource_tracker", None)
+            own_tracker = getattr(tracker, "_fd", None) is None
+            shm = SharedMemory(name)
+            if own_tracker:
+                # noinspection PyProtectedMember
+                resource_tracker.unregister(shm._name, "shared_memory")
+        out = cls(shm.buf.toreadonly())
+        # Closing it is up to the garbage collector, it can't be while anything
+        # made from it still points into it
+        out._shm = shm
+        return out
+
+    @property
+    def tags(self) -> list[str]:
+        """The tags that have named top level elements"""
+        return list(self._tags)
+
+    def string(self, i: int) -> str | None:
+        try:
+            return self._decoded[i]
+        except KeyError:
+            out = self._decoded[i] = self.strings.body(i)
+            return out
+
+    def element(self, i: int) -> Element:
+        """The element at index `i`, and everything inside it"""
+        try:
+            return self._elements[i]
+        except KeyError:
+            pass
+        e = self._elements[i] = self._make(i)[0]
+        return e
+
+    def _make(self, i: int) -> tuple[Element, int]:
+        nodes, attrs, string = self._nodes, self._attrs, self.string
+        base = i * _NODE
+        first = nodes[base + _ATTRS] * 2
+        e = Element(
+            string(nodes[base + _TAG]),
+            {
+                string(attrs[j]): string(attrs[j + 1])
+                for j in range(first, first + nodes[base + _N_ATTRS] * 2, 2)
+            },
+        )
+        text = nodes[base + _TEXT]
+        if text:
+            e.text = string(text)
+        self._made[id(e)] = i
+        end = nodes[base + _END]
+        j = i + 1
+        while j < end:
+            sub, j = self._make(j)
+            e.append(sub)
+        return e, end
+
+    def roots(self) -> Iterator[Element]:
+        """Every top level element, in load order"""
+        i, count = 0, len(self._nodes) // _NODE
+        while i < count:
+            yield self.element(i)
+            i = self._nodes[i * _NODE + _END]
+
+    def by_file(self) -> dict[Path, list[Element]]:
+        """Every top level element, by the data file it came from"""
+        roots = self.roots()
+        return {
+            xmlfp: list(islice(roots, count))
+            for xmlfp, count in zip(self.files, self._counts)
+        }
+
+    def where(self, e: Element) -> tuple[Path, int, int] | None:
+        """The data file an element made from the snapshot came from, how many
+        elements come before it in that file and how many the file has, all in
+        document order and counting everything inside the top level ones"""
+        i = self._made.get(id(e))
+        if i is None:
+            return None
+        if self._file_starts is None:
+            # Hopping over the top level elements, nothing gets made
+            starts, j = [], 0
+            for count in self._counts:
+                starts.append(j)
+                for _ in range(count):
+                    j = self._nodes[j * _NODE + _END]
+            self._file_starts = starts + [j]
+        k = bisect_right(self._file_starts, i) - 1
+        start, end = self._file_starts[k], self._file_starts[k + 1]
+        return list(self.files)[k], i - start, end - start
+
+    def stale(self) -> bool:
+        """Whether the data files it was made from changed since, or some are gone or
+        were added next to them"""
+        present = {p for d in {f.parent for f in self.files} for p in d.glob("*.xml")}
+        if present != self.files.keys():
+            return True
+        for xmlfp, stat in self.files.items():
+            st = xmlfp.stat()
+            if (st.st_size, st.st_mtime_ns) != stat:
+                return True
+        return False
+
+    def by_name(self, tag: str) -> "Names":
+        start, end = self._tags.get(tag, (0, 0))
+        return Names(NameTable(self, start, end))
+
+    def fill_strings(self, table: StringTable):
+        """Points the table at the named strings in the snapshot"""
+        table.attach(self._buffer, self._strings_start, self.strings.count, [0])
+        end = len(self._names)
+        table.use_names(NameTable(self, end - len(self._texts), end, self._texts))
+
+
+class NameTable(Mapping[str, int]):
+    """name -> position in the snapshot's names, or what is at that position in
+    `values`, for the names from `start` to `end`. Looking one up is a binary search
+    through the snapshot, so it costs nothing but the pages that are read."""
+
+    def __init__(self, snapshot: Snapshot, start: int, end: int, values=None):
+        self._snapshot = snapshot
+        self._start, self._end = start, end
+        self._values = values
+
+    def _encoded(self, k: int) -> bytes:
+        return self._snapshot.strings.encoded(self._snapshot._names[k])
+
+    def _find(self, name) -> int | None:
+        if not isinstance(name, str):
+            return None
+        key, order = name.encode(), self._snapshot._order
+        j = bisect_left(order, key, self._start, self._end, key=self._encoded)
+        if j < self._end and self._encoded(order[j]) == key:
+            return order[j]
+        return None
+
+    def __getitem__(self, name: str) -> int:
+        k = self._find(name)
+        if k is None:
+            raise KeyError(name)
+        return k if self._values is None else self._values[k - self._start]
+
+    def __contains__(self, name) -> bool:
+        return self._find(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        names, string = self._snapshot._names, self._snapshot.string
+        for k in range(self._start, self._end):
+            yield string(names[k])
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+
+class Names(Mapping[str, list[Element]]):
+    """name -> the top level elements with one tag, like the dicts in
+    `data.NAME_INDEX`, the elements are only made when a name is looked up"""
+
+    def __init__(self, positions: NameTable):
+        self._snapshot = positions._snapshot
+        # name -> where its elements are in the index
+        self.positions = positions
+        self._elements: dict[str, list[Element]] = {}
+
+    def __getitem__(self, name: str) -> list[Element]:
+        try:
+            return self._elements[name]
+        except KeyError:
+            pass
+        snapshot, k = self._snapshot, self.positions[name]
+        entries = snapshot._entries[snapshot._starts[k] : snapshot._starts[k + 1]]
+        out = self._elements[name] = list(map(snapshot.element, entries))
+        return out
+
+    def __contains__(self, name) -> bool:
+        return name in self.positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.positions)
+
+    def __len__(self) -> int:
+        return len(self.positions)
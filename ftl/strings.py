@@ -0,0 +1,202 @@
+"""
+A compact table for the named strings, the `<text name="...">` elements.
+
+Every body is stored once as UTF-8 in a single buffer and gets an integer id, its
+offsets in the buffer. Names are interned and map to the id of their current body, so
+the whole table is a dict, an array of offsets and one `bytes`, instead of an
+`Element`, an attribute dict and a `str` per string. The buffer can be written out
+and memory-mapped back in, then the bodies live in the page cache and not on the heap.
+Bodies that get added later, when files are reloaded, go in a second buffer of their
+own, and `compact` drops the ones nothing is named by anymore.
+"""
+
+import json
+import mmap
+import os
+from array import array
+from pathlib import Path
+from sys import intern
+from typing import Iterable, Iterator, Mapping
+
+MAGIC = b"FTLSTR1\n"
+
+
+class StringTable(Mapping[str, str]):
+    def __init__(self):
+        self._mmap: mmap.mmap | None = None
+        self._buffer: bytes | memoryview = b""
+        self.clear()
+
+    def clear(self):
+        """Forgets every name and body"""
+        self._release()
+        self._names: Mapping[str, int] = {}
+        self._offsets = array("q", [0])
+        # Ids of bodies that are `None` rather than an empty string
+        self._none: set[int] = set()
+        self._buffer: bytes | memoryview = b""
+        # Bodies `add`ed after the rest, so a mapped buffer never has to be copied to
+        # add to it, their ids come after the ones in `_buffer`
+        self._added_offsets = array("q", [0])
+        self._added = bytearray()
+
+    def _release(self):
+        """Lets go of the buffer `open` or `attach` pointed into, if there is one, and
+        closes the map `open` made"""
+        if isinstance(self._buffer, memoryview):
+            # Nothing may still point into the map when it is closed
+            self._offsets.release()
+            self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def fill(self, bodies: Iterable[str | None]) -> range:
+        """Replaces every body in one go and forgets every name, the bodies get the
+        ids in the returned range in order"""
+        self.clear()
+        encoded = []
+        for i, body in enumerate(bodies):
+            if body is None:
+                self._none.add(i)
+                body = ""
+            encoded.append(body.encode())
+        self._buffer = b"".join(encoded)
+        self._offsets = array("q", [0] * (len(encoded) + 1))
+        offset = 0
+        for i, body in enumerate(encoded, 1):
+            offset += len(body)
+            self._offsets[i] = offset
+        return range(len(encoded))
+
+    def add(self, body: str | None) -> int:
+        """Stores one more body and returns its id, it stays unnamed until `bind`"""
+        i = self.count
+        if body is None:
+            self._none.add(i)
+            body = ""
+        self._added += body.encode()
+        self._added_offsets.append(len(self._added))
+        return i
+
+    def compact(self, keep: Iterable[int]) -> dict[int, int]:
+        """Drops every body but the `keep` ones, which get new ids in that order, and
+        moves the names over. Returns old id -> new id."""
+        keep = list(keep)
+        moved = {old: new for new, old in enumerate(keep)}
+        names = {name: moved[i] for name, i in self._names.items() if i in moved}
+        self.fill([self.body(i) for i in keep])
+        self._names = names
+        return moved
+
+    def bind(self, name: str, i: int):
+        self._names[intern(name)] = i
+
+    def use_names(self, names: Mapping[str, int]):
+        """Looks names up in `names`, name -> id, from now on. It is used as it is, not
+        copied, so nothing can be bound or unbound until `clear`."""
+        self._names = names
+
+    def unbind(self, name: str):
+        self._names.pop(name, None)
+
+    def _slice(self, i: int) -> bytes | memoryview | bytearray:
+        base = len(self._offsets) - 1
+        if i < base:
+            return self._buffer[self._offsets[i] : self._offsets[i + 1]]
+        i -= base
+        return self._added[self._added_offsets[i] : self._added_offsets[i + 1]]
+
+    def encoded(self, i: int) -> bytes:
+        """The body as UTF-8, without decoding it"""
+        return bytes(self._slice(i))
+
+    @property
+    def count(self) -> int:
+        """How many bodies there are, named or not"""
+        return len(self._offsets) + len(self._added_offsets) - 2
+
+    def body(self, i: int) -> str | None:
+        if i in self._none:
+            return None
+        return str(self._slice(i), "utf-8")
+
+    def __getitem__(self, name: str) -> str | None:
+        return self.body(self._names[name])
+
+    def __contains__(self, name) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the buffer and the offsets, what the bodies cost"""
+        return (
+            len(self._buffer)
+            + len(self._added)
+            + (len(self._offsets) + len(self._added_offsets)) * 8
+        )
+
+    def save(self, path: Path, signature: str):
+        """Writes the bodies, not the names, for `open` to map back in. `signature`
+        is whatever tells the data they were made from apart from other data."""
+        if self._added:
+            self.compact(range(self.count))
+        header = json.dumps(
+            {
+                "signature": signature,
+                "count": self.count,
+                "none": sorted(self._none),
+            }
+        ).encode()
+        # Pad so the offsets start 8 byte aligned
+        header += b" " * (-(len(MAGIC) + len(header) + 1) % 8) + b"\n"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("wb") as fp:
+            fp.write(MAGIC)
+            fp.write(header)
+            fp.write(memoryview(self._offsets).cast("B"))
+            fp.write(self._buffer)
+        tmp.replace(path)
+
+    def open(self, path: Path, signature: str, count: int) -> bool:
+        """Maps in the bodies `save`d to `path` in place of the current ones, if it was
+        saved with this signature and has `count` bodies. The names are forgotten
+        when it is."""
+        try:
+            with path.open("rb") as fp:
+                mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        try:
+            end = mapped.find(b"\n", len(MAGIC))
+            header = json.loads(mapped[len(MAGIC) : end])
+            ok = (
+                mapped[: len(MAGIC)] == MAGIC
+                and header["signature"] == signature
+                and header["count"] == count
+            )
+        except (ValueError, KeyError):
+            ok = False
+        if not ok:
+            mapped.close()
+            return False
+        self.attach(mapped, end + 1, count, header["none"])
+        self._mmap = mapped
+        return True
+
+    def attach(self, buffer, start: int, count: int, none: Iterable[int] = ()):
+        """Uses `count` bodies laid out the way `save` writes them, starting at `start`
+        in `buffer`, in place of the current ones, without copying them. `none` are
+        the ids of the ones that are `None`. The names are forgotten."""
+        self.clear()
+        with memoryview(buffer) as view:
+            self._offsets = view[start : start + (count + 1) * 8].cast("q")
+            start += (count + 1) * 8
+            self._buffer = view[start : start + self._offsets[-1]]
+        self._none = set(none)
@@ -0,0 +1,282 @@
+"""
+Writes made up FTL data files for testing and profiling at sizes the game never ships.
+
+Everything is deterministic for a given seed, and every reference points at something
+that exists: events load event lists and ships, texts load text lists and strings,
+ship blueprints carry weapon blueprints and sectors draw from event lists. Every other
+events file, starting with the first, and all the text files are written with multiple
+root elements like the game's own text files, so the `_hack` path gets exercised too.
+
+    python -m ftl.synthetic out/ --scale 100
+"""
+
+import argparse
+import random
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterator, TextIO
+
+DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
+_COUNTS = (
+    "events",
+    "event_lists",
+    "text_lists",
+    "texts",
+    "weapons",
+    "ships",
+    "sectors",
+)
+
+
+@dataclass(frozen=True)
+class Sizes:
+    """How much of everything to write, the defaults are roughly the vanilla game"""
+
+    events: int = 600
+    event_lists: int = 250
+    text_lists: int = 60
+    texts: int = 4000
+    weapons: int = 120
+    ships: int = 40
+    sectors: int = 25
+    # How deep `event/choice/event` chains nest under a named event
+    depth: int = 2
+    max_choices: int = 3
+    # Elements per file, large data sets get split over several files
+    per_file: int = 5000
+    # Every n-th events file, starting with the first, is written without an `<FTL>`
+    # root, 0 never does
+    multi_root_every: int = 2
+
+    def scaled(self, scale: float) -> "Sizes":
+        """The same shape, with `scale` times as many of everything"""
+        return replace(
+            self,
+            **{name: max(1, int(getattr(self, name) * scale)) for name in _COUNTS},
+        )
+
+    @property
+    def elements(self) -> int:
+        """Roughly how many top level elements get written"""
+        return sum(getattr(self, name) for name in _COUNTS)
+
+
+class _Writer:
+    def __init__(self, rng: random.Random, sizes: Sizes):
+        self.rng = rng
+        self.sizes = sizes
+
+    def text(self) -> str:
+        rng = self.rng
+        roll = rng.random()
+        if roll < 0.4:
+            return f'<text id="TEXT_{rng.randrange(self.sizes.texts)}"/>'
+        if roll < 0.5:
+            return f'<text load="TEXT_LIST_{rng.randrange(self.sizes.text_lists)}"/>'
+        return f"<text>Something happens at beacon {rng.randrange(100_000)}.</text>"
+
+    def event(self, name: str | None, depth: int) -> Iterator[str]:
+        rng, sizes = self.rng, self.sizes
+        attrs = f' name="{name}"' if name else ""
+        if name is None and rng.random() < 0.3:
+            # Most of the nested events in the game are just a load
+            target = rng.randrange(sizes.event_lists)
+            yield f'<event load="LIST_{target}"/>'
+            return
+        yield f"<event{attrs}>"
+        yield self.text()
+        if rng.random() < 0.15:
+            yield f'<ship load="SHIP_EVENT_{rng.randrange(sizes.ships)}" hostile="true"/>'
+        if rng.random() < 0.05:
+            yield f'<boarders min="{rng.randint(1, 2)}" max="{rng.randint(2, 4)}" class="human"/>'
+        if rng.random() < 0.1:
+            yield "<distressBeacon/>"
+        if rng.random() < 0.05:
+            yield "<store/>"
+        if rng.random() < 0.2:
+            yield '<autoReward level="MED">standard</autoReward>'
+        if rng.random() < 0.1:
+            yield f'<damage amount="{rng.randint(1, 6)}"/>'
+        if rng.random() < 0.05:
+            yield '<crewMember amount="1" class="engi"/>'
+        if rng.random() < 0.05:
+            yield "<removeCrew><clone>true</clone><text>They are gone.</text></removeCrew>"
+        if rng.random() < 0.05:
+            yield f'<weapon name="WEAPON_{rng.randrange(sizes.weapons)}"/>'
+        if rng.random() < 0.03:
+            yield f'<quest event="EVENT_{rng.randrange(sizes.events)}"/>'
+        if rng.random() < 0.03:
+            yield '<item_modify><item type="fuel" min="-2" max="-1"/></item_modify>'
+        if rng.random() < 0.03:
+            yield '<modifyPursuit amount="1"/>'
+        if depth > 0:
+            for _ in range(rng.randint(1, sizes.max_choices)):
+                hidden = ' hidden="true"' if rng.random() < 0.2 else ""
+                yield f"<choice{hidden}>"
+                yield "<text>Continue...</text>"
+                yield from self.event(None, depth - 1)
+                yield "</choice>"
+        yield "</event>"
+
+    def events(self) -> Iterator[str]:
+        rng, sizes = self.rng, self.sizes
+        for i in range(sizes.events):
+            yield "".join(self.event(f"EVENT_{i}", rng.randint(0, sizes.depth)))
+        for i in range(sizes.event_lists):
+            entries = "".join(
+                (
+                    f'<event load="EVENT_{rng.randrange(sizes.events)}"/>'
+                    if rng.random() < 0.7
+                    else "".join(self.event(None, 0))
+                )
+                for _ in range(rng.randint(2, 6))
+            )
+            yield f'<eventList name="LIST_{i}">{entries}</eventList>'
+        for i in range(sizes.text_lists):
+            entries = "".join(
+                f"<text>Flavor text {i}.{j}</text>" for j in range(rng.randint(2, 8))
+            )
+            yield f'<textList name="TEXT_LIST_{i}">{entries}</textList>'
+        for i in range(sizes.ships):
+            yield (
+                f'<ship name="SHIP_EVENT_{i}" auto_blueprint="SHIP_{i}">'
+                f"<destroyed>{''.join(self.event(None, 0))}</destroyed></ship>"
+            )
+
+    def texts(self) -> Iterator[str]:
+        for i in range(self.sizes.texts):
+            yield f'<text name="TEXT_{i}">Text number {i} of the synthetic data.</text>'
+        for i in range(self.sizes.ships):
+            yield f'<text name="SHIP_CLASS_{i}">Class {i}</text>'
+
+    def blueprints(self) -> Iterator[str]:
+        rng, sizes = self.rng, self.sizes
+        for i in range(sizes.weapons):
+            yield (
+                f'<weaponBlueprint name="WEAPON_{i}"><type>LASER</type>'
+                f'<title id="TEXT_{rng.randrange(sizes.texts)}"/>'
+                f"<short>W{i}</short><desc>Weapon {i}</desc>"
+                f"<tooltip>Weapon {i}</tooltip>"
+                f"<damage>{rng.randint(0, 4)}</damage><shots>{rng.randint(1, 4)}</shots>"
+                f"<ion>{rng.choice((0, 0, 0, 1, 2))}</ion>"
+                f"<cooldown>{rng.randint(5, 25)}</cooldown>"
+                f"<power>{rng.randint(1, 4)}</power><cost>{rng.randint(20, 120)}</cost>"
+                f"<rarity>{rng.randint(0, 5)}</rarity><image>weapon_{i}</image>"
+                f"<weaponArt>weapon_art_{i}</weaponArt><launchSounds>"
+                "<sound>lightLaser1</sound><sound>lightLaser2</sound>"
+                "</launchSounds></weaponBlueprint>"
+            )
+        for i in range(sizes.ships):
+            weapons = "".join(
+                f'<weapon name="WEAPON_{rng.randrange(sizes.weapons)}"/>'
+                for _ in range(rng.randint(1, 4))
+            )
+            yield (
+                f'<shipBlueprint name="SHIP_{i}" layout="layout_{i}" img="img_{i}">'
+                f'<class id="SHIP_CLASS_{i}"/><name>Ship {i}</name>'
+                "<desc>A ship.</desc><systemList>"
+                '<pilot power="1" room="0" start="true"/>'
+                '<shields power="2" room="5"/></systemList><weaponSlots>4</weaponSlots>'
+                f'<weaponList count="2" missiles="8">{weapons}</weaponList>'
+                f'<health amount="{rng.randint(10, 30)}"/><maxPower amount="8"/>'
+                '<crewCount amount="3" class="human"/><aug name="SCRAP_COLLECTOR"/>'
+                "</shipBlueprint>"
+            )
+
+    def sectors(self) -> Iterator[str]:
+        rng, sizes = self.rng, self.sizes
+        for i in range(sizes.sectors):
+            sector_events = []
+            for _ in range(rng.randint(3, 8)):
+                lo = rng.randint(0, 3)
+                target = rng.randrange(sizes.event_lists)
+                sector_events.append(
+                    f'<event name="LIST_{target}" min="{lo}" max="{lo + rng.randint(0, 3)}"/>'
+                )
+            rarities = "".join(
+                f'<rarity name="WEAPON_{rng.randrange(sizes.weapons)}" '
+                f'rarity="{rng.randint(0, 5)}"/>'
+                for _ in range(rng.randint(0, 4))
+            )
+            yield (
+                f'<sectorDescription name="SECTOR_{i}" '
+                f'minSector="{rng.randint(0, 6)}" unique="false">'
+                f'<nameList><name short="S{i}" id="TEXT_{rng.randrange(sizes.texts)}"/>'
+                "</nameList><trackList><track>civil</track></trackList>"
+                f"<startEvent>EVENT_{rng.randrange(sizes.events)}</startEvent>"
+                f"{''.join(sector_events)}"
+                f"{f'<rarityList>{rarities}</rarityList>' if rarities else ''}"
+                "</sectorDescription>"
+            )
+        yield (
+            '<sectorType name="SYNTHETIC">'
+            + "".join(f"<sector>SECTOR_{i}</sector>" for i in range(sizes.sectors))
+            + "</sectorType>"
+        )
+
+
+def _write(fp: TextIO, elements: Iterator[str], multi_root: bool):
+    fp.write(DECLARATION)
+    if not multi_root:
+        fp.write("<FTL>\n")
+    for e in elements:
+        fp.write(e)
+        fp.write("\n")
+    if not multi_root:
+        fp.write("</FTL>\n")
+
+
+def _write_split(
+    directory: Path, prefix: str, elements: Iterator[str], sizes: Sizes, multi_root
+):
+    """Writes `prefix_000.xml`, `prefix_001.xml`... with at most `sizes.per_file`
+    elements in each, numbered so they sort, and load, in the order they are written"""
+    elements = iter(elements)
+    index = 0
+    while True:
+        batch = [e for _, e in zip(range(sizes.per_file), elements)]
+        if not batch and index:
+            return
+        with (directory / f"{prefix}_{index:03d}.xml").open(
+            "w", encoding="utf-8"
+        ) as fp:
+            _write(fp, iter(batch), multi_root(index))
+        index += 1
+
+
+def generate(directory: Path, sizes: Sizes = Sizes(), seed: int = 0) -> Path:
+    """Writes a full data set into `directory`, which can then be used as `DATA_DIR`"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    w = _Writer(random.Random(seed), sizes)
+    every = sizes.multi_root_every
+    _write_split(
+        directory,
+        "events",
+        w.events(),
+        sizes,
+        lambda i: every and i % every == 0,
+    )
+    _write_split(directory, "text", w.texts(), sizes, lambda i: True)
+    _write_split(directory, "blueprints", w.blueprints(), sizes, lambda i: False)
+    _write_split(directory, "sector_data", w.sectors(), sizes, lambda i: False)
+    return directory
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m ftl.synthetic", description=__doc__
+    )
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=Sizes.depth)
+    parser.add_argument("--per-file", type=int, default=Sizes.per_file)
+    args = parser.parse_args(argv)
+    sizes = Sizes(depth=args.depth, per_file=args.per_file).scaled(args.scale)
+    generate(args.directory, sizes, args.seed)
+    print(f"Wrote ~{sizes.elements} top level elements to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
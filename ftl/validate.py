@@ -0,0 +1,147 @@
+"""
+Finds references to things that aren't there.
+
+Every reference in the data, `<text load=...>` to a text list, `<text id=...>` to a
+string, `load=` and `<quest event=...>` to an event or event list, `<ship load=...>`
+to a ship, the weapons of a ship blueprint, a sector's events and a sector type's
+sectors, is collected in one walk over each file and checked against the name
+indexes. What a file refers to is kept until the file is reloaded, so after a reload
+only the changed files are walked again and checking is a set lookup per reference.
+Where in its file a problem is only gets looked up when it is printed.
+
+    for problem in validate():
+        print(problem)
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from xml.etree.ElementTree import Element
+
+from . import data
+from .locations import locate, Location
+
+Key = tuple[str, str]
+# What a reference can resolve to, the first tag that has the name wins. `STRING`
+# references are to the named strings.
+STRING = "string"
+TARGETS: dict[str, tuple[str, ...]] = {
+    "load": ("event", "eventList"),
+    "textList": ("textList",),
+    STRING: (),
+    "ship": ("ship",),
+    "shipBlueprint": ("shipBlueprint", "blueprintList"),
+    "weaponBlueprint": ("weaponBlueprint",),
+    "blueprintList": ("blueprintList",),
+    "sectorDescription": ("sectorDescription",),
+}
+# Tags whose `id=` is the name of a string
+_STRING_TAGS = {"text", "title", "desc", "tooltip", "class", "unlock", "name"}
+
+
+@dataclass(frozen=True)
+class Reference:
+    # (tag, name) of the top level element it is in, the name is "" if it has none
+    source: Key
+    kind: str
+    name: str
+    element: Element
+
+
+@dataclass(frozen=True)
+class Problem:
+    file: Path
+    reference: Reference
+
+    @property
+    def location(self) -> Location | None:
+        return locate(self.reference.element)
+
+    def __str__(self) -> str:
+        tag, name = self.reference.source
+        where = f"{tag} {name}" if name else tag
+        return (
+            f"{self.location or self.file.name}: {where} refers to {self.reference.kind} "
+            f"{self.reference.name!r}, which doesn't exist"
+        )
+
+
+def references(e: Element) -> list[Reference]:
+    """Everything the top level element refers to"""
+    source = e.tag, e.get("name", "")
+    out = []
+
+    def ref(kind: str, name: str | None, sub: Element):
+        if name:
+            out.append(Reference(source, kind, name.strip(), sub))
+
+    if e.tag == "sectorType":
+        for sub in e:
+            if sub.tag == "sector":
+                ref("sectorDescription", sub.text, sub)
+        return out
+    if e.tag == "sectorDescription":
+        for sub in e:
+            if sub.tag == "event":
+                ref("load", sub.get("name"), sub)
+            elif sub.tag == "startEvent":
+                ref("load", sub.text, sub)
+    for sub in e.iter():
+        tag = sub.tag
+        if tag == "text":
+            ref("textList", sub.get("load"), sub)
+        elif tag == "event":
+            if sub is not e:
+                ref("load", sub.get("load"), sub)
+        elif tag == "quest":
+            ref("load", sub.get("event"), sub)
+        elif tag == "ship":
+            if sub is e:
+                ref("shipBlueprint", sub.get("auto_blueprint"), sub)
+            else:
+                ref("ship", sub.get("load"), sub)
+        elif tag == "weaponList":
+            ref("blueprintList", sub.get("load"), sub)
+            if e.tag == "shipBlueprint":
+                for weapon in sub:
+                    ref("weaponBlueprint", weapon.get("name"), weapon)
+        if tag in _STRING_TAGS and sub.get("id"):
+            ref(STRING, sub.get("id"), sub)
+    return out
+
+
+# file -> (the elements that were walked, what they refer to)
+_FILE_REFERENCES: dict[Path, tuple[list[Element], list[Reference]]] = {}
+
+
+def _file_references(xmlfp: Path, elements: list[Element]) -> list[Reference]:
+    cached = _FILE_REFERENCES.get(xmlfp)
+    # A reload swaps in a new list for the file, the same list means nothing changed
+    if cached is not None and cached[0] is elements:
+        return cached[1]
+    refs = [ref for e in elements for ref in references(e)]
+    _FILE_REFERENCES[xmlfp] = elements, refs
+    return refs
+
+
+def _exists(kind: str, name: str) -> bool:
+    if kind == STRING:
+        return name in data.STRING_DATA
+    for tag in TARGETS[kind]:
+        if name in data.NAME_INDEX.get(tag, ()):
+            return True
+    return False
+
+
+def validate() -> list[Problem]:
+    """Every reference that doesn't resolve, in file order"""
+    problems = []
+    with data._LOCK:
+        files = data.file_elements()
+        for xmlfp in list(_FILE_REFERENCES):
+            if xmlfp not in files:
+                del _FILE_REFERENCES[xmlfp]
+        for xmlfp in sorted(files):
+            for ref in _file_references(xmlfp, files[xmlfp]):
+                if not _exists(ref.kind, ref.name):
+                    problems.append(Problem(xmlfp, ref))
+    return problems
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import pytest
+
+import ftl.data
+
+EVENTS_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<FTL>
+<textList name="TEXT_LIST_A">
+    <text>First flavor</text>
+    <text>Second flavor</text>
+</textList>
+<event name="START_BEACON">
+    <text id="START_TEXT"/>
+    <choice>
+        <text>Continue...</text>
+        <event load="LIST_NEUTRAL"/>
+    </choice>
+    <choice hidden="true">
+        <text>(Slug Crew) Talk to them.</text>
+        <event>
+            <text load="TEXT_LIST_A"/>
+            <autoReward level="MED">standard</autoReward>
+            <crewMember amount="1" class="slug"/>
+        </event>
+    </choice>
+</event>
+<event name="PIRATE_FIGHT">
+    <text>A pirate ship attacks!</text>
+    <ship load="PIRATE" hostile="true"/>
+    <boarders min="1" max="3" class="human"/>
+    <damage amount="3"/>
+    <distressBeacon/>
+    <modifyPursuit amount="1"/>
+</event>
+<event name="STORE_EVENT">
+    <text>A store.</text>
+    <store/>
+    <quest event="PIRATE_FIGHT"/>
+</event>
+<eventList name="LIST_NEUTRAL">
+    <event>
+        <text>Nothing here.</text>
+    </event>
+    <event load="PIRATE_FIGHT"/>
+</eventList>
+<ship name="PIRATE" auto_blueprint="PIRATE_SHIP"/>
+</FTL>
+"""
+
+# Multiple root elements, the way the game ships its text files
+TEXT_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<text name="START_TEXT">You arrive at the start beacon.</text>
+<text name="SECTOR_NAME">Civilian Sector</text>
+"""
+
+SECTOR_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<FTL>
+<sectorType name="CIVILIAN">
+    <sector>CIVILIAN_SECTOR</sector>
+</sectorType>
+<sectorDescription name="CIVILIAN_SECTOR" minSector="0" unique="false">
+    <nameList>
+        <name short="Civilian" id="SECTOR_NAME"/>
+    </nameList>
+    <startEvent>START_BEACON</startEvent>
+    <event name="STORE_EVENT" min="1" max="2"/>
+    <event name="PIRATE_FIGHT" min="2" max="4"/>
+    <event name="LIST_NEUTRAL" min="3" max="5"/>
+</sectorDescription>
+</FTL>
+"""
+
+FILES = {
+    "events_test.xml": EVENTS_XML,
+    "text_misc.xml": TEXT_XML,
+    "sector_data.xml": SECTOR_XML,
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path, monkeypatch) -> Path:
+    """Points `ftl.data` at a small data set and makes sure nothing has been loaded"""
+    data = tmp_path / "data"
+    data.mkdir()
+    for name, contents in FILES.items():
+        (data / name).write_text(contents)
+    monkeypatch.setattr(ftl.data, "DATA_DIR", data)
+    monkeypatch.setattr(ftl.data, "CACHE_DIR", tmp_path / "cache")
+    ftl.data._reset()
+    yield data
+    ftl.data._reset()
@@ -1,6 +1,104 @@
-def test_special_camel():
-    from ftl.models.base import special_camel
+from xml.etree.ElementTree import fromstring
+
+import pytest
+from pydantic import ValidationError
+
+import ftl.data
+from ftl.data import ensure_loaded
+from ftl.models import _FTL
+from ftl.models.base import set_shared, set_trusted, special_camel
+from ftl.models.event import Boarders, Event, Quest, Upgrade
+from ftl.models.sector import SectorDescription, SectorEvent
+from ftl.models.slim import slim
+from ftl.models.text import TextList
+
 
+def test_special_camel():
     assert special_camel("type_") == "type"
     assert special_camel("id_") == "id"
     assert special_camel("class_") == "class"
+
+
+def test_trusted_build_matches_validated(data_dir):
+    validated = _FTL.from_elem(ensure_loaded())
+    previous = set_trusted(True)
+    try:
+        trusted = _FTL.from_elem(ensure_loaded())
+        with pytest.raises(ValidationError):
+            # anything the fast path can't handle still gets a real error
+            Boarders.from_elem(fromstring('<boarders min="one" max="3" class="x"/>'))
+    finally:
+        set_trusted(previous)
+    assert trusted.dict() == validated.dict()
+    fight = trusted.events["PIRATE_FIGHT"]
+    assert fight.__fields_set__ == validated.events["PIRATE_FIGHT"].__fields_set__
+    assert fight.boarders.min == 1 and fight.distress_beacon is True
+
+
+def test_child_registries_are_per_class():
+    assert TextList._child_tags is not Event._child_tags
+    assert TextList._child_tags["text"][1] == "contents"
+    assert Event._child_tags["text"][1] == "text"
+    text_list = TextList.from_elem(
+        fromstring("<textList name='L'><text>a</text><text>b</text></textList>")
+    )
+    assert [t.text for t in text_list.contents.values()] == ["a", "b"]
+    with pytest.raises(RuntimeError):
+        Quest.attach(TextList)
+
+
+def test_shared_build_reuses_identical_subtrees():
+    xml = (
+        '<event name="{}"><text>Hello</text>'
+        "<choice><text>Continue...</text><event/></choice>"
+        "<choice><text>Continue...</text><event/></choice>"
+        '<ship load="PIRATE" hostile="true"/></event>'
+    )
+    previous = set_shared(True)
+    try:
+        a = Event.from_elem(fromstring(xml.format("A")))
+        b = Event.from_elem(fromstring(xml.format("B")))
+        assert a is not b
+        assert a.choices[0] is a.choices[1] is b.choices[0]
+        assert a.ship is b.ship and a.text is b.text
+        # Named ones are one of a kind, they aren't kept
+        assert Event.from_elem(fromstring(xml.format("A"))) is not a
+        assert slim(a).choices[0] is slim(b).choices[1]
+        with pytest.raises(TypeError):
+            a.ship.load = "OTHER"
+    finally:
+        set_shared(previous)
+    assert Event.from_elem(fromstring(xml.format("B"))).ship is not b.ship
+
+
+def test_shared_models_are_keyed_by_type_and_dropped_on_reload():
+    previous = set_shared(True)
+    try:
+        a = Upgrade.build(amount=1, system="shields")
+        assert Upgrade.build(amount=True, system="shields") is not a
+        assert Upgrade.build(amount=1, system="shields") is a
+        ftl.data.GENERATION += 1
+        assert Upgrade.build(amount=1, system="shields") is not a
+        # Validation hands the parent the shared model itself
+        assert Event(choices=[], upgrade=a).upgrade is a
+        set_shared(False)
+        assert Event(choices=[], upgrade=a).upgrade is not a
+    finally:
+        set_shared(previous)
+
+
+def test_trusted_build_validates_what_it_cant_coerce():
+    previous = set_trusted(True)
+    try:
+        # Not a string, pydantic takes it all the same
+        assert SectorDescription.build(
+            name="S", min_sector=0, unique=1, name_list=[], event_list=[]
+        ).unique
+        with pytest.raises(ValidationError):
+            SectorDescription.build(
+                name="S", min_sector=0, unique="no", name_list=[], event_list=["x"]
+            )
+        with pytest.raises(ValidationError):
+            SectorEvent.build(name="E", min="-1", max="2")
+    finally:
+        set_trusted(previous)
@@ -0,0 +1,38 @@
+import pytest
+
+from ftl.models import FTL
+from ftl.models.event import Choice, Event
+from ftl.models.slim import slim, Slim
+
+
+@pytest.fixture
+def slim_ftl():
+    previous = FTL.set_slim(True)
+    yield FTL
+    FTL.set_slim(previous)
+
+
+def test_slim_models_behave_like_the_pydantic_ones(data_dir, slim_ftl):
+    event = slim_ftl.events["START_BEACON"]
+    assert isinstance(event, Slim) and isinstance(event, Event)
+    assert isinstance(event.choices[0], Choice)
+    assert not hasattr(event, "__dict__")
+    assert event.text.render() == "You arrive at the start beacon."
+    assert str(event.choices[0].render()) == "👻 Continue..."
+    assert event.choices[1].event.text.render().draw().text in (
+        "First flavor",
+        "Second flavor",
+    )
+    with pytest.raises(AttributeError):
+        event.name = "OTHER"
+    FTL.set_slim(False)
+    full = FTL.events["START_BEACON"]
+    assert slim(full) == event
+    assert slim(full).dict()["choices"][0]["text"] == full.dict()["choices"][0]["text"]
+
+
+def test_slim_models_keep_class_methods(data_dir, slim_ftl):
+    event = slim_ftl.events["START_BEACON"]
+    assert event.tag_name == Event.tag_name
+    assert event.py_tag_name() == Event.py_tag_name() == "event"
+    assert type(event).py_tag_name() == "event"
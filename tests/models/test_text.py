@@ -0,0 +1,28 @@
+from xml.etree.ElementTree import fromstring
+
+import ftl.data
+from ftl.models.text import Text
+
+
+def test_text_resolution_is_cached_until_reload(data_dir):
+    text = Text.from_elem(fromstring('<text load="TEXT_LIST_A"/>'))
+    flavors = text.render()
+    assert [t.text for t in flavors.contents.values()] == [
+        "First flavor",
+        "Second flavor",
+    ]
+    assert text.render() is flavors
+    assert text.get_ref() is flavors
+    assert flavors.draw() in tuple(flavors.contents.values())
+
+    events_fp = data_dir / "events_test.xml"
+    events_fp.write_text(events_fp.read_text().replace("First", "Only"))
+    ftl.data.reload()
+    assert text.render() is not flavors
+    assert text.render().contents["0"].text == "Only flavor"
+
+
+def test_a_locale_named_ref_renders_text(data_dir):
+    text = Text.from_elem(fromstring('<text id="START_TEXT"/>'))
+    assert text.get_ref() is None
+    assert text.render("ref") == ftl.data.get_string("START_TEXT")
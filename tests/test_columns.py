@@ -0,0 +1,95 @@
+from xml.etree.ElementTree import fromstring
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ftl import columns  # noqa: E402
+from ftl.models.weapon_blueprints import WeaponBlueprint  # noqa: E402
+
+BLUEPRINTS_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<FTL>
+<weaponBlueprint name="LASER_BURST_2">
+    <type>LASER</type>
+    <title id="LASER_BURST_2_TITLE"/>
+    <damage>1</damage>
+    <shots>2</shots>
+    <cooldown>10</cooldown>
+    <drone_targetable>1</drone_targetable>
+    <stunChance>3</stunChance>
+</weaponBlueprint>
+<shipBlueprint name="PIRATE_SHIP" layout="pirate" img="pirate">
+    <class id="PIRATE_CLASS"/>
+    <systemList>
+        <shields power="2"/>
+        <weapons power="3"/>
+    </systemList>
+    <weaponSlots>3</weaponSlots>
+    <weaponList count="1" missiles="4">
+        <weapon name="LASER_BURST_2"/>
+    </weaponList>
+    <health amount="10"/>
+    <maxPower amount="8"/>
+    <crewCount amount="2" class="human"/>
+    <crewCount amount="1" class="engi"/>
+</shipBlueprint>
+</FTL>
+"""
+
+
+def test_blueprint_tables(data_dir):
+    (data_dir / "blueprints.xml").write_text(BLUEPRINTS_XML)
+    tables = columns.tables()
+    (laser,) = tables["weapons"]
+    assert (laser["name"], laser["type"], laser["title"]) == (
+        "LASER_BURST_2",
+        "LASER",
+        "LASER_BURST_2_TITLE",
+    )
+    assert (laser["damage"], laser["shots"], laser["cooldown"]) == (1, 2, 10)
+    (ship,) = tables["ships"]
+    assert ship["health"] == 10 and ship["max_power"] == 8
+    assert ship["crew"] == 3 and ship["systems"] == 2
+    assert ship["weapons"] == 1 and ship["missiles"] == 4
+    assert ship["min_sector"] == columns.MISSING
+
+
+def test_weapon_columns_match_the_model(data_dir):
+    (data_dir / "blueprints.xml").write_text(BLUEPRINTS_XML)
+    (laser,) = columns.weapons()
+    e = fromstring(BLUEPRINTS_XML).find("weaponBlueprint")
+    e.append(fromstring("<image>laser</image>"))
+    model = WeaponBlueprint.from_elem(e)
+    assert laser["drone_targetable"] and model.drone_targetable
+    for name, _, _ in columns._WEAPON_COLUMNS:
+        assert laser[name] == getattr(model, name), name
+
+
+def test_events_and_choices_are_flattened(data_dir):
+    events, choices = columns.events_and_choices()
+    start = np.flatnonzero(events["name"] == "START_BEACON")[0]
+    assert events["choices"][start] == 2
+    # Both choices of the start beacon lead to events nested in it
+    mine = choices[choices["event"] == start]
+    assert list(mine["hidden"]) == [False, True]
+    targets = events[mine["target"]]
+    assert list(targets["parent"]) == [start, start]
+    assert list(targets["load"]) == ["LIST_NEUTRAL", ""]
+    assert targets["reward"][1] == "MED" and targets["text"][1] == "TEXT_LIST_A"
+    fight = events[events["name"] == "PIRATE_FIGHT"][0]
+    assert fight["fight"] and fight["distress"] and fight["damage"] == 3
+    assert (fight["boarders_min"], fight["boarders_max"]) == (1, 3)
+    assert events[events["name"] == "STORE_EVENT"][0]["quest"] == "PIRATE_FIGHT"
+    assert (events["top"] == "LIST_NEUTRAL").sum() == 2
+
+
+def test_export_and_load(data_dir, tmp_path):
+    out = tmp_path / "tables"
+    written = columns.export(out, parquet=False)
+    assert [p.name for p in written] == [f"{t}.npy" for t in columns.TABLES]
+    events = columns.load(out, "events")
+    assert isinstance(events, np.memmap)
+    assert np.array_equal(events, columns.events_and_choices()[0])
+    if columns.pyarrow is None:
+        with pytest.raises(ImportError):
+            columns.export(out, parquet=True)
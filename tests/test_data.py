@@ -0,0 +1,281 @@
+import gc
+import os
+from xml.etree.ElementTree import fromstring, tostring
+
+import pytest
+
+import ftl.data
+from ftl.models import _LazyFTL
+from ftl.models.event import Event
+
+
+def test_lazy_ftl_builds_on_lookup(data_dir):
+    lazy = _LazyFTL()
+    assert not ftl.data._LOADED
+    event = lazy.events["PIRATE_FIGHT"]
+    assert ftl.data._LOADED
+    assert event.distress_beacon
+    assert list(lazy.events._models) == ["PIRATE_FIGHT"]
+    assert lazy.events["PIRATE_FIGHT"] is event
+    assert set(lazy.events) == {"START_BEACON", "PIRATE_FIGHT", "STORE_EVENT"}
+
+
+def test_lazy_ftl_matches_materialized(data_dir):
+    lazy = _LazyFTL()
+    eager = lazy.materialize()
+    assert eager.events.keys() == lazy.events.keys()
+    assert eager.sector_descriptions == dict(lazy.sector_descriptions)
+    assert lazy.events["START_BEACON"].text.render() == ftl.data.get_string(
+        "START_TEXT"
+    )
+
+
+def test_load_all_things_uses_index(data_dir):
+    (fight,) = ftl.data.load_all_things("event", ["PIRATE_FIGHT"])
+    assert fight.find("text").text == "A pirate ship attacks!"
+    assert ftl.data.load_one_thing("eventList", "LIST_NEUTRAL").tag == "eventList"
+    assert list(ftl.data.load_all_things("event", ["NOPE"])) == []
+    assert ftl.data.NAME_INDEX["event"].keys() == {
+        "START_BEACON",
+        "PIRATE_FIGHT",
+        "STORE_EVENT",
+    }
+
+
+def test_parse_cache_reuses_unchanged_files(data_dir, monkeypatch):
+    text_fp = data_dir / "text_misc.xml"
+    first = ftl.data._parse_file(text_fp, ftl.data.CACHE_DIR)
+    assert [e.get("name") for e in first] == ["START_TEXT", "SECTOR_NAME"]
+
+    def no_parsing(xmlfp):
+        raise AssertionError(f"{xmlfp} should have come from the cache")
+
+    with monkeypatch.context() as m:
+        m.setattr(ftl.data, "_parse_xml", no_parsing)
+        cached = ftl.data._parse_file(text_fp, ftl.data.CACHE_DIR)
+    assert [e.text for e in cached] == [e.text for e in first]
+
+    text_fp.write_text(text_fp.read_text().replace("Civilian", "Pirate"))
+    assert ftl.data._parse_file(text_fp, ftl.data.CACHE_DIR)[1].text == "Pirate Sector"
+
+
+def test_parallel_load_matches_serial(data_dir):
+    ftl.data._load_data(workers=1)
+    serial = [tostring(e) for e in ftl.data.RAW_DATA]
+    ftl.data.RAW_DATA.clear()
+    ftl.data._load_data(workers=3)
+    assert [tostring(e) for e in ftl.data.RAW_DATA] == serial
+    assert ftl.data.STRING_DATA.keys() == {"START_TEXT", "SECTOR_NAME"}
+
+
+def test_iter_elements_streams_multiple_roots(tmp_path):
+    xmlfp = tmp_path / "events_mod.xml"
+    xmlfp.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<event name="A">\n    <text>a</text>\n</event>\n'
+        "<FTL><textList name='B'/><FTL><event name='C'/></FTL></FTL>\n"
+        "<text name='D'>d</text>\n"
+    )
+    elements = list(ftl.data._iter_elements(xmlfp, chunk_size=16))
+    assert [(e.tag, e.get("name")) for e in elements] == [
+        ("event", "A"),
+        ("textList", "B"),
+        ("event", "C"),
+        ("text", "D"),
+    ]
+    # indentation is gone, real text is not
+    assert elements[0].text is None
+    assert elements[0][0].text == "a"
+
+
+def test_reload_only_replaces_what_changed(data_dir):
+    lazy = _LazyFTL()
+    fight = lazy.events["PIRATE_FIGHT"]
+    sector = lazy.sector_descriptions["CIVILIAN_SECTOR"]
+    events_fp = data_dir / "events_test.xml"
+    events_fp.write_text(
+        events_fp.read_text().replace("A pirate ship attacks!", "Two pirate ships!")
+    )
+    (data_dir / "text_misc.xml").unlink()
+
+    keys = ftl.data.reload()
+    assert ("event", "PIRATE_FIGHT") in keys
+    assert ("text", "START_TEXT") in keys
+    assert lazy.events["PIRATE_FIGHT"] is not fight
+    assert lazy.events["PIRATE_FIGHT"].text.text == "Two pirate ships!"
+    assert "START_TEXT" not in ftl.data.STRING_DATA
+    # sector_data.xml didn't change
+    assert lazy.sector_descriptions["CIVILIAN_SECTOR"] is sector
+    assert len(ftl.data.RAW_DATA) == sum(map(len, ftl.data._FILE_ELEMENTS.values()))
+    assert ftl.data.reload() == set()
+
+
+def test_string_table_is_mapped_from_the_cache(data_dir):
+    ftl.data.ensure_loaded()
+    assert ftl.data.STRING_DATA._mmap is None
+    assert not any(e.tag == "text" for e in ftl.data.RAW_DATA)
+    strings = dict(ftl.data.STRING_DATA)
+    ftl.data._reset()
+    ftl.data.ensure_loaded()
+    assert ftl.data.STRING_DATA._mmap is not None
+    assert dict(ftl.data.STRING_DATA) == strings
+
+    text_fp = data_dir / "text_misc.xml"
+    text_fp.write_text(text_fp.read_text().replace("Civilian", "Pirate"))
+    assert ftl.data.reload() == {("text", "START_TEXT"), ("text", "SECTOR_NAME")}
+    assert ftl.data.get_string("SECTOR_NAME") == "Pirate Sector"
+    assert ftl.data.get_string("START_TEXT") == strings["START_TEXT"]
+
+
+def test_locales_load_on_demand_and_fall_back(data_dir):
+    german = data_dir / "de"
+    german.mkdir()
+    (german / "text_misc.xml").write_text(
+        '<text name="START_TEXT">Du kommst an einem Leuchtfeuer an.</text>'
+    )
+    start = _LazyFTL().events["START_BEACON"]
+    assert "de" not in ftl.data._LOCALES
+    assert start.text.render("de") == "Du kommst an einem Leuchtfeuer an."
+    assert start.text.render() == ftl.data.get_string("START_TEXT")
+    assert ftl.data.get_string("SECTOR_NAME", locale="de") == "Civilian Sector"
+    assert "SECTOR_NAME" not in ftl.data.strings("de")
+
+    (german / "text_misc.xml").write_text('<text name="SECTOR_NAME">Zivilsektor</text>')
+    assert ftl.data.reload() == {("text", "START_TEXT"), ("text", "SECTOR_NAME")}
+    assert ftl.data.get_string("SECTOR_NAME", locale="de") == "Zivilsektor"
+    with pytest.raises(ValueError):
+        ftl.data.strings("../de")
+
+
+def test_parse_cache_hashes_once_and_before_parsing(data_dir, monkeypatch):
+    text_fp = data_dir / "text_misc.xml"
+    ftl.data._parse_file(text_fp, ftl.data.CACHE_DIR)
+    digest, hashed = ftl.data._digest, []
+    monkeypatch.setattr(ftl.data, "_digest", lambda fp: hashed.append(fp) or digest(fp))
+    # Touched, hashed once and the entry takes the new mtime
+    os.utime(text_fp, ns=(1, 1))
+    ftl.data._parse_file(text_fp, ftl.data.CACHE_DIR)
+    ftl.data._parse_file(text_fp, ftl.data.CACHE_DIR)
+    assert hashed == [text_fp]
+
+    # Edited just after it was read, the entry must not claim the new contents
+    parse = ftl.data._parse_xml
+
+    def edit_after(xmlfp, sink=None):
+        elements = parse(xmlfp, sink)
+        xmlfp.write_text(xmlfp.read_text().replace("Civilian", "Pirate"))
+        return elements
+
+    text_fp.write_text(text_fp.read_text() + "\n")
+    with monkeypatch.context() as m:
+        m.setattr(ftl.data, "_parse_xml", edit_after)
+        assert ftl.data._parse_file(text_fp, ftl.data.CACHE_DIR)[1].text == (
+            "Civilian Sector"
+        )
+    assert ftl.data._parse_file(text_fp, ftl.data.CACHE_DIR)[1].text == "Pirate Sector"
+
+
+def test_parse_cache_is_written_while_parsing(data_dir, monkeypatch):
+    xmlfp = data_dir / "text_misc.xml"
+    xmlfp.write_text(xmlfp.read_text().replace("Civilian", "Zivilsektor ä"), "utf-8")
+
+    def whole_document(elements):
+        raise AssertionError("The cache entry should be streamed")
+
+    monkeypatch.setattr(ftl.data, "_serialize", whole_document)
+    parsed = ftl.data._parse_file(xmlfp, ftl.data.CACHE_DIR)
+    cached, _ = ftl.data._read_cache(xmlfp, ftl.data.CACHE_DIR)
+    assert [e.text for e in fromstring(cached)] == [e.text for e in parsed]
+    assert parsed[1].text == "Zivilsektor ä Sector"
+
+
+def test_mixed_content_keeps_its_tails(data_dir):
+    xmlfp = data_dir / "events_mixed.xml"
+    xmlfp.write_text(
+        '<FTL>\n  <text name="MIXED">Hello <b>bold</b> tail</text>\n'
+        "  <event name='E'>\n    <text>a</text>\n  </event>\n</FTL>\n"
+    )
+    mixed = b'<text name="MIXED">Hello <b>bold</b> tail</text>'
+    for _ in range(2):
+        # Parsed, then from the cache
+        parsed = ftl.data._parse_file(xmlfp, ftl.data.CACHE_DIR)
+        assert tostring(parsed[0]) == mixed
+        assert tostring(parsed[1]) == b'<event name="E"><text>a</text></event>'
+
+
+def test_dropped_lazy_ftls_stop_listening_for_reloads(data_dir):
+    before = len(ftl.data._reload_callbacks())
+    lazy = _LazyFTL()
+    assert len(ftl.data._reload_callbacks()) == before + 1
+    del lazy
+    gc.collect()
+    assert len(ftl.data._reload_callbacks()) == before
+
+    def callback(keys):
+        pass
+
+    ftl.data.on_reload(callback)
+    ftl.data.off_reload(callback)
+    assert len(ftl.data._reload_callbacks()) == before
+
+
+def test_named_strings_load_as_elements(data_dir):
+    start = ftl.data.load_one_thing("text", "START_TEXT")
+    assert start.tag == "text"
+    assert start.text == ftl.data.get_string("START_TEXT")
+    assert list(ftl.data.load_all_things("text", ["NOPE"])) == []
+
+
+def test_replaced_strings_are_reclaimed(data_dir):
+    ftl.data.ensure_loaded()
+    text_fp = data_dir / "text_misc.xml"
+    original = text_fp.read_text()
+    for i in range(10):
+        text_fp.write_text(original.replace("Civilian", f"Civilian {i}"))
+        os.utime(text_fp, ns=(i, i))
+        ftl.data.reload()
+        assert ftl.data.STRING_DATA.count <= 2 * len(ftl.data.STRING_DATA)
+    assert ftl.data.get_string("SECTOR_NAME") == "Civilian 9 Sector"
+    assert ftl.data.get_string("START_TEXT") is not None
+
+
+def test_model_built_across_a_reload_is_not_kept(data_dir, monkeypatch):
+    lazy = _LazyFTL()
+    events_fp = data_dir / "events_test.xml"
+    from_elem = Event.from_elem.__func__
+
+    def reload_halfway(cls, e):
+        model = from_elem(cls, e)
+        if not ftl.data.GENERATION - generation:
+            events_fp.write_text(
+                events_fp.read_text().replace("A pirate ship attacks!", "Reloaded")
+            )
+            ftl.data.reload()
+        return model
+
+    generation = ftl.data.GENERATION
+    monkeypatch.setattr(Event, "from_elem", classmethod(reload_halfway))
+    assert lazy.events["PIRATE_FIGHT"].text.text == "A pirate ship attacks!"
+    assert lazy.events["PIRATE_FIGHT"].text.text == "Reloaded"
+
+
+def test_touched_files_are_not_reloaded(data_dir):
+    lazy = _LazyFTL()
+    fight = lazy.events["PIRATE_FIGHT"]
+    os.utime(data_dir / "events_test.xml", ns=(1, 1))
+    assert ftl.data.reload() == set()
+    assert lazy.events["PIRATE_FIGHT"] is fight
+
+
+def test_switching_data_forgets_built_models(data_dir, tmp_path):
+    lazy = _LazyFTL()
+    for source in ("A", "B"):
+        directory = tmp_path / source
+        directory.mkdir()
+        (directory / "events.xml").write_text(
+            f'<FTL><event name="E"><text>From {source}</text></event>'
+            f'<text name="S">String {source}</text></FTL>'
+        )
+        ftl.data.use_data_dir(directory)
+        assert lazy.events["E"].text.text == f"From {source}"
+        assert ftl.data.get_string("S") == f"String {source}"
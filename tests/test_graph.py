@@ -0,0 +1,39 @@
+import ftl.data
+from ftl import graph
+
+
+def test_event_graph_follows_loads_quests_and_ships(data_dir):
+    g = graph.graph()
+    assert g.successors("START_BEACON") == [("eventList", "LIST_NEUTRAL")]
+    assert g.successors("PIRATE_FIGHT") == [("ship", "PIRATE")]
+    assert set(g.predecessors("PIRATE_FIGHT")) == {
+        ("eventList", "LIST_NEUTRAL"),
+        ("event", "STORE_EVENT"),
+        ("sectorDescription", "CIVILIAN_SECTOR"),
+    }
+    assert g.can_reach("START_BEACON", ("ship", "PIRATE"))
+    assert not g.can_reach("PIRATE_FIGHT", "START_BEACON")
+    assert g.ancestors("PIRATE_FIGHT") == {
+        ("event", "START_BEACON"),
+        ("eventList", "LIST_NEUTRAL"),
+        ("event", "STORE_EVENT"),
+        ("sectorDescription", "CIVILIAN_SECTOR"),
+    }
+    assert g.cycles() == []
+    assert graph.graph() is g
+
+
+def test_event_graph_finds_cycles_after_reload(data_dir):
+    assert graph.graph().missing == set()
+    (data_dir / "events_loop.xml").write_text(
+        '<event name="LOOP_A"><choice><text>Again</text><event load="LOOP_B"/></choice>'
+        '</event><eventList name="LOOP_B"><event load="LOOP_A"/>'
+        '<event load="NOWHERE"/></eventList>'
+    )
+    ftl.data.reload()
+    g = graph.graph()
+    assert [sorted(c) for c in g.cycles()] == [
+        [("event", "LOOP_A"), ("eventList", "LOOP_B")]
+    ]
+    assert ("event", "LOOP_A") in g.descendants("LOOP_A")
+    assert g.missing == {(("eventList", "LOOP_B"), ("load", "NOWHERE"))}
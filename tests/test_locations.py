@@ -0,0 +1,52 @@
+from xml.etree.ElementTree import Element
+
+import ftl.data
+from ftl import snapshot
+from ftl.exceptions import Sad, snippet
+from ftl.locations import locate
+
+
+def test_locate_finds_lines_and_columns(data_dir):
+    (data_dir / "one_line.xml").write_text(
+        '<?xml version="1.0"?><text name="SKIPPED">Hi</text><event name="A"/>\n'
+        '<FTL>\n  <event name="B">\n    <ship load="PIRATE"/></event></FTL>'
+    )
+    ftl.data.ensure_loaded()
+    a = ftl.data.load_one_thing("event", "A")
+    b = ftl.data.load_one_thing("event", "B")
+    assert tuple(locate(a))[1:] == (1, 52)
+    assert str(locate(b)) == "one_line.xml:3:3"
+    assert tuple(locate(b[0]))[1:] == (4, 5)
+    pirate = ftl.data.load_one_thing("event", "PIRATE_FIGHT")
+    assert str(locate(pirate[1])) == "events_test.xml:24:5"
+    # Not from a data file
+    assert locate(ftl.data.RAW_DATA) is None
+
+
+def test_sad_reports_where_with_a_short_snippet(data_dir):
+    event = ftl.data.load_one_thing("event", "START_BEACON")
+    err = Sad.from_sub_elem(event, event[1])
+    assert str(err) == (
+        "events_test.xml:9:5: Unhandled element: `<choice>...2 children...</choice>` "
+        'inside of parent element: `<event name="START_BEACON">...3 children...</event>`'
+    )
+    assert len(snippet(event, limit=20)) == 20
+    assert str(Sad("plain")) == "plain"
+
+
+def test_locate_loads_and_makes_nothing(data_dir, tmp_path, monkeypatch):
+    assert str(Sad.from_elem(Element("event"))) == "Unhandled element: `<event/>`"
+    assert not ftl.data._LOADED
+
+    monkeypatch.setattr(ftl.data, "SNAPSHOT", None)
+    ftl.data.ensure_loaded()
+    path = snapshot.write(tmp_path / "ftl.snapshot")
+    ftl.data.use_snapshot(path)
+    pirate = ftl.data.load_one_thing("event", "PIRATE_FIGHT")
+    assert str(locate(pirate[1])) == "events_test.xml:24:5"
+    assert str(locate(pirate)) == "events_test.xml:22:1"
+    sector = ftl.data.load_one_thing("sectorDescription", "CIVILIAN_SECTOR")
+    assert locate(sector).file.name == "sector_data.xml"
+    assert not len(ftl.data.RAW_DATA)
+    assert len(ftl.data._SNAPSHOT._elements) == 2
+    ftl.data._reset()
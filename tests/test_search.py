@@ -0,0 +1,35 @@
+import ftl.data
+from ftl import search
+
+
+def test_search_words_prefixes_and_ranges(data_dir):
+    assert search.search("slug") == [("event", "START_BEACON")]
+    # the event only has the id, the words come from the string
+    assert search.search("arrive", tag="event") == [("event", "START_BEACON")]
+    # STORE_EVENT mentions it in its quest, the name match comes first
+    assert search.search("pirate fi", tag="event") == [
+        ("event", "PIRATE_FIGHT"),
+        ("event", "STORE_EVENT"),
+    ]
+    assert search.search("pi", tag="ship") == [("ship", "PIRATE")]
+    assert search.search("", damage__amount=(3, 3)) == [("event", "PIRATE_FIGHT")]
+    assert search.search("", boarders__max=(4, None)) == []
+    assert search.search("civilian", limit=1) == [
+        ("sectorDescription", "CIVILIAN_SECTOR")
+    ]
+
+
+def test_search_index_follows_reload_and_cache(data_dir):
+    index = search.index()
+    text_fp = data_dir / "text_misc.xml"
+    text_fp.write_text(text_fp.read_text().replace("You arrive at", "Welcome to"))
+    ftl.data.reload()
+    assert search.index() is index
+    assert search.search("welcome", tag="event") == [("event", "START_BEACON")]
+    assert search.search("arrive", tag="event") == []
+
+    ftl.data._reset()
+    cached = search.index()
+    assert cached is not index
+    assert cached.search("welcome") == index.search("welcome")
+    assert cached.search("", **{"damage.amount": (1, 5)}) == [("event", "PIRATE_FIGHT")]
@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from ftl import sector_map
+
+
+def test_sector_map_follows_the_sector_rules(data_dir):
+    m = sector_map.generate("CIVILIAN_SECTOR", seed=3)
+    assert m == sector_map.generate("CIVILIAN_SECTOR", seed=3)
+    assert m.beacons[m.start].event == "START_BEACON"
+    assert m.beacons[m.exit].placed == "NEUTRAL"
+    placed = [b.placed for b in m.beacons]
+    assert 1 <= placed.count("STORE_EVENT") <= 2
+    assert 2 <= placed.count("PIRATE_FIGHT") <= 4
+    assert 3 <= placed.count("LIST_NEUTRAL") <= 5
+    assert sum(b.store for b in m.beacons) == placed.count("STORE_EVENT")
+    assert m.neighbours(m.start)
+
+
+def test_pick_sector_respects_min_sector(data_dir):
+    rng = random.Random(0)
+    assert sector_map.pick_sector("CIVILIAN", 0, rng) == "CIVILIAN_SECTOR"
+    with pytest.raises(KeyError):
+        sector_map.pick_sector("NOWHERE", 0, rng)
+
+
+def test_sector_simulation_is_the_same_in_parallel(data_dir):
+    serial = sector_map.simulate("CIVILIAN_SECTOR", runs=40, seed=7, workers=0)
+    assert serial.sectors == 40
+    assert 1 <= serial.mean_stores() <= 2
+    # Pirate fights, and some of the neutral lists load one too
+    assert serial.mean_fights() >= 2
+    assert serial.frequency()["START_BEACON"] == 1
+    assert sector_map.simulate("CIVILIAN_SECTOR", 40, seed=7, workers=2) == serial
@@ -0,0 +1,58 @@
+from xml.etree.ElementTree import fromstring
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import ftl.data  # noqa: E402
+from ftl.simulate import _Compiler, _FIELD, Simulator  # noqa: E402
+
+
+def test_simulator_samples_fights_and_ranges(data_dir):
+    sim = Simulator(seed=1)
+    fight = sim.event("PIRATE_FIGHT", runs=2_000)
+    assert fight.probability("fight") == 1
+    assert fight.mean()["hull_damage"] == 3
+    boarders = fight.samples[:, 4]
+    assert boarders.min() == 1 and boarders.max() == 3
+    assert fight.histogram("boarders").sum() == 2_000
+    # Half the time the list, and half of those the pirate
+    start = sim.event("START_BEACON", runs=20_000)
+    assert start.probability("fight") == pytest.approx(0.25, abs=0.02)
+    assert start.probability("crew_gained") == pytest.approx(0.5, abs=0.02)
+    with pytest.raises(KeyError):
+        sim.node("NOWHERE")
+
+
+def test_simulator_sums_a_sector(data_dir):
+    sector = Simulator(seed=2).sector("CIVILIAN_SECTOR", runs=500)
+    assert len(sector) == 500
+    # Two to four pirate fights at least, and one or two stores
+    assert sector.samples[:, 0].min() >= 2
+    assert 1 <= sector.samples[:, -1].min() <= sector.samples[:, -1].max() <= 2
+
+
+def test_boarders_without_a_range():
+    compiler = _Compiler(include_requirements=False)
+    i = compiler.event(fromstring('<event><boarders class="human"/></event>'))
+    j = compiler.event(fromstring('<event><boarders min="2" class="human"/></event>'))
+    k = compiler.event(fromstring('<event><boarders min="x" class="human"/></event>'))
+    field = _FIELD["boarders"]
+    assert [compiler.low[n][field] for n in (i, j, k)] == [0, 2, 0]
+    assert [compiler.high[n][field] for n in (i, j, k)] == [0, 2, 0]
+
+
+def test_sector_and_amounts_without_numbers(data_dir):
+    (data_dir / "sector_odd.xml").write_text(
+        '<FTL><event name="ODD"><damage amount="lots"/><crewMember amount="x"/>'
+        '<damage/></event><sectorDescription name="ODD_SECTOR">'
+        '<event name="STORE_EVENT" min="2"/><event name="PIRATE_FIGHT" min="x"/>'
+        "</sectorDescription></FTL>"
+    )
+    ftl.data.reload()
+    sim = Simulator(seed=3)
+    assert sim.event("ODD", runs=10).mean()["hull_damage"] == 0
+    sector = sim.sector("ODD_SECTOR", runs=10)
+    # Two stores every time, the fight is left out
+    assert (sector.samples[:, -1] == 2).all()
+    assert sector.probability("fight") == 0
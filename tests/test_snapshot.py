@@ -0,0 +1,123 @@
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.etree.ElementTree import tostring
+
+import pytest
+
+import ftl.data
+from ftl import search, snapshot
+from ftl.models import _LazyFTL
+from ftl.validate import validate
+
+
+def _index() -> dict:
+    return {
+        tag: {name: list(map(tostring, elements)) for name, elements in names.items()}
+        for tag, names in ftl.data.NAME_INDEX.items()
+    }
+
+
+def test_snapshot_round_trips(data_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(ftl.data, "SNAPSHOT", None)
+    ftl.data.ensure_loaded()
+    index, strings = _index(), dict(ftl.data.STRING_DATA)
+    raw = list(map(tostring, ftl.data.RAW_DATA))
+    fight = _LazyFTL().events["PIRATE_FIGHT"]
+    path = snapshot.write(tmp_path / "ftl.snapshot")
+
+    ftl.data.use_snapshot(path)
+    ftl.data.ensure_loaded()
+    assert not len(ftl.data.RAW_DATA)
+    assert ftl.data.get_string("START_TEXT") == strings["START_TEXT"]
+    # Only what is looked up gets made
+    lazy = _LazyFTL()
+    assert lazy.events["PIRATE_FIGHT"] == fight
+    assert len(ftl.data._SNAPSHOT._elements) == 1
+    assert "NOPE" not in ftl.data.NAME_INDEX["event"]
+    assert ftl.data.get_string("NOPE") is None
+    assert _index() == index and dict(ftl.data.STRING_DATA) == strings
+    assert ftl.data.reload() == set()
+    assert list(map(tostring, ftl.data.all_elements())) == raw
+
+
+def _fight_text(_) -> str:
+    return ftl.data.load_one_thing("event", "PIRATE_FIGHT").find("text").text
+
+
+def test_workers_attach_to_shared_memory(data_dir, monkeypatch):
+    monkeypatch.setattr(ftl.data, "SHARED_MEMORY", None)
+    shm = snapshot.publish()
+    try:
+        with ProcessPoolExecutor(
+            1, initializer=ftl.data.use_shared_memory, initargs=(shm.name,)
+        ) as pool:
+            assert list(pool.map(_fight_text, [0])) == ["A pirate ship attacks!"]
+        ftl.data.use_shared_memory(shm.name)
+        assert _fight_text(0) == "A pirate ship attacks!"
+        assert ftl.data.get_string("SECTOR_NAME") == "Civilian Sector"
+        ftl.data._reset()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_snapshot_validates_locates_and_knows_its_files(
+    data_dir, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(ftl.data, "SNAPSHOT", None)
+    problems = [str(p) for p in validate()]
+    cache_fp, signature = search._cache_file()
+    path = snapshot.write(tmp_path / "ftl.snapshot")
+
+    ftl.data.use_snapshot(path)
+    # With where in the files each problem is
+    assert [str(p) for p in validate()] == problems
+    assert search._cache_file() == (cache_fp, signature)
+    assert not ftl.data._SNAPSHOT.stale()
+
+    events_fp = data_dir / "events_test.xml"
+    events_fp.write_text(events_fp.read_text().replace("PIRATE_SHIP", "OTHER_SHIP"))
+    assert ftl.data._SNAPSHOT.stale()
+    ftl.data._reset()
+
+
+@pytest.mark.parametrize(
+    "setup",
+    [
+        "",
+        # Without the private tracker attribute `attach` reads
+        "from multiprocessing import resource_tracker; "
+        "del resource_tracker._resource_tracker; ",
+    ],
+)
+def test_unrelated_processes_attach_one_after_the_other(data_dir, monkeypatch, setup):
+    monkeypatch.setattr(ftl.data, "SHARED_MEMORY", None)
+    shm = snapshot.publish()
+    script = setup + (
+        "import ftl.data; "
+        "e = ftl.data.load_one_thing('event', 'PIRATE_FIGHT'); "
+        "print(e.find('text').text)"
+    )
+    env = {
+        **os.environ,
+        "FTL_SHARED_MEMORY": shm.name,
+        "PYTHONPATH": str(Path(ftl.__file__).parent.parent),
+    }
+    try:
+        # Neither is started by the publisher, the second one still finds the block
+        for _ in range(2):
+            out = subprocess.run(
+                [sys.executable, "-c", script],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            assert out.stdout.strip() == "A pirate ship attacks!"
+            assert "leaked" not in out.stderr
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import ftl.data
+from ftl.models import FTL
+from ftl.synthetic import generate, Sizes
+from ftl.validate import validate
+
+SMALL = Sizes(depth=3, per_file=40).scaled(0.05)
+
+
+def test_generate_is_deterministic(tmp_path: Path):
+    a = generate(tmp_path / "a", SMALL, seed=7)
+    b = generate(tmp_path / "b", SMALL, seed=7)
+    files = sorted(p.name for p in a.iterdir())
+    assert files == sorted(p.name for p in b.iterdir())
+    assert all((a / f).read_bytes() == (b / f).read_bytes() for f in files)
+
+
+def test_generated_data_builds(tmp_path: Path, monkeypatch):
+    data = generate(tmp_path / "data", SMALL)
+    # So both get put back afterwards
+    monkeypatch.setattr(ftl.data, "DATA_DIR", ftl.data.DATA_DIR)
+    monkeypatch.setattr(ftl.data, "CACHE_DIR", ftl.data.CACHE_DIR)
+    try:
+        ftl.data.use_data_dir(data, None)
+        everything = FTL.materialize()
+        assert len(everything.events) == SMALL.events
+        assert len(everything.ship_blueprints) == SMALL.ships
+        assert ftl.data.get_string("TEXT_0") is not None
+        # Every reference resolves
+        assert validate() == []
+    finally:
+        ftl.data._reset()
+
+
+def test_multi_root_files_at_default_size(tmp_path: Path):
+    data = generate(tmp_path / "data", Sizes().scaled(0.05))
+    events = sorted(p.name for p in data.glob("events_*.xml"))
+    assert events[0] == "events_000.xml"
+    assert "<FTL>" not in (data / events[0]).read_text()
@@ -0,0 +1,39 @@
+import ftl.data
+from ftl.validate import validate
+
+
+def test_validate_finds_dangling_references(data_dir):
+    problems = validate()
+    # The only thing the test data doesn't have is the pirate's blueprint
+    assert [(p.reference.kind, p.reference.name) for p in problems] == [
+        ("shipBlueprint", "PIRATE_SHIP")
+    ]
+    assert str(problems[0]) == (
+        "events_test.xml:41:1: ship PIRATE refers to shipBlueprint 'PIRATE_SHIP', "
+        "which doesn't exist"
+    )
+
+
+def test_validate_picks_up_reloaded_files(data_dir):
+    validate()
+    (data_dir / "events_broken.xml").write_text(
+        '<FTL><event name="BROKEN"><text id="NO_SUCH_TEXT"/>'
+        '<quest event="NO_SUCH_EVENT"/><choice><text>Go</text>'
+        '<event><ship load="NO_SUCH_SHIP"/><text load="NO_SUCH_LIST"/></event>'
+        "</choice></event>"
+        '<shipBlueprint name="PIRATE_SHIP"><weaponList><weapon name="NO_LASER"/>'
+        "</weaponList></shipBlueprint></FTL>"
+    )
+    ftl.data.reload()
+    problems = validate()
+    assert {p.file.name for p in problems} == {"events_broken.xml"}
+    assert sorted((p.reference.kind, p.reference.name) for p in problems) == [
+        ("load", "NO_SUCH_EVENT"),
+        ("ship", "NO_SUCH_SHIP"),
+        ("string", "NO_SUCH_TEXT"),
+        ("textList", "NO_SUCH_LIST"),
+        ("weaponBlueprint", "NO_LASER"),
+    ]
+    (data_dir / "events_broken.xml").unlink()
+    ftl.data.reload()
+    assert len(validate()) == 1